@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job.settings')
 
 application = get_asgi_application()
+
+if settings.WARM_BOOT_ENABLED:
+    # Compile templates and build the URL resolver before serving the first request. Connections are
+    # not opened here: they belong to this thread, and the server's request threads would not use them
+    from myapp.warmup import warm_boot  # noqa: E402
+    warm_boot()
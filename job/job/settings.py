@@ -57,12 +57,15 @@ AUTHENTICATION_BACKENDS = [
 # Middleware
 # ----------------------------
 MIDDLEWARE = [
+    'myapp.metrics.MetricsMiddleware',  # First, so it times everything below it
     # Removed 'django.middleware.security.SecurityMiddleware' to disable HTTPS redirect
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files in production
+    'myapp.compression.CompressionMiddleware',  # Dynamic responses; WhiteNoise serves precompressed static files
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'myapp.profiling.ProfilingMiddleware',  # Needs request.user for the staff header
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -154,6 +157,13 @@ else:
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# How authorised media downloads are handed off:
+#   ''                 - Django streams the file itself (FileResponse with Range/ETag support)
+#   'x-accel-redirect' - nginx serves PROTECTED_MEDIA_INTERNAL_URL, an internal location aliased to MEDIA_ROOT
+#   'x-sendfile'       - Apache mod_xsendfile / lighttpd serve the absolute path
+PROTECTED_MEDIA_BACKEND = config('PROTECTED_MEDIA_BACKEND', default='')
+PROTECTED_MEDIA_INTERNAL_URL = config('PROTECTED_MEDIA_INTERNAL_URL', default='/protected-media/')
+
 # ----------------------------
 # Default primary key field type
 # ----------------------------
@@ -168,3 +178,122 @@ LOGIN_URL = '/login/'
 # Email backend (console for dev)
 # ----------------------------
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# ----------------------------
+# Profile view recording
+# ----------------------------
+# Views are buffered per process and written in batches
+PROFILE_VIEW_BUFFER_SIZE = config('PROFILE_VIEW_BUFFER_SIZE', default=100, cast=int)
+PROFILE_VIEW_FLUSH_INTERVAL = config('PROFILE_VIEW_FLUSH_INTERVAL', default=30, cast=int)  # seconds
+# Raw events older than this are pruned; daily rollups are kept
+PROFILE_VIEW_RETENTION_DAYS = config('PROFILE_VIEW_RETENTION_DAYS', default=90, cast=int)
+
+# ----------------------------
+# Data retention (purge_retention command)
+# ----------------------------
+RETENTION_DAYS = {
+    'read_notifications': config('RETENTION_READ_NOTIFICATIONS_DAYS', default=90, cast=int),
+    'profile_views': PROFILE_VIEW_RETENTION_DAYS,
+    # Saved entries are dropped this many days after the job's application deadline
+    'expired_saved_jobs': config('RETENTION_EXPIRED_SAVED_JOBS_DAYS', default=30, cast=int),
+    # Raw search log entries; the daily rollup is kept
+    'search_queries': config('RETENTION_SEARCH_QUERIES_DAYS', default=30, cast=int),
+}
+
+# ----------------------------
+# Open jobs read model
+# ----------------------------
+# Serve job_list filtering/sorting from an in-process columnar copy of the open jobs
+JOB_READ_MODEL_ENABLED = config('JOB_READ_MODEL_ENABLED', default=False, cast=bool)
+# Seconds between checks for changes made by other processes
+JOB_READ_MODEL_CHECK_INTERVAL = config('JOB_READ_MODEL_CHECK_INTERVAL', default=30, cast=int)
+
+# ----------------------------
+# Sitemaps and JobPosting feed (generate_sitemaps command)
+# ----------------------------
+# Absolute base for URLs written into the files, e.g. https://yourdomain.com
+SITE_URL = config('SITE_URL', default='http://127.0.0.1:8000')
+SITEMAP_URL = '/sitemaps/'
+SITEMAP_ROOT = config('SITEMAP_ROOT', default=os.path.join(BASE_DIR, 'sitemaps'))
+
+# ----------------------------
+# Login/signup admission control
+# ----------------------------
+# Token buckets live in the default cache; use a shared cache to enforce them across processes
+AUTH_ADMISSION_ENABLED = config('AUTH_ADMISSION_ENABLED', default=True, cast=bool)
+AUTH_IP_BURST = config('AUTH_IP_BURST', default=20, cast=int)
+AUTH_IP_RATE = config('AUTH_IP_RATE', default=10, cast=float)  # attempts per minute
+AUTH_ACCOUNT_BURST = config('AUTH_ACCOUNT_BURST', default=5, cast=int)
+AUTH_ACCOUNT_RATE = config('AUTH_ACCOUNT_RATE', default=3, cast=float)  # attempts per minute
+# Read API (/api/v1/) requests per logged-in user, or per IP for anonymous callers
+API_BURST = config('API_BURST', default=60, cast=int)
+API_RATE = config('API_RATE', default=60, cast=float)  # requests per minute
+# Password hashes computed at once per process; keep below the server's thread count
+AUTH_HASH_CONCURRENCY = config('AUTH_HASH_CONCURRENCY', default=2, cast=int)
+AUTH_HASH_WAIT = config('AUTH_HASH_WAIT', default=0.1, cast=float)  # seconds to wait for a slot
+# Only enable behind a proxy that sets X-Forwarded-For
+AUTH_TRUST_X_FORWARDED_FOR = config('AUTH_TRUST_X_FORWARDED_FOR', default=False, cast=bool)
+
+# ----------------------------
+# Metrics (/metrics, Prometheus text format)
+# ----------------------------
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1', cast=lambda v: [ip.strip() for ip in v.split(',') if ip.strip()])
+# With several worker processes, point this at a directory shared by all of them
+METRICS_MULTIPROCESS_DIR = config('METRICS_MULTIPROCESS_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=int)  # seconds
+
+CACHES = {
+    'default': {
+        # Local-memory cache that also reports hits and misses to /metrics
+        'BACKEND': 'myapp.metrics.InstrumentedLocMemCache',
+    }
+}
+
+# ----------------------------
+# Request profiler
+# ----------------------------
+# Staff can always profile a request by sending "X-Profile: 1"
+PROFILER_DIR = config('PROFILER_DIR', default=os.path.join(BASE_DIR, 'profiles'))
+PROFILER_FORMAT = config('PROFILER_FORMAT', default='collapsed')  # 'collapsed' or 'speedscope'
+PROFILER_INTERVAL = config('PROFILER_INTERVAL', default=0.005, cast=float)  # seconds between samples
+# Share of requests profiled at random (0.01 = 1%)
+PROFILER_SAMPLE_RATE = config('PROFILER_SAMPLE_RATE', default=0.0, cast=float)
+# Profile every request and keep those slower than this; 0 disables
+PROFILER_SLOW_THRESHOLD_MS = config('PROFILER_SLOW_THRESHOLD_MS', default=0, cast=int)
+PROFILER_MAX_FILES = config('PROFILER_MAX_FILES', default=200, cast=int)
+
+# ----------------------------
+# Response compression
+# ----------------------------
+# Brotli is used when the optional "brotli" package is installed and the client accepts it
+COMPRESSION_LEVEL = config('COMPRESSION_LEVEL', default=6, cast=int)  # gzip, 1-9
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)  # 0-11
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=512, cast=int)  # bytes
+COMPRESSION_CONTENT_TYPES = ['text/html', 'application/json', 'application/ld+json', 'text/plain']
+
+# ----------------------------
+# Warm boot
+# ----------------------------
+# job.wsgi / job.asgi preload templates and URL patterns at import; `serve` also connects sync workers
+WARM_BOOT_ENABLED = config('WARM_BOOT_ENABLED', default=True, cast=bool)
+
+# ----------------------------
+# Duplicate job detection
+# ----------------------------
+# Estimated similarity (0-1) of title, description and requirements above which post_job
+# asks for confirmation and dedupe_jobs archives the newer posting
+JOB_DUPLICATE_THRESHOLD = config('JOB_DUPLICATE_THRESHOLD', default=0.8, cast=float)
+
+# ----------------------------
+# Search log and hot-query cache
+# ----------------------------
+# Searches are buffered per process and written in batches
+SEARCH_LOG_BUFFER_SIZE = config('SEARCH_LOG_BUFFER_SIZE', default=200, cast=int)
+SEARCH_LOG_FLUSH_INTERVAL = config('SEARCH_LOG_FLUSH_INTERVAL', default=30, cast=int)  # seconds
+# First result pages of this many of the most frequent searches are kept in the cache; 0 disables
+SEARCH_HOT_QUERIES = config('SEARCH_HOT_QUERIES', default=50, cast=int)
+SEARCH_HOT_WINDOW_DAYS = config('SEARCH_HOT_WINDOW_DAYS', default=7, cast=int)
+SEARCH_CACHE_REFRESH_INTERVAL = config('SEARCH_CACHE_REFRESH_INTERVAL', default=60, cast=int)  # seconds
+SEARCH_CACHE_TTL = config('SEARCH_CACHE_TTL', default=300, cast=int)  # seconds
+# search_report lists searches slower than this on average
+SEARCH_SLOW_MS = config('SEARCH_SLOW_MS', default=200, cast=int)
@@ -18,13 +18,15 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from myapp.views import protected_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # Uploaded media is always authorised by Django; the bytes may be sent by the front server
+    path(settings.MEDIA_URL.lstrip('/') + '<path:name>', protected_media, name='protected_media'),
     path('', include('myapp.urls')),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATICFILES_DIRS[0])
 
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job.settings')
 
 application = get_wsgi_application()
+
+if settings.WARM_BOOT_ENABLED:
+    # Compile templates and build the URL resolver before serving the first request. Connections are
+    # not opened here: they belong to this thread, and the server's request threads would not use them
+    from myapp.warmup import warm_boot  # noqa: E402
+    warm_boot()
@@ -1,3 +1,162 @@
+import hashlib
+
 from django.contrib import admin
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import (
+    ApplicationNotification, Category, Employer, Job, JobApplication, JobSeeker, ProfileView, ProfileViewDaily, SavedJob,
+)
+from .search import invalidate_all as invalidate_search_cache
+
+# Below this many estimated rows an exact COUNT(*) is cheap enough to run
+EXACT_COUNT_THRESHOLD = 10000
+COUNT_CACHE_TIMEOUT = 300
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for very large tables. Unfiltered changelists use the planner's
+    row estimate (pg_class.reltuples on PostgreSQL); filtered ones run the
+    exact count at most once per COUNT_CACHE_TIMEOUT for the same query.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = queryset.query
+        if not query.where:
+            estimate = self._estimated_table_rows(queryset)
+            if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+                return estimate
+        cache_key = "admin-count:" + hashlib.md5(str(query).encode()).hexdigest()
+        count = cache.get(cache_key)
+        if count is None:
+            count = queryset.count()
+            cache.set(cache_key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+    @staticmethod
+    def _estimated_table_rows(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for tables that were never vacuumed or analyzed
+        if not row or row[0] < 0:
+            return None
+        return int(row[0])
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) the changelist runs for "x of y selected"
+    show_full_result_count = False
+    list_per_page = 50
+    ordering = ('-id',)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'created_at')
+    search_fields = ('name',)
+
+
+@admin.register(Employer)
+class EmployerAdmin(LargeTableAdmin):
+    list_display = ('company_name', 'user', 'location', 'created_at')
+    list_select_related = ('user',)
+    search_fields = ('company_name',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(JobSeeker)
+class JobSeekerAdmin(LargeTableAdmin):
+    list_display = ('id', 'user', 'location', 'created_at')
+    list_select_related = ('user',)
+    search_fields = ('user__email',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdmin):
+    list_display = ('title', 'employer', 'category', 'job_type', 'application_deadline', 'is_active', 'created_at')
+    list_select_related = ('employer', 'category')
+    list_filter = ('is_active', 'job_type')
+    search_fields = ('title',)
+    autocomplete_fields = ('employer', 'category')
+    actions = ('deactivate_jobs', 'activate_jobs')
+
+    @admin.action(description="Deactivate selected jobs")
+    def deactivate_jobs(self, request, queryset):
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
+        invalidate_search_cache()
+        self.message_user(request, f"{updated} job(s) deactivated.")
+
+    @admin.action(description="Activate selected jobs")
+    def activate_jobs(self, request, queryset):
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
+        invalidate_search_cache()
+        self.message_user(request, f"{updated} job(s) activated.")
+
+
+def _status_action(status, label):
+    # Each action is a single UPDATE over the selected rows
+    @admin.action(description=f"Mark selected applications as {label.lower()}")
+    def action(modeladmin, request, queryset):
+        updated = queryset.update(status=status)
+        modeladmin.message_user(request, f"{updated} application(s) marked as {label.lower()}.")
+    action.__name__ = f"mark_{status}"
+    return action
+
+
+@admin.register(JobApplication)
+class JobApplicationAdmin(LargeTableAdmin):
+    list_display = ('id', 'job', 'job_seeker', 'status', 'applied_at')
+    list_select_related = ('job', 'job_seeker__user')
+    list_filter = ('status',)
+    autocomplete_fields = ('job', 'job_seeker')
+    actions = [_status_action(status, label) for status, label in JobApplication.STATUS_CHOICES]
+
+
+@admin.register(ApplicationNotification)
+class ApplicationNotificationAdmin(LargeTableAdmin):
+    list_display = ('id', 'employer', 'job_application_id', 'is_read', 'created_at')
+    list_select_related = ('employer',)
+    list_filter = ('is_read',)
+    raw_id_fields = ('employer', 'job_application')
+    actions = ('mark_read',)
+
+    @admin.action(description="Mark selected notifications as read")
+    def mark_read(self, request, queryset):
+        updated = queryset.update(is_read=True)
+        self.message_user(request, f"{updated} notification(s) marked as read.")
+
+
+@admin.register(ProfileView)
+class ProfileViewAdmin(LargeTableAdmin):
+    list_display = ('id', 'job_seeker', 'employer', 'viewed_at')
+    list_select_related = ('job_seeker__user', 'employer')
+    raw_id_fields = ('job_seeker', 'employer')
+
+
+@admin.register(ProfileViewDaily)
+class ProfileViewDailyAdmin(LargeTableAdmin):
+    list_display = ('id', 'job_seeker', 'employer', 'date', 'count')
+    list_select_related = ('job_seeker__user', 'employer')
+    raw_id_fields = ('job_seeker', 'employer')
+
 
-# Register your models here.
+@admin.register(SavedJob)
+class SavedJobAdmin(LargeTableAdmin):
+    list_display = ('id', 'job', 'job_seeker', 'saved_at')
+    list_select_related = ('job', 'job_seeker__user')
+    raw_id_fields = ('job', 'job_seeker')
@@ -0,0 +1,158 @@
+"""
+Admission control for the endpoints that hash passwords (login and signup),
+and a per-caller rate limit for the read API.
+
+A POST is admitted only if the client IP's and the account's token buckets
+have a token left and one of AUTH_HASH_CONCURRENCY hashing slots frees up
+within AUTH_HASH_WAIT seconds. Anything else gets an immediate 429, so a
+credential-stuffing burst can occupy at most that many server threads.
+API requests take a token from the caller's own bucket (API_BURST, API_RATE)
+and get a JSON 429 once it is empty. Buckets live in the default cache: per
+process with the local-memory cache, shared between processes and servers with
+Redis or Memcached.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+
+REJECTION_MESSAGE = "Too many sign-in attempts. Please wait a moment and try again."
+API_REJECTION_MESSAGE = "Too many requests. Please wait a moment and try again."
+
+
+class TokenBucket:
+    """``burst`` tokens, refilled at ``per_minute`` tokens a minute, stored in the cache under ``prefix``."""
+
+    def __init__(self, prefix, burst, per_minute):
+        self.prefix = prefix
+        self.burst = burst
+        self.per_minute = per_minute
+
+    def take(self, key, now=None):
+        """Use one token for ``key``; returns the seconds to wait when none is left, else 0."""
+        now = now if now is not None else time.time()
+        cache_key = f'admission:{self.prefix}:{key}'
+        tokens, updated = cache.get(cache_key, (self.burst, now))
+        rate = self.per_minute / 60.0
+        tokens = min(self.burst, tokens + (now - updated) * rate)
+        if tokens < 1:
+            return (1 - tokens) / rate
+        # A concurrent take between get and set can be lost; the bucket stays approximately right
+        cache.set(cache_key, (tokens - 1, now), timeout=int(self.burst / rate) + 60)
+        return 0
+
+
+class AdmissionMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = Counter()
+        self.hashing_seconds = 0.0
+        self.in_flight = 0
+
+    def incr(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, elapsed):
+        with self._lock:
+            self.in_flight -= 1
+            self.hashing_seconds += elapsed
+            self.counts['admitted'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                **self.counts,
+                'hashing_seconds': round(self.hashing_seconds, 3),
+                'in_flight': self.in_flight,
+            }
+
+
+metrics = AdmissionMetrics()
+_hashing_slots = None
+_slots_lock = threading.Lock()
+
+
+def hashing_slots():
+    global _hashing_slots
+    with _slots_lock:
+        if _hashing_slots is None:
+            _hashing_slots = threading.BoundedSemaphore(settings.AUTH_HASH_CONCURRENCY)
+        return _hashing_slots
+
+
+def client_ip(request):
+    if settings.AUTH_TRUST_X_FORWARDED_FOR:
+        # The proxy in front of us appends the address it saw last
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _retry_after(response, retry_after):
+    response['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return response
+
+
+def _reject(reason, retry_after):
+    metrics.incr(f'rejected_{reason}')
+    return _retry_after(HttpResponse(REJECTION_MESSAGE, status=429, content_type='text/plain'), retry_after)
+
+
+def admission_controlled(account_field):
+    """Apply admission control to POSTs of a view; ``account_field`` names the POSTed email/username."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method != 'POST' or not settings.AUTH_ADMISSION_ENABLED:
+                return view(request, *args, **kwargs)
+            ip_bucket = TokenBucket('ip', settings.AUTH_IP_BURST, settings.AUTH_IP_RATE)
+            wait = ip_bucket.take(client_ip(request))
+            if wait:
+                return _reject('ip', wait)
+            account = (request.POST.get(account_field) or '').strip().lower()
+            if account:
+                account_bucket = TokenBucket('account', settings.AUTH_ACCOUNT_BURST, settings.AUTH_ACCOUNT_RATE)
+                wait = account_bucket.take(hashlib.sha256(account.encode()).hexdigest())
+                if wait:
+                    return _reject('account', wait)
+
+            slots = hashing_slots()
+            if not slots.acquire(timeout=settings.AUTH_HASH_WAIT):
+                return _reject('busy', 1)
+            started = time.monotonic()
+            metrics.started()
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                metrics.finished(time.monotonic() - started)
+                slots.release()
+        return wrapped
+    return decorator
+
+
+def api_rate_limited(view):
+    """Rate-limit a read API view per logged-in user, or per client IP for anonymous callers."""
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if not settings.AUTH_ADMISSION_ENABLED:
+            return view(request, *args, **kwargs)
+        if request.user.is_authenticated:
+            key = 'user:' + hashlib.sha256(str(request.user.pk).encode()).hexdigest()
+        else:
+            key = 'ip:' + client_ip(request)
+        wait = TokenBucket('api', settings.API_BURST, settings.API_RATE).take(key)
+        if wait:
+            return _retry_after(JsonResponse({'error': API_REJECTION_MESSAGE}, status=429), wait)
+        return view(request, *args, **kwargs)
+    return wrapped
@@ -0,0 +1,234 @@
+"""
+Read API (v1) for jobs and applications.
+
+Each resource maps its public field names to the columns they are read from.
+``fields=`` picks a subset and only those columns are selected, through
+values(), so asking for ids and titles reads no descriptions and joins no
+employer table. Lists are paginated with an opaque keyset cursor, so every
+page costs one indexed query however deep it is, and ``ids=`` fetches up to
+API_MAX_IDS records in one query. Responses are encoded with orjson when it is
+installed. Both endpoints require a logged-in user, like the HTML pages showing
+the same data, and are rate-limited per user by admission.api_rate_limited.
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from django.db.models import Q
+from django.urls import reverse
+
+from .models import Job, JobApplication
+from .search import normalize_query, parse_filters, query_filter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder produces the same documents
+    orjson = None
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+API_MAX_IDS = 100
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+class Field:
+    """A public field: the columns it reads and how their values become its JSON value."""
+
+    def __init__(self, *columns, convert=None):
+        self.columns = columns
+        self.convert = convert
+
+    def value(self, row):
+        if self.convert is None:
+            return row[self.columns[0]]
+        return self.convert(*(row[column] for column in self.columns))
+
+
+class Resource:
+    def __init__(self, fields, default_fields):
+        self.fields = fields
+        self.default_fields = default_fields
+
+    def parse_fields(self, param):
+        """Requested field names in order; ``id`` is always included."""
+        names = [name.strip() for name in param.split(',') if name.strip()] if param else self.default_fields
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(self.fields)}.")
+        return list(dict.fromkeys(['id', *names]))
+
+    def columns(self, names, extra=()):
+        columns = dict.fromkeys(extra)
+        for name in names:
+            columns.update(dict.fromkeys(self.fields[name].columns))
+        return list(columns)
+
+    def serialize(self, rows, names):
+        fields = [(name, self.fields[name]) for name in names]
+        return [{name: field.value(row) for name, field in fields} for row in rows]
+
+
+_job_type_display = dict(Job.JOB_TYPE_CHOICES)
+_status_display = dict(JobApplication.STATUS_CHOICES)
+
+JOBS = Resource(
+    fields={
+        'id': Field('id'),
+        'title': Field('title'),
+        'company': Field('employer__company_name'),
+        'location': Field('location'),
+        'job_type': Field('job_type'),
+        'job_type_display': Field('job_type', convert=lambda value: _job_type_display.get(value, value)),
+        'category': Field('category_id', 'category__name', convert=lambda pk, name: {'id': pk, 'name': name}),
+        'salary': Field('salary'),
+        'description': Field('description'),
+        'requirements': Field('requirements'),
+        'contact_email': Field('contact_email'),
+        'application_deadline': Field('application_deadline', convert=_iso),
+        'created_at': Field('created_at', convert=_iso),
+        'updated_at': Field('updated_at', convert=_iso),
+        'url': Field('id', convert=lambda pk: reverse('job_detail', args=[pk])),
+    },
+    default_fields=['title', 'company', 'location', 'job_type', 'salary', 'created_at'],
+)
+
+APPLICATIONS = Resource(
+    fields={
+        'id': Field('id'),
+        'job': Field('job_id'),
+        'job_title': Field('job__title'),
+        'company': Field('job__employer__company_name'),
+        'status': Field('status'),
+        'status_display': Field('status', convert=lambda value: _status_display.get(value, value)),
+        'applicant': Field(
+            'job_seeker__user__first_name', 'job_seeker__user__last_name', 'job_seeker__user__email',
+            convert=lambda first, last, email: {'first_name': first, 'last_name': last, 'email': email},
+        ),
+        'cover_letter': Field('cover_letter'),
+        'applied_at': Field('applied_at', convert=_iso),
+    },
+    default_fields=['job', 'job_title', 'status', 'applied_at'],
+)
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ApiError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size:
+        raise ApiError("Invalid cursor.")
+    return values
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(f"{name} must be an integer.")
+
+
+def parse_limit(value):
+    if not value:
+        return API_PAGE_SIZE
+    limit = _int(value, 'limit')
+    if not 1 <= limit <= API_MAX_PAGE_SIZE:
+        raise ApiError(f"limit must be between 1 and {API_MAX_PAGE_SIZE}.")
+    return limit
+
+
+def parse_ids(value):
+    ids = list(dict.fromkeys(_int(pk, 'ids') for pk in value.split(',') if pk.strip()))
+    if len(ids) > API_MAX_IDS:
+        raise ApiError(f"At most {API_MAX_IDS} ids per request.")
+    return ids
+
+
+def _batch(resource, queryset, names, ids):
+    """Records of ``ids`` in the requested order from one query, plus the ids not found."""
+    rows = {row['id']: row for row in queryset.filter(id__in=ids).values(*resource.columns(names))}
+    return {
+        'data': resource.serialize([rows[pk] for pk in ids if pk in rows], names),
+        'missing': [pk for pk in ids if pk not in rows],
+    }
+
+
+def list_jobs(params):
+    """Open jobs, newest first; ``ids`` fetches open jobs by id instead."""
+    names = JOBS.parse_fields(params.get('fields'))
+    jobs = Job.objects.live()
+    if params.get('ids') is not None:
+        return _batch(JOBS, jobs, names, parse_ids(params['ids']))
+
+    q = normalize_query(params.get('q'))
+    if q:
+        jobs = jobs.filter(query_filter(q))
+    try:
+        category_id, job_type = parse_filters(params)
+    except ValueError as e:
+        raise ApiError(str(e))
+    if category_id is not None:
+        jobs = jobs.filter(category_id=category_id)
+    if job_type:
+        jobs = jobs.filter(job_type=job_type)
+    if params.get('cursor'):
+        created_at, last_id = decode_cursor(params['cursor'], 2)
+        try:
+            created_at = datetime.datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise ApiError("Invalid cursor.")
+        jobs = jobs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=_int(last_id, 'cursor')))
+
+    limit = parse_limit(params.get('limit'))
+    rows = list(jobs.order_by('-created_at', '-id').values(*JOBS.columns(names, extra=('id', 'created_at')))[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1]['created_at'].isoformat(), rows[-1]['id']])
+    return {'data': JOBS.serialize(rows, names), 'next_cursor': next_cursor}
+
+
+def list_applications(user, params):
+    """Applications to the user's job posts and the user's own applications, newest first."""
+    names = APPLICATIONS.parse_fields(params.get('fields'))
+    applications = JobApplication.objects.filter(Q(job__employer__user=user) | Q(job_seeker__user=user))
+    if params.get('ids') is not None:
+        return _batch(APPLICATIONS, applications, names, parse_ids(params['ids']))
+
+    if params.get('job'):
+        applications = applications.filter(job_id=_int(params['job'], 'job'))
+    if params.get('status'):
+        if params['status'] not in _status_display:
+            raise ApiError("Invalid status.")
+        applications = applications.filter(status=params['status'])
+    if params.get('cursor'):
+        last_id, = decode_cursor(params['cursor'], 1)
+        applications = applications.filter(id__lt=_int(last_id, 'cursor'))
+
+    limit = parse_limit(params.get('limit'))
+    rows = list(applications.order_by('-id').values(*APPLICATIONS.columns(names))[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1]['id']])
+    return {'data': APPLICATIONS.serialize(rows, names), 'next_cursor': next_cursor}
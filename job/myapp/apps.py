@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class AppnameConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'myapp'
+
+    def ready(self):
+        from django.conf import settings
+        from .autocomplete import connect_signals as connect_autocomplete_signals
+        connect_autocomplete_signals()
+        from .dedupe import connect_signals as connect_dedupe_signals
+        connect_dedupe_signals()
+        from .search import connect_signals as connect_search_signals
+        connect_search_signals()
+        if settings.JOB_READ_MODEL_ENABLED:
+            from .job_index import connect_signals
+            connect_signals()
@@ -0,0 +1,229 @@
+"""
+Prefix autocomplete over open jobs' titles, company names and locations.
+
+Suggestions live in a sorted list searched with bisect. Every word of a value
+is indexed, so "eng" suggests "Senior Engineer". A suggestion's popularity is
+the number of open jobs that use it. Prefixes matching more than SCAN_LIMIT
+entries keep a precomputed list of their MAX_SUGGESTIONS most popular terms,
+merged from their children's lists, so a keystroke never ranks more than
+SCAN_LIMIT entries. A change to a term recomputes only the lists along its
+keys.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+
+from .job_index import current_version
+from .models import Employer, Job
+
+MAX_TERM_LENGTH = 100
+MAX_SUGGESTIONS = 20
+SCAN_LIMIT = 64
+
+
+def _word_keys(text):
+    """Lower-cased suffixes of ``text`` starting at each word."""
+    lowered = text.lower()
+    keys = [lowered]
+    for position, char in enumerate(lowered):
+        if position and not lowered[position - 1].isalnum() and char.isalnum():
+            keys.append(lowered[position:])
+    return keys
+
+
+def _job_terms(title, company_name, location):
+    return tuple(
+        (kind, value.strip()[:MAX_TERM_LENGTH])
+        for kind, value in (('title', title), ('company', company_name), ('location', location))
+        if value and value.strip()
+    )
+
+
+def _range(entries, prefix, start=0, end=None):
+    end = len(entries) if end is None else end
+    start = bisect_left(entries, (prefix,), start, end)
+    return start, bisect_left(entries, (prefix + '\uffff',), start, end)
+
+
+def _children(entries, prefix, start, end):
+    """(child prefix, start, end) for each range below ``prefix``; the child is None for a key equal to it."""
+    depth = len(prefix)
+    position = start
+    while position < end:
+        key = entries[position][0]
+        if len(key) == depth:
+            yield None, position, position + 1
+            position += 1
+            continue
+        child = key[:depth + 1]
+        child_end = bisect_left(entries, (child + '\uffff',), position, end)
+        yield child, position, child_end
+        position = child_end
+
+
+def _best(entries, counts, top, prefix, start, end):
+    """The MAX_SUGGESTIONS most popular terms under ``prefix``, from its children's lists or entries."""
+    candidates = set()
+    for child, child_start, child_end in _children(entries, prefix, start, end):
+        if child in top:
+            candidates.update(top[child])
+        else:
+            candidates.update((kind, text) for key, kind, text in entries[child_start:child_end])
+    return heapq.nsmallest(MAX_SUGGESTIONS, candidates, key=lambda term: (-counts[term], term[1]))
+
+
+def _build_top(entries, counts, top, prefix, start, end):
+    for child, child_start, child_end in _children(entries, prefix, start, end):
+        if child is not None and child_end - child_start > SCAN_LIMIT:
+            _build_top(entries, counts, top, child, child_start, child_end)
+    if prefix:
+        top[prefix] = _best(entries, counts, top, prefix, start, end)
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._reset()
+        self.version = None
+        self.checked_at = 0.0
+        self.built = False
+
+    def _reset(self):
+        self.entries = []  # sorted (key, kind, text)
+        self.counts = Counter()  # (kind, text) -> number of open jobs
+        self.job_terms = {}  # job id -> terms it contributes
+        self.top = {}  # prefix matching more than SCAN_LIMIT entries -> its best terms
+
+    def _add_term(self, term):
+        self.counts[term] += 1
+        if self.counts[term] == 1:
+            kind, text = term
+            for key in _word_keys(text):
+                insort(self.entries, (key, kind, text))
+
+    def _remove_term(self, term):
+        self.counts[term] -= 1
+        if self.counts[term] <= 0:
+            del self.counts[term]
+            kind, text = term
+            for key in _word_keys(text):
+                position = bisect_left(self.entries, (key, kind, text))
+                if position < len(self.entries) and self.entries[position] == (key, kind, text):
+                    del self.entries[position]
+
+    def _refresh_top(self, terms):
+        """Recompute the lists of every prefix of the keys of ``terms``, deepest first."""
+        for kind, text in terms:
+            for key in _word_keys(text):
+                path = []
+                start, end = 0, len(self.entries)
+                for depth in range(1, len(key) + 1):
+                    start, end = _range(self.entries, key[:depth], start, end)
+                    if end - start <= SCAN_LIMIT:
+                        break
+                    path.append((key[:depth], start, end))
+                # Prefixes below the path are narrow enough to scan now
+                for depth in range(len(path) + 1, len(key) + 1):
+                    self.top.pop(key[:depth], None)
+                for prefix, start, end in reversed(path):
+                    self.top[prefix] = _best(self.entries, self.counts, self.top, prefix, start, end)
+
+    def build(self):
+        version = current_version()
+        counts = Counter()
+        job_terms = {}
+        rows = Job.objects.live().values_list('id', 'title', 'employer__company_name', 'location').order_by()
+        for job_id, title, company_name, location in rows.iterator(chunk_size=5000):
+            terms = _job_terms(title, company_name, location)
+            job_terms[job_id] = terms
+            counts.update(terms)
+        entries = sorted(
+            (key, kind, text) for (kind, text) in counts for key in _word_keys(text)
+        )
+        top = {}
+        _build_top(entries, counts, top, '', 0, len(entries))
+        with self._lock:
+            self.entries, self.counts, self.job_terms, self.top = entries, counts, job_terms, top
+            self.version = version
+            self.checked_at = time.monotonic()
+            self.built = True
+
+    def ensure_fresh(self):
+        if self.built and time.monotonic() - self.checked_at < settings.JOB_READ_MODEL_CHECK_INTERVAL:
+            return
+        if not self._build_lock.acquire(blocking=not self.built):
+            return
+        try:
+            if not self.built or current_version() != self.version:
+                self.build()
+            else:
+                self.checked_at = time.monotonic()
+        finally:
+            self._build_lock.release()
+
+    def upsert(self, job_id, terms):
+        with self._lock:
+            if not self.built:
+                return
+            previous = self.job_terms.pop(job_id, ())
+            for term in previous:
+                self._remove_term(term)
+            if terms:
+                self.job_terms[job_id] = terms
+                for term in terms:
+                    self._add_term(term)
+            self._refresh_top(set(previous) | set(terms))
+
+    def remove(self, job_id):
+        self.upsert(job_id, ())
+
+    def suggest(self, prefix, limit=8):
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        limit = min(limit, MAX_SUGGESTIONS)
+        with self._lock:
+            if prefix in self.top:
+                best = self.top[prefix][:limit]
+            else:
+                start, end = _range(self.entries, prefix)
+                # The same suggestion can match through several of its words
+                candidates = {(kind, text) for key, kind, text in self.entries[start:end]}
+                best = heapq.nsmallest(limit, candidates, key=lambda term: (-self.counts[term], term[1]))
+            return [{'text': text, 'type': kind, 'jobs': self.counts[(kind, text)]} for kind, text in best]
+
+
+prefix_index = PrefixIndex()
+
+
+def _job_saved(sender, instance, **kwargs):
+    if not prefix_index.built:
+        return
+    if instance.is_active and not instance.is_expired():
+        terms = _job_terms(instance.title, instance.employer.company_name, instance.location)
+    else:
+        terms = ()
+    prefix_index.upsert(instance.pk, terms)
+
+
+def _job_deleted(sender, instance, **kwargs):
+    prefix_index.remove(instance.pk)
+
+
+def _employer_saved(sender, instance, **kwargs):
+    # Company renames don't touch Job rows, so force a rebuild on the next request
+    if prefix_index.built and not kwargs.get('created'):
+        prefix_index.checked_at = 0.0
+        prefix_index.version = None
+
+
+def connect_signals():
+    post_save.connect(_job_saved, sender=Job, dispatch_uid='prefix_index_job_save')
+    post_delete.connect(_job_deleted, sender=Job, dispatch_uid='prefix_index_job_delete')
+    post_save.connect(_employer_saved, sender=Employer, dispatch_uid='prefix_index_employer_save')
@@ -0,0 +1,99 @@
+import logging
+
+from django.core.files.storage import default_storage
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .autocomplete import prefix_index
+from .job_index import open_jobs_index
+from .models import ApplicationNotification, Job, JobApplication, JobLSHBucket, PendingFileDeletion, SavedJob
+from .search import invalidate_all as invalidate_search_cache
+
+logger = logging.getLogger(__name__)
+
+DELETE_CHUNK_SIZE = 1000
+
+
+def archive_jobs(job_ids):
+    """Hide jobs from listings with a single UPDATE. Returns the number of jobs archived."""
+    archived = Job.objects.filter(id__in=job_ids, is_active=True).update(is_active=False, updated_at=timezone.now())
+    if archived:
+        invalidate_search_cache()
+    return archived
+
+
+def _delete_where(model, field, values):
+    """
+    Issue one DELETE ... WHERE field IN (values) without loading the rows. It
+    bypasses the ORM collector, so no cascades run and no delete signals are sent.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(values))
+    sql = f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.get_field(field).column)} IN ({placeholders})"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, list(values))
+        return cursor.rowcount
+
+
+def _delete_in_chunks(queryset, before_delete=None):
+    """
+    Delete the rows of ``queryset`` in primary key ordered chunks, each in its
+    own short transaction. Dependent rows must already be gone (or be removed
+    by ``before_delete``) because the DELETE bypasses the ORM collector.
+    """
+    deleted = 0
+    while True:
+        rows = list(queryset.order_by('pk').values_list('pk', flat=True)[:DELETE_CHUNK_SIZE])
+        if not rows:
+            return deleted
+        with transaction.atomic():
+            if before_delete is not None:
+                before_delete(rows)
+            deleted += _delete_where(queryset.model, queryset.model._meta.pk.name, rows)
+
+
+def _delete_application_dependents(application_ids):
+    names = JobApplication.objects.filter(pk__in=application_ids).exclude(resume='').values_list('resume', flat=True)
+    PendingFileDeletion.objects.bulk_create([PendingFileDeletion(name=name) for name in names if name])
+    _delete_where(ApplicationNotification, 'job_application', application_ids)
+
+
+def delete_jobs(job_ids):
+    """
+    Delete jobs together with their applications, notifications and saved
+    entries and duplicate index rows using set-based, chunked DELETEs. Uploaded application resumes are
+    queued in PendingFileDeletion for process_file_deletions to remove.
+    Returns the number of jobs deleted.
+    """
+    job_ids = list(job_ids)
+    if not job_ids:
+        return 0
+    _delete_in_chunks(JobApplication.objects.filter(job_id__in=job_ids), before_delete=_delete_application_dependents)
+    _delete_in_chunks(SavedJob.objects.filter(job_id__in=job_ids))
+    _delete_in_chunks(JobLSHBucket.objects.filter(job_id__in=job_ids))
+    deleted = _delete_in_chunks(Job.objects.filter(id__in=job_ids))
+    # No post_delete was sent, so update what its handlers maintain
+    for job_id in job_ids:
+        open_jobs_index.remove(job_id)
+        prefix_index.remove(job_id)
+    invalidate_search_cache()
+    return deleted
+
+
+def process_file_deletions(limit=None):
+    """Remove queued files from storage. Returns (deleted, failed) counts."""
+    deleted = failed = 0
+    pending = PendingFileDeletion.objects.order_by('pk')
+    if limit:
+        pending = pending[:limit]
+    for entry in pending.iterator():
+        try:
+            default_storage.delete(entry.name)
+        except OSError as e:
+            logger.error(f"Failed to delete file {entry.name}: {e}")
+            failed += 1
+            continue
+        entry.delete()
+        deleted += 1
+    return deleted, failed
@@ -0,0 +1,116 @@
+"""
+Compression of dynamic HTML and JSON responses: Brotli when the ``brotli``
+package is installed and the client accepts it, gzip otherwise. Streaming
+responses are compressed chunk by chunk, flushing after each one so the
+client receives every chunk as soon as it is produced.
+"""
+import gzip
+import io
+import re
+import secrets
+import string
+
+from django.conf import settings
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+ACCEPT_ENCODING_RE = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([01](?:\.\d{0,3})?))?\s*')
+MAX_RANDOM_FILENAME = 100
+
+
+def _random_filename():
+    # Random-length gzip header like Django's GZipMiddleware, so compressed sizes leak less (BREACH)
+    length = secrets.randbelow(MAX_RANDOM_FILENAME) + 1
+    return ''.join(secrets.choice(string.ascii_letters) for _ in range(length))
+
+
+def choose_encoding(accept_encoding):
+    accepted = set()
+    for part in accept_encoding.split(','):
+        match = ACCEPT_ENCODING_RE.fullmatch(part)
+        if match and (match[2] is None or float(match[2]) > 0):
+            accepted.add(match[1].lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_bytes(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    buffer = io.BytesIO()
+    with gzip.GzipFile(_random_filename(), 'wb', settings.COMPRESSION_LEVEL, buffer, mtime=0) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def compress_chunks(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    buffer = io.BytesIO()
+    with gzip.GzipFile(_random_filename(), 'wb', settings.COMPRESSION_LEVEL, buffer, mtime=0) as f:
+        for chunk in chunks:
+            f.write(chunk)
+            f.flush()
+            data = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            if data:
+                yield data
+    yield buffer.getvalue()
+
+
+class CompressionMiddleware:
+    """Compress HTML/JSON responses of at least COMPRESSION_MIN_SIZE bytes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if (
+            content_type not in settings.COMPRESSION_CONTENT_TYPES
+            or response.has_header('Content-Encoding')
+            or response.has_header('Content-Range')
+            # Uploaded files are sent as they are; the front server may take them over
+            or isinstance(response, FileResponse)
+            or getattr(response, 'is_async', False)
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_chunks(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+                return response
+            compressed = compress_bytes(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The body changed, so a strong ETag no longer matches it byte for byte
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
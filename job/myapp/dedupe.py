@@ -0,0 +1,224 @@
+"""
+Near-duplicate job postings, found with MinHash and locality-sensitive hashing.
+
+A job's title, description and requirements are split into word shingles
+and summarised by NUM_PERM MinHash values (Job.minhash). The signature is
+cut into BANDS bands of ROWS values and each band is hashed to a
+JobLSHBucket key. Jobs that share a key are candidates and only those are
+compared, so a lookup is one indexed query rather than a scan of every open
+job. With 16 bands of 8 rows a pair at 0.9 similarity shares a bucket
+with probability 0.9999 and a pair at 0.8 with 0.95, while a pair at 0.4
+does about 1% of the time.
+"""
+import hashlib
+import random
+import re
+import struct
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from .models import Job, JobLSHBucket
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure Python path computes the same signatures
+    np = None
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+BATCH_SIZE = 1000
+SIGNATURE_FIELDS = {'title', 'description', 'requirements'}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_MASK_64 = (1 << 64) - 1
+_SIGNATURE = struct.Struct(f'<{NUM_PERM}I')
+WORD_RE = re.compile(r'\w+')
+
+# Fixed seed: signatures are stored, so every process must use the same permutations
+_random = random.Random(4817)
+_A = [_random.randint(1, _MERSENNE_PRIME - 1) for i in range(NUM_PERM)]
+_B = [_random.randint(0, _MERSENNE_PRIME - 1) for i in range(NUM_PERM)]
+if np is not None:
+    _A_NP = np.array(_A, dtype=np.uint64)[:, None]
+    _B_NP = np.array(_B, dtype=np.uint64)[:, None]
+
+
+def shingles(text):
+    """Overlapping runs of SHINGLE_SIZE lower-cased words; shorter texts are a single shingle."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def _hash32(value):
+    # hash() is salted per process; signatures need a stable hash
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=4).digest(), 'little')
+
+
+def signature(text):
+    """MinHash of ``text`` as NUM_PERM little-endian 32-bit values."""
+    hashes = [_hash32(shingle) for shingle in shingles(text)]
+    if not hashes:
+        return _SIGNATURE.pack(*[_MAX_HASH] * NUM_PERM)
+    # Both paths compute ((a * h + b) mod 2**64) mod p, truncated to 32 bits
+    if np is not None:
+        values = np.array(hashes, dtype=np.uint64)[None, :]
+        permuted = ((_A_NP * values + _B_NP) % np.uint64(_MERSENNE_PRIME)) & np.uint64(_MAX_HASH)
+        return permuted.min(axis=1).astype('<u4').tobytes()
+    return _SIGNATURE.pack(*(
+        min((((a * h + b) & _MASK_64) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in zip(_A, _B)
+    ))
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return sum(x == y for x, y in zip(_SIGNATURE.unpack(bytes(first)), _SIGNATURE.unpack(bytes(second)))) / NUM_PERM
+
+
+def band_keys(sig):
+    size = ROWS * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + sig[band * size:(band + 1) * size], digest_size=8).digest(),
+            'little', signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def job_signature(job):
+    source = (job.title or '', job.description or '', job.requirements or '')
+    # Cached on the instance so post_job's duplicate check and the post_save handler hash once
+    if getattr(job, '_minhash_source', None) != source:
+        job._minhash = signature('\n'.join(source))
+        job._minhash_source = source
+    return job._minhash
+
+
+def index_jobs(jobs, force=False):
+    """
+    Store the signature and bucket rows of saved ``jobs`` whose text changed
+    (all of them with ``force``). Needed after bulk_create, which sends no
+    signals. Returns the number of jobs indexed.
+    """
+    changed = []
+    for job in jobs:
+        if job.pk is None:
+            continue
+        sig = job_signature(job)
+        if force or job.minhash is None or bytes(job.minhash) != sig:
+            job.minhash = sig
+            changed.append(job)
+    if not changed:
+        return 0
+    with transaction.atomic():
+        Job.objects.bulk_update(changed, ['minhash'], batch_size=BATCH_SIZE)
+        JobLSHBucket.objects.filter(job_id__in=[job.pk for job in changed]).delete()
+        JobLSHBucket.objects.bulk_create(
+            [JobLSHBucket(job_id=job.pk, key=key) for job in changed for key in band_keys(job.minhash)],
+            batch_size=BATCH_SIZE,
+        )
+    return len(changed)
+
+
+def find_duplicates(job, employer_id=None, threshold=None):
+    """Open jobs similar to ``job`` as [(similarity, job)], most similar first."""
+    threshold = settings.JOB_DUPLICATE_THRESHOLD if threshold is None else threshold
+    sig = job_signature(job)
+    candidates = Job.objects.live().filter(
+        id__in=JobLSHBucket.objects.filter(key__in=band_keys(sig)).values('job_id'),
+    ).exclude(pk=job.pk).only('id', 'title', 'created_at', 'minhash', 'employer_id')
+    if employer_id is not None:
+        candidates = candidates.filter(employer_id=employer_id)
+    matches = []
+    for candidate in candidates:
+        score = similarity(sig, candidate.minhash)
+        if score >= threshold:
+            matches.append((score, candidate))
+    matches.sort(key=lambda match: (-match[0], match[1].pk))
+    return matches
+
+
+def duplicate_groups(threshold=None, across_employers=False):
+    """
+    Clusters of near-duplicate open jobs from one ordered pass over the bucket
+    index, as [(kept job id, [duplicate ids])]. The oldest posting of each
+    cluster is kept, and every duplicate is itself similar to it: members only
+    linked through others are grouped again around the oldest of the rest.
+    Unless ``across_employers``, only jobs of the same employer are compared.
+    """
+    threshold = settings.JOB_DUPLICATE_THRESHOLD if threshold is None else threshold
+    rows = JobLSHBucket.objects.filter(job__in=Job.objects.live()).order_by('key', 'job_id').values_list(
+        'key', 'job_id'
+    ).iterator(chunk_size=BATCH_SIZE)
+    collisions = []
+    for key, group in groupby(rows, key=itemgetter(0)):
+        ids = [job_id for key, job_id in group]
+        if len(ids) > 1:
+            collisions.append(ids)
+
+    involved = sorted({job_id for ids in collisions for job_id in ids})
+    jobs = {}
+    for start in range(0, len(involved), BATCH_SIZE):
+        for job_id, employer_id, created_at, minhash in Job.objects.filter(
+            id__in=involved[start:start + BATCH_SIZE]
+        ).values_list('id', 'employer_id', 'created_at', 'minhash'):
+            jobs[job_id] = (employer_id, created_at, minhash)
+
+    parent = {}
+
+    def find(job_id):
+        while parent.setdefault(job_id, job_id) != job_id:
+            parent[job_id] = parent[parent[job_id]]
+            job_id = parent[job_id]
+        return job_id
+
+    def similar(first, second):
+        if not across_employers and jobs[first][0] != jobs[second][0]:
+            return False
+        return similarity(jobs[first][2], jobs[second][2]) >= threshold
+
+    compared = set()
+    for ids in collisions:
+        for i, first in enumerate(ids):
+            for second in ids[i + 1:]:
+                if (first, second) in compared or find(first) == find(second):
+                    continue
+                compared.add((first, second))
+                if similar(first, second):
+                    parent[find(second)] = find(first)
+
+    clusters = defaultdict(list)
+    for job_id in parent:
+        clusters[find(job_id)].append(job_id)
+    groups = []
+    for members in clusters.values():
+        members.sort(key=lambda job_id: (jobs[job_id][1], job_id))
+        # Union-find links A~B and B~C even when A and C differ, so check each member against the kept one
+        while len(members) > 1:
+            kept, rest = members[0], members[1:]
+            duplicates = [job_id for job_id in rest if similar(kept, job_id)]
+            if duplicates:
+                groups.append((kept, duplicates))
+            members = [job_id for job_id in rest if job_id not in duplicates]
+    return sorted(groups)
+
+
+def _job_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not SIGNATURE_FIELDS & set(update_fields)):
+        return
+    index_jobs([instance])
+
+
+def connect_signals():
+    post_save.connect(_job_saved, sender=Job, dispatch_uid='job_minhash_save')
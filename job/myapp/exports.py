@@ -0,0 +1,64 @@
+import csv
+import datetime
+import json
+
+from .models import JobApplication
+
+EXPORT_CHUNK_SIZE = 2000
+
+APPLICANT_EXPORT_FIELDS = (
+    ('application_id', 'id'),
+    ('job_id', 'job_id'),
+    ('job_title', 'job__title'),
+    ('status', 'status'),
+    ('first_name', 'job_seeker__user__first_name'),
+    ('last_name', 'job_seeker__user__last_name'),
+    ('email', 'job_seeker__user__email'),
+    ('applied_at', 'applied_at'),
+)
+
+
+class Echo:
+    """Pseudo-buffer whose write() hands the value back, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def parse_date(value):
+    """An ISO date, or None when ``value`` is empty; raises ValueError for anything else."""
+    if not value:
+        return None
+    return datetime.date.fromisoformat(value)
+
+
+def applicant_export_queryset(employer, job_id=None, status=None, since=None, until=None):
+    applications = JobApplication.objects.filter(job__employer=employer)
+    if job_id:
+        applications = applications.filter(job_id=job_id)
+    if status:
+        applications = applications.filter(status=status)
+    if since:
+        applications = applications.filter(applied_at__date__gte=since)
+    if until:
+        applications = applications.filter(applied_at__date__lte=until)
+    # Ordering by primary key keeps the scan on the index and the output stable
+    return applications.order_by('id').values_list(*(column for name, column in APPLICANT_EXPORT_FIELDS))
+
+
+def _rows(queryset):
+    for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [value.isoformat() if isinstance(value, datetime.datetime) else value for value in row]
+
+
+def iter_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, column in APPLICANT_EXPORT_FIELDS])
+    for row in _rows(queryset):
+        yield writer.writerow(row)
+
+
+def iter_jsonl(queryset):
+    names = [name for name, column in APPLICANT_EXPORT_FIELDS]
+    for row in _rows(queryset):
+        yield json.dumps(dict(zip(names, row))) + '\n'
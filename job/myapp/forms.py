@@ -1,3 +1,5 @@
+import copy
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import get_user_model
@@ -5,6 +7,31 @@ from .models import JobSeeker
 
 CustomUser = get_user_model()
 
+
+def styled_fields(**attrs_by_field):
+    """
+    Class decorator that sets widget attributes once, when the form class is
+    defined, rather than in __init__ or through template filters on every render.
+    Each instance deep-copies the styled fields as usual.
+    """
+    def decorate(form_class):
+        for name, attrs in attrs_by_field.items():
+            # Declared fields are shared with the parent form class, so style a copy
+            field = copy.deepcopy(form_class.base_fields[name])
+            field.widget.attrs.update(attrs)
+            form_class.base_fields[name] = field
+            if name in form_class.declared_fields:
+                form_class.declared_fields[name] = field
+        return form_class
+    return decorate
+
+
+@styled_fields(
+    email={'class': 'form-control', 'aria-describedby': 'id_email_help'},
+    username={'class': 'form-control', 'aria-describedby': 'id_username_help'},
+    password1={'class': 'form-control', 'aria-describedby': 'id_password1_help', 'placeholder': 'Password'},
+    password2={'class': 'form-control', 'aria-describedby': 'id_password2_help', 'placeholder': 'Confirm Password'},
+)
 class CustomUserCreationForm(UserCreationForm):
     class Meta:
         model = CustomUser
@@ -14,21 +41,16 @@ class CustomUserCreationForm(UserCreationForm):
         super().__init__(*args, **kwargs)
         self.fields['email'].required = True
         self.fields['email'].error_messages = {'required': 'Email is required.'}
-        self.fields['password1'].widget.attrs.update({'placeholder': 'Password'})
-        self.fields['password2'].widget.attrs.update({'placeholder': 'Confirm Password'})
         self.fields['password1'].help_text = None
         self.fields['password2'].help_text = None
 
+@styled_fields(password={'placeholder': 'Password'})
 class CustomAuthenticationForm(AuthenticationForm):
     username = forms.EmailField(
         label='Email',
         widget=forms.EmailInput(attrs={'placeholder': 'Email', 'autofocus': True})
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields['password'].widget.attrs['placeholder'] = 'Password'
-
 class ProfileSettingsForm(forms.ModelForm):
     class Meta:
         model = JobSeeker
@@ -71,34 +93,11 @@ class ResumeForm(forms.ModelForm):
         model = JobSeeker
         fields = ['resume']
 
-class CombinedProfileForm(forms.ModelForm):
-    class Meta:
-        model = JobSeeker
-        fields = ['phone', 'location', 'skills', 'experience', 'education', 'about', 'resume', 'profile_picture', 'linkedin_url', 'github_url']
+class CombinedProfileForm(ProfileSettingsForm):
+    class Meta(ProfileSettingsForm.Meta):
+        fields = ProfileSettingsForm.Meta.fields + ['about', 'resume', 'profile_picture', 'linkedin_url', 'github_url']
         widgets = {
-            'phone': forms.TextInput(attrs={
-                'placeholder': 'e.g., +1 234 567 8900',
-                'class': 'form-control profile-input'
-            }),
-            'location': forms.TextInput(attrs={
-                'placeholder': 'e.g., New York, NY',
-                'class': 'form-control profile-input'
-            }),
-            'skills': forms.Textarea(attrs={
-                'placeholder': 'List your key skills, e.g., Python, Django, JavaScript...',
-                'class': 'form-control profile-textarea',
-                'rows': 3
-            }),
-            'experience': forms.Textarea(attrs={
-                'placeholder': 'Describe your work experience, e.g., 3 years as Software Developer...',
-                'class': 'form-control profile-textarea',
-                'rows': 4
-            }),
-            'education': forms.Textarea(attrs={
-                'placeholder': 'e.g., Bachelor\'s in Computer Science from XYZ University',
-                'class': 'form-control profile-textarea',
-                'rows': 3
-            }),
+            **ProfileSettingsForm.Meta.widgets,
             'about': forms.Textarea(attrs={
                 'placeholder': 'Tell us about yourself, your career goals, and what makes you unique...',
                 'class': 'form-control profile-textarea',
@@ -120,11 +119,7 @@ class CombinedProfileForm(forms.ModelForm):
             }),
         }
         help_texts = {
-            'phone': 'Enter your contact number for job opportunities.',
-            'location': 'Your current city and state for location-based job matches.',
-            'skills': 'Highlight your technical and soft skills to attract employers.',
-            'experience': 'Detail your professional background and achievements.',
-            'education': 'Include degrees, certifications, and relevant coursework.',
+            **ProfileSettingsForm.Meta.help_texts,
             'about': 'Tell us about yourself, your career goals, and what makes you unique.',
             'resume': 'Upload your latest resume file.',
             'profile_picture': 'Upload your profile picture.',
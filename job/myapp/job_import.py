@@ -0,0 +1,195 @@
+import codecs
+import csv
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from .dedupe import index_jobs
+from .models import Category, Job
+from .search import invalidate_all as invalidate_search_cache
+
+# Form values used by post_job.html mapped to category names
+CATEGORY_MAPPING = {
+    'it': 'IT & Software',
+    'marketing': 'Marketing',
+    'design': 'Design',
+    'finance': 'Finance',
+    'healthcare': 'Healthcare',
+    'education': 'Education',
+    'engineering': 'Engineering',
+    'sales': 'Sales'
+}
+
+REQUIRED_FIELDS = ('title', 'location', 'job_type', 'category', 'deadline', 'description', 'requirements')
+MAX_LENGTHS = {'title': 200, 'location': 100, 'salary': 100}
+JOB_TYPES = {value for value, label in Job.JOB_TYPE_CHOICES}
+
+DEFAULT_CHUNK_SIZE = 500
+# Keep at most this many row errors in memory; the total is still counted
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': messages})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+class CategoryResolver:
+    """Resolve category slugs or names to ids from a map loaded once per import."""
+
+    def __init__(self):
+        self.ids = {name.lower(): pk for pk, name in Category.objects.values_list('id', 'name')}
+
+    def resolve(self, value):
+        value = value.strip()
+        name = CATEGORY_MAPPING.get(value.lower(), value)
+        key = name.lower()
+        if key not in self.ids:
+            # Only the categories offered on the post job form are created on demand
+            if name not in CATEGORY_MAPPING.values():
+                return None
+            category, created = Category.objects.get_or_create(name=name)
+            self.ids[key] = category.id
+        return self.ids[key]
+
+
+def detect_format(name='', content_type=''):
+    if name.endswith('.jsonl') or name.endswith('.ndjson') or 'json' in content_type:
+        return 'jsonl'
+    return 'csv'
+
+
+def iter_rows(lines, fmt):
+    """Yield (line_number, row_dict_or_None, error) from an iterable of text lines."""
+    if fmt == 'jsonl':
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "Each line must be a JSON object."
+                continue
+            yield line_number, row, None
+    else:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # Header is line 1, so data rows are reported with their file line number
+            yield reader.line_num, row, None
+
+
+def decode_lines(source, encoding='utf-8'):
+    """Lazily decode a binary line iterable (uploaded file, request body, binary file)."""
+    return codecs.iterdecode(source, encoding)
+
+
+def build_job(row, employer, categories):
+    """Validate one input row and return (Job, errors)."""
+    errors = []
+    data = {}
+    for field in ('title', 'location', 'job_type', 'salary', 'category', 'deadline',
+                  'description', 'requirements', 'contact_email'):
+        value = row.get(field)
+        data[field] = '' if value is None else str(value).strip()
+
+    for field in REQUIRED_FIELDS:
+        if not data[field]:
+            errors.append(f"{field} is required.")
+    for field, max_length in MAX_LENGTHS.items():
+        if len(data[field]) > max_length:
+            errors.append(f"{field} must be at most {max_length} characters.")
+    if data['job_type'] and data['job_type'] not in JOB_TYPES:
+        errors.append(f"Invalid job_type '{data['job_type']}'.")
+
+    deadline = None
+    if data['deadline']:
+        try:
+            deadline = datetime.date.fromisoformat(data['deadline'])
+        except ValueError:
+            errors.append("deadline must be a date in YYYY-MM-DD format.")
+
+    category_id = None
+    if data['category']:
+        category_id = categories.resolve(data['category'])
+        if category_id is None:
+            errors.append(f"Invalid category '{data['category']}'.")
+
+    if data['contact_email']:
+        try:
+            validate_email(data['contact_email'])
+        except ValidationError:
+            errors.append("contact_email is not a valid email address.")
+
+    if errors:
+        return None, errors
+
+    return Job(
+        title=data['title'],
+        description=data['description'],
+        requirements=data['requirements'],
+        location=data['location'],
+        job_type=data['job_type'],
+        salary=data['salary'],
+        category_id=category_id,
+        employer=employer,
+        application_deadline=deadline,
+        contact_email=data['contact_email'] or None,
+    ), []
+
+
+def import_jobs(lines, employer, fmt='csv', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream rows from ``lines`` and insert valid jobs for ``employer`` with
+    bulk_create, one transaction per chunk. Invalid rows are reported in the
+    result and never abort the rest of the batch.
+    """
+    result = ImportResult()
+    categories = CategoryResolver()
+    pending = []
+
+    def flush():
+        with transaction.atomic():
+            Job.objects.bulk_create(pending, batch_size=chunk_size)
+            # bulk_create sends no post_save; backends that return no primary keys are left to dedupe_jobs
+            index_jobs(pending)
+        invalidate_search_cache()
+        result.created += len(pending)
+        pending.clear()
+
+    for line_number, row, error in iter_rows(lines, fmt):
+        result.rows += 1
+        if error:
+            result.add_error(line_number, [error])
+            continue
+        job, errors = build_job(row, employer, categories)
+        if errors:
+            result.add_error(line_number, errors)
+            continue
+        pending.append(job)
+        if len(pending) >= chunk_size:
+            flush()
+    if pending:
+        flush()
+    return result
@@ -0,0 +1,255 @@
+"""
+In-process read model of open jobs.
+
+Open postings are held as compact columns (``array`` buffers, viewed through
+NumPy when it is installed) so job_list can filter, sort and paginate without
+querying the database. Saves and deletes in this process are applied through
+model signals; changes made by other processes or bulk queries are picked up
+by a periodic version check against the Job table.
+"""
+import logging
+import sys
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import Employer, Job
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure Python path returns the same results
+    np = None
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE_CODES = {value: code for code, (value, label) in enumerate(Job.JOB_TYPE_CHOICES)}
+BUILD_CHUNK_SIZE = 5000
+# Rebuild the columns once this share of rows are superseded or removed
+COMPACT_RATIO = 0.25
+
+
+def search_text(title, company_name, location):
+    """What a search query is matched against. The newline keeps a query from spanning two fields."""
+    # Many jobs share a company and location, so interning stores each distinct text once
+    return sys.intern('\n'.join((title or '', company_name or '', location or '')).lower())
+
+
+def current_version():
+    """
+    Cheap fingerprint of the Job table; inserts, deletes and saves all change
+    it, and so do bulk updates of is_active that leave updated_at alone.
+    """
+    stats = Job.objects.aggregate(
+        count=Count('id'), active=Count('id', filter=Q(is_active=True)), latest=Max('updated_at'),
+    )
+    return stats['count'], stats['active'], stats['latest']
+
+
+class _Columns:
+    """Column store of open jobs; ``alive`` marks rows that were not superseded or removed."""
+
+    def __init__(self):
+        self.ids = array('q')
+        self.category_ids = array('q')
+        self.job_types = array('b')
+        self.deadlines = array('i')  # date.toordinal()
+        self.created = array('d')  # POSIX timestamps
+        self.alive = array('b')
+        self.texts = []  # lower-cased title, company name and location; see search_text()
+        self.positions = {}
+        self.dead = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def append(self, job_id, category_id, job_type_code, deadline, created, text):
+        self.positions[job_id] = len(self.ids)
+        self.ids.append(job_id)
+        self.category_ids.append(category_id)
+        self.job_types.append(job_type_code)
+        self.deadlines.append(deadline)
+        self.created.append(created)
+        self.alive.append(1)
+        self.texts.append(text)
+
+    def append_job(self, job_id, category_id, job_type, deadline, created_at, title, company_name, location):
+        self.append(
+            job_id, category_id, JOB_TYPE_CODES.get(job_type, -1), deadline.toordinal(),
+            created_at.timestamp(), search_text(title, company_name, location),
+        )
+
+    def kill(self, job_id):
+        position = self.positions.pop(job_id, None)
+        if position is not None:
+            self.alive[position] = 0
+            self.dead += 1
+
+    def compacted(self):
+        columns = _Columns()
+        for i in range(len(self.ids)):
+            if self.alive[i]:
+                columns.append(
+                    self.ids[i], self.category_ids[i], self.job_types[i],
+                    self.deadlines[i], self.created[i], self.texts[i],
+                )
+        return columns
+
+
+class OpenJobsIndex:
+    def __init__(self):
+        # Guards the columns: numpy views of the arrays block appends while they exist
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self.columns = _Columns()
+        self.version = None
+        self.checked_at = 0.0
+        self.built = False
+
+    def __len__(self):
+        return len(self.columns)
+
+    def build(self):
+        version = current_version()
+        columns = _Columns()
+        rows = Job.objects.live().values_list(
+            'id', 'category_id', 'job_type', 'application_deadline', 'created_at', 'title',
+            'employer__company_name', 'location',
+        ).order_by().iterator(chunk_size=BUILD_CHUNK_SIZE)
+        for row in rows:
+            columns.append_job(*row)
+        # Searches keep using the old columns until the new ones are complete
+        with self._lock:
+            self.columns = columns
+            self.version = version
+            self.checked_at = time.monotonic()
+            self.built = True
+        logger.info(f"Built open jobs read model with {len(columns)} jobs")
+
+    def upsert(self, job):
+        with self._lock:
+            if not self.built:
+                return
+            self.columns.kill(job.pk)
+            if job.is_active and job.application_deadline >= timezone.now().date():
+                self.columns.append_job(
+                    job.pk, job.category_id, job.job_type, job.application_deadline, job.created_at, job.title,
+                    job.employer.company_name, job.location,
+                )
+            self._maybe_compact()
+
+    def remove(self, job_id):
+        with self._lock:
+            if not self.built:
+                return
+            self.columns.kill(job_id)
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self.columns.dead and self.columns.dead >= COMPACT_RATIO * len(self.columns.ids):
+            self.columns = self.columns.compacted()
+
+    def ensure_fresh(self):
+        if self.built and time.monotonic() - self.checked_at < settings.JOB_READ_MODEL_CHECK_INTERVAL:
+            return
+        # Only one thread rebuilds; the others keep answering from the current columns
+        if not self._build_lock.acquire(blocking=not self.built):
+            return
+        try:
+            if not self.built or current_version() != self.version:
+                self.build()
+            else:
+                self.checked_at = time.monotonic()
+        finally:
+            self._build_lock.release()
+
+    def search(self, q=None, category_id=None, job_type=None, today=None):
+        """Ids of open jobs matching the filters, newest first."""
+        today = (today or timezone.now().date()).toordinal()
+        job_type_code = JOB_TYPE_CODES.get(job_type, -2) if job_type else None
+        q = q.lower() if q else None
+        with self._lock:
+            if np is not None:
+                return _search_numpy(self.columns, q, category_id, job_type_code, today)
+            return _search_python(self.columns, q, category_id, job_type_code, today)
+
+
+def _search_numpy(columns, q, category_id, job_type_code, today):
+    # frombuffer views share memory with the arrays, so this runs under the index lock
+    if not columns.ids:
+        return []
+    ids = np.frombuffer(columns.ids, dtype=np.int64)
+    mask = np.frombuffer(columns.alive, dtype=np.int8).astype(bool)
+    mask &= np.frombuffer(columns.deadlines, dtype=np.int32) >= today
+    if category_id is not None:
+        mask &= np.frombuffer(columns.category_ids, dtype=np.int64) == category_id
+    if job_type_code is not None:
+        mask &= np.frombuffer(columns.job_types, dtype=np.int8) == job_type_code
+    positions = np.flatnonzero(mask)
+    if q:
+        texts = columns.texts
+        positions = np.fromiter((p for p in positions if q in texts[p]), dtype=np.int64)
+    created = np.frombuffer(columns.created, dtype=np.float64)[positions]
+    matched = ids[positions]
+    return matched[np.lexsort((-matched, -created))].tolist()
+
+
+def _search_python(columns, q, category_id, job_type_code, today):
+    positions = [
+        p for p in range(len(columns.ids))
+        if columns.alive[p]
+        and columns.deadlines[p] >= today
+        and (category_id is None or columns.category_ids[p] == category_id)
+        and (job_type_code is None or columns.job_types[p] == job_type_code)
+        and (not q or q in columns.texts[p])
+    ]
+    positions.sort(key=lambda p: (columns.created[p], columns.ids[p]), reverse=True)
+    return [columns.ids[p] for p in positions]
+
+
+class IndexedJobList:
+    """Sequence of Job objects over a search result, fetched one page at a time for Paginator."""
+
+    def __init__(self, job_ids):
+        self.job_ids = job_ids
+
+    def count(self):
+        return len(self.job_ids)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def __getitem__(self, index):
+        ids = self.job_ids[index]
+        if not isinstance(index, slice):
+            return Job.objects.select_related('employer').get(pk=ids)
+        jobs = Job.objects.select_related('employer').in_bulk(ids)
+        return [jobs[job_id] for job_id in ids if job_id in jobs]
+
+
+open_jobs_index = OpenJobsIndex()
+
+
+def _job_saved(sender, instance, **kwargs):
+    open_jobs_index.upsert(instance)
+
+
+def _job_deleted(sender, instance, **kwargs):
+    open_jobs_index.remove(instance.pk)
+
+
+def _employer_saved(sender, instance, created=False, **kwargs):
+    # Company renames don't touch Job rows, so force a rebuild on the next request
+    if open_jobs_index.built and not created:
+        open_jobs_index.checked_at = 0.0
+        open_jobs_index.version = None
+
+
+def connect_signals():
+    post_save.connect(_job_saved, sender=Job, dispatch_uid='open_jobs_index_save')
+    post_delete.connect(_job_deleted, sender=Job, dispatch_uid='open_jobs_index_delete')
+    post_save.connect(_employer_saved, sender=Employer, dispatch_uid='open_jobs_index_employer_save')
@@ -0,0 +1,35 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from myapp.models import Job
+
+
+class Command(BaseCommand):
+    help = "Archive live jobs whose application deadline has passed, so listings only touch open postings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-days', type=int, default=0,
+                            help="Keep jobs live for this many days after their deadline.")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now().date() - datetime.timedelta(days=options['grace_days'])
+        expired = Job.objects.filter(is_active=True, application_deadline__lt=cutoff)
+        if options['dry_run']:
+            self.stdout.write(f"{expired.count()} jobs would be archived.")
+            return
+
+        started = time.monotonic()
+        archived = 0
+        while True:
+            # Short UPDATEs over bounded id lists keep row locks brief
+            ids = list(expired.order_by('pk').values_list('pk', flat=True)[:options['chunk_size']])
+            if not ids:
+                break
+            archived += Job.objects.filter(pk__in=ids).update(is_active=False, updated_at=timezone.now())
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} expired jobs in {elapsed:.2f}s."))
@@ -0,0 +1,194 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, Engine, RequestContext, engines
+from django.template.base import FilterExpression, Node, TextNode, TokenType
+from django.test import Client
+from django.urls import reverse
+
+from myapp.warmup import parameterless_url_names
+
+# Templates no view renders, benchmarked with the context captured for another one
+CONTEXT_SOURCES = {
+    'dasbord_professional_final.html': 'dashboard.html',
+}
+
+
+class RenderProfile:
+    """Self time per tag and filter: a node's time excludes the nodes and filters it renders."""
+
+    def __init__(self):
+        self.stats = defaultdict(lambda: [0, 0.0])  # label: [calls, seconds]
+        self.stack = []
+        self.labels = {}
+
+    def timed(self, label, func, *args):
+        self.stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += elapsed
+            stats = self.stats[label]
+            stats[0] += 1
+            stats[1] += elapsed - children
+
+    def node_label(self, node):
+        label = self.labels.get(id(node))
+        if label is None:
+            token = getattr(node, 'token', None)
+            if isinstance(node, TextNode) or token is None or token.token_type == TokenType.TEXT:
+                label = 'text'
+            elif token.token_type == TokenType.VAR:
+                label = '{{ variable }}'
+            else:
+                label = '{% ' + token.split_contents()[0] + ' %}'
+            self.labels[id(node)] = label
+        return label
+
+    @contextmanager
+    def instrument(self):
+        profile = self
+        render_annotated = Node.render_annotated
+        text_render_annotated = TextNode.render_annotated
+        filter_init = FilterExpression.__init__
+
+        def timed_render(node, context):
+            return profile.timed(profile.node_label(node), render_annotated, node, context)
+
+        def timed_text(node, context):
+            return profile.timed('text', text_render_annotated, node, context)
+
+        def timed_filter(func):
+            label = '|' + getattr(func, '_filter_name', func.__name__)
+
+            # wraps() also copies is_safe, needs_autoescape and expects_localtime
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return profile.timed(label, lambda: func(*args, **kwargs))
+            return wrapper
+
+        def init(expression, token, parser):
+            filter_init(expression, token, parser)
+            expression.filters = [(timed_filter(func), args) for func, args in expression.filters]
+
+        with mock.patch.object(Node, 'render_annotated', timed_render), \
+                mock.patch.object(TextNode, 'render_annotated', timed_text), \
+                mock.patch.object(FilterExpression, '__init__', init):
+            yield
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every template rendered by the site's pages with the context its view built, "
+        "and report the self time of each tag and filter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Email of a user to log in as for login-only views.")
+        parser.add_argument('--url', action='append', default=[],
+                            help="Extra path to capture contexts from, e.g. /job/1/ (repeatable).")
+        parser.add_argument('--exclude', nargs='*', default=['logout'], help="URL names to skip.")
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--top', type=int, default=20, help="Rows to show per table.")
+
+    def handle(self, *args, **options):
+        contexts = self.capture_contexts(options['user'], set(options['exclude']), options['url'])
+        for name, source in CONTEXT_SOURCES.items():
+            if source in contexts and name not in contexts:
+                contexts[name] = contexts[source]
+        if not contexts:
+            raise CommandError("No template was rendered; pass --user to reach login-only pages.")
+        iterations = max(options['iterations'], 1)
+        top = options['top']
+
+        # Private engines, so instrumenting compiled templates leaves the site's cached templates alone
+        engine = self._engine()
+        rows = []
+        for name, context in contexts.items():
+            template = engine.get_template(name)
+            template.render(Context(context))  # compiles includes and evaluates lazy querysets
+            started = time.perf_counter()
+            for i in range(iterations):
+                size = len(template.render(Context(context)))
+            rows.append(((time.perf_counter() - started) / iterations, size, name))
+
+        profile = RenderProfile()
+        with profile.instrument():
+            engine = self._engine()
+            for name, context in contexts.items():
+                engine.get_template(name).render(Context(context))
+            profile.stats.clear()
+            for name, context in contexts.items():
+                template = engine.get_template(name)
+                for i in range(iterations):
+                    template.render(Context(context))
+        renders = iterations * len(contexts)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Render time per template ({iterations} renders each)"))
+        self.stdout.write(f"{'ms':>8} {'KB':>7}  template")
+        for seconds, size, name in sorted(rows, reverse=True)[:top]:
+            self.stdout.write(f"{seconds * 1000:8.2f} {size / 1024:7.1f}  {name}")
+
+        total = sum(seconds for calls, seconds in profile.stats.values()) or 1
+        for is_filter, heading in ((False, 'tag'), (True, 'filter')):
+            stats = [
+                (seconds, calls, label) for label, (calls, seconds) in profile.stats.items()
+                if label.startswith('|') == is_filter
+            ]
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\nSelf time per {heading}, instrumented, all templates"))
+            self.stdout.write(f"{'ms/render':>10} {'calls/render':>12} {'share':>6}  {heading}")
+            for seconds, calls, label in sorted(stats, reverse=True)[:top]:
+                self.stdout.write(
+                    f"{seconds * 1000 / renders:10.3f} {calls / renders:12.1f} {seconds / total:6.1%}  {label}"
+                )
+
+    def capture_contexts(self, email, exclude, urls):
+        """{template name: flattened context} of the first render of each page's template."""
+        client = Client(raise_request_exception=False)
+        if email:
+            try:
+                client.force_login(get_user_model().objects.get(email=email))
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"No user with email {email}")
+
+        contexts = {}
+        bind_template = RequestContext.bind_template
+
+        @contextmanager
+        def capturing(context, template):
+            with bind_template(context, template):
+                # Context processors are bound now; their output is part of the captured context
+                contexts.setdefault(template.name, context.flatten())
+                yield
+
+        paths = [reverse(name) for name in parameterless_url_names() if name not in exclude] + urls
+        with mock.patch.object(RequestContext, 'bind_template', capturing):
+            for path in paths:
+                response = client.get(path)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+        return contexts
+
+    @staticmethod
+    def _engine():
+        source = engines['django'].engine
+        return Engine(
+            dirs=source.dirs,
+            context_processors=source.context_processors,
+            debug=False,
+            loaders=source.loaders,
+            string_if_invalid=source.string_if_invalid,
+            file_charset=source.file_charset,
+            libraries=source.libraries,
+            builtins=source.builtins[len(Engine.default_builtins):],
+            autoescape=source.autoescape,
+        )
@@ -0,0 +1,95 @@
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+
+from myapp.models import JobApplication, JobSeeker
+from myapp.thumbnails import thumbnail_names
+
+# Upload directories (relative to MEDIA_ROOT) and the model fields that reference files in them
+MEDIA_DIRECTORIES = ('resumes', 'applications', 'profile_pics')
+REFERENCED_FIELDS = (
+    (JobSeeker, 'resume'),
+    (JobSeeker, 'profile_picture'),
+    (JobApplication, 'resume'),
+)
+
+
+def iter_referenced_names(chunk_size):
+    for model, field in REFERENCED_FIELDS:
+        has_thumbnails = isinstance(model._meta.get_field(field), models.ImageField)
+        names = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}).values_list(field, flat=True)
+        for name in names.iterator(chunk_size=chunk_size):
+            yield name
+            # Thumbnails stored next to a referenced image are live too
+            if has_thumbnails:
+                yield from thumbnail_names(name)
+
+
+def iter_files(path):
+    """Recursively yield os.DirEntry objects for regular files below ``path``."""
+    try:
+        entries = os.scandir(path)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+class Command(BaseCommand):
+    help = "Delete or quarantine uploaded media files that no database row references."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be removed.")
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help="Leave files younger than this alone, so in-flight uploads are never removed.")
+        parser.add_argument('--quarantine', help="Move orphans into this directory instead of deleting them.")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        media_root = os.path.abspath(settings.MEDIA_ROOT)
+        quarantine = options['quarantine']
+        if quarantine and os.path.abspath(quarantine).startswith(media_root + os.sep):
+            raise CommandError("The quarantine directory must be outside MEDIA_ROOT.")
+        started = time.monotonic()
+
+        referenced = set()
+        for name in iter_referenced_names(options['chunk_size']):
+            referenced.add(os.path.normpath(name))
+
+        cutoff = time.time() - options['grace_hours'] * 3600
+        scanned = orphaned = removed_bytes = 0
+        for directory in MEDIA_DIRECTORIES:
+            for entry in iter_files(os.path.join(media_root, directory)):
+                scanned += 1
+                name = os.path.relpath(entry.path, media_root)
+                if name in referenced:
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime > cutoff:
+                    continue
+                orphaned += 1
+                removed_bytes += stat.st_size
+                if options['dry_run']:
+                    self.stdout.write(f"Would remove {name}")
+                elif quarantine:
+                    target = os.path.join(quarantine, name)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.move(entry.path, target)
+                else:
+                    os.remove(entry.path)
+
+        elapsed = time.monotonic() - started
+        rate = scanned / elapsed if elapsed else 0
+        verb = 'Would remove' if options['dry_run'] else ('Quarantined' if quarantine else 'Removed')
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {orphaned} orphaned files ({removed_bytes / 1024 / 1024:.1f} MB). "
+            f"Scanned {scanned} files against {len(referenced)} references in {elapsed:.2f}s ({rate:.0f} files/s)."
+        ))
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from myapp.bulk_jobs import archive_jobs, delete_jobs
+from myapp.dedupe import BATCH_SIZE, duplicate_groups, index_jobs
+from myapp.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Find near-duplicate open jobs through the MinHash bucket index and archive all but the "
+        "oldest posting of each group. Jobs without a signature are indexed first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=None,
+                            help="Minimum estimated similarity (default: JOB_DUPLICATE_THRESHOLD).")
+        parser.add_argument('--across-employers', action='store_true',
+                            help="Also treat postings of different employers as duplicates.")
+        parser.add_argument('--rebuild', action='store_true', help="Recompute every job's signature.")
+        parser.add_argument('--delete', action='store_true', help="Delete duplicates instead of archiving them.")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        indexed = self.index(options['rebuild'])
+        if indexed:
+            self.stdout.write(f"Indexed {indexed} jobs.")
+
+        groups = duplicate_groups(threshold=options['threshold'], across_employers=options['across_employers'])
+        duplicate_ids = [job_id for kept, duplicates in groups for job_id in duplicates]
+        for kept, duplicates in groups:
+            self.stdout.write(f"Job {kept}: duplicates {', '.join(str(job_id) for job_id in duplicates)}")
+        if options['dry_run']:
+            self.stdout.write(f"{len(duplicate_ids)} duplicate jobs in {len(groups)} groups would be removed.")
+            return
+
+        if options['delete']:
+            removed, action = delete_jobs(duplicate_ids), 'Deleted'
+        else:
+            removed, action = archive_jobs(duplicate_ids), 'Archived'
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {removed} duplicate jobs in {len(groups)} groups in {elapsed:.2f}s."
+        ))
+
+    def index(self, rebuild):
+        jobs = Job.objects.only('id', 'title', 'description', 'requirements', 'minhash').order_by('pk')
+        if not rebuild:
+            jobs = jobs.filter(minhash__isnull=True)
+        indexed, last_pk = 0, 0
+        while True:
+            chunk = list(jobs.filter(pk__gt=last_pk)[:BATCH_SIZE])
+            if not chunk:
+                return indexed
+            indexed += index_jobs(chunk, force=rebuild)
+            last_pk = chunk[-1].pk
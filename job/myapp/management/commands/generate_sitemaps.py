@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from myapp.sitemaps import generate
+
+
+class Command(BaseCommand):
+    help = "Write the sitemap index, per-shard sitemaps and JobPosting feeds to SITEMAP_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help="Rewrite every shard, not only the ones whose jobs changed.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        result = generate(full=options['full'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(result['written'])} shard(s) written, {len(result['removed'])} removed, "
+            f"{len(result['unchanged'])} unchanged in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from PIL import UnidentifiedImageError
+
+from myapp.models import JobSeeker
+from myapp.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = "Pre-generate profile picture thumbnails for every job seeker."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate variants that already exist.")
+
+    def handle(self, *args, **options):
+        names = JobSeeker.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True).values_list(
+            'profile_picture', flat=True
+        )
+        written = failed = 0
+        for name in names.iterator(chunk_size=500):
+            try:
+                written += len(generate_thumbnails(name, overwrite=options['force']))
+            except (OSError, UnidentifiedImageError) as e:
+                failed += 1
+                self.stderr.write(f"{name}: {e}")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} thumbnails ({failed} images failed)."))
@@ -0,0 +1,50 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.job_import import DEFAULT_CHUNK_SIZE, decode_lines, detect_format, import_jobs
+from myapp.models import Employer
+
+
+class Command(BaseCommand):
+    help = "Bulk import jobs for an employer from a CSV or JSONL file ('-' reads stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV/JSONL file to import, or '-' for stdin.")
+        parser.add_argument('--employer', required=True, help="Email of the employer's user account.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Input format (detected from the file name by default).")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows inserted per transaction.")
+        parser.add_argument('--encoding', default='utf-8')
+
+    def handle(self, *args, **options):
+        try:
+            employer = Employer.objects.get(user__email__iexact=options['employer'])
+        except Employer.DoesNotExist:
+            raise CommandError(f"No employer profile for {options['employer']}.")
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        source = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        started = time.monotonic()
+        try:
+            result = import_jobs(
+                decode_lines(source, options['encoding']), employer,
+                fmt=fmt, chunk_size=options['chunk_size'],
+            )
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+        elapsed = time.monotonic() - started
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {'; '.join(error['errors'])}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... {result.error_count - len(result.errors)} more errors not shown")
+        rate = result.created / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} of {result.rows} rows ({result.error_count} errors) "
+            f"in {elapsed:.2f}s, {rate:.0f} jobs/s."
+        ))
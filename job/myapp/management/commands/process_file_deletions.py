@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from myapp.bulk_jobs import process_file_deletions
+
+
+class Command(BaseCommand):
+    help = "Remove uploaded files queued for deletion after their jobs or applications were deleted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help="Maximum number of queued files to process.")
+
+    def handle(self, *args, **options):
+        deleted, failed = process_file_deletions(limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} files ({failed} failed)."))
@@ -0,0 +1,86 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from myapp.warmup import parameterless_url_names
+
+# Loads what a worker loads before its first request: settings, apps, admin and URLconf
+IMPORT_SCRIPT = "import django; django.setup(); from django.urls import get_resolver; get_resolver().url_patterns"
+IMPORT_TIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+class Command(BaseCommand):
+    help = "Report import time per module in a fresh interpreter and first-request time per view."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help="Rows to show per table.")
+        parser.add_argument('--user', help="Email of a user to log in as for login-only views.")
+        parser.add_argument('--exclude', nargs='*', default=['logout'], help="URL names to skip.")
+        parser.add_argument('--skip-imports', action='store_true')
+        parser.add_argument('--skip-views', action='store_true')
+
+    def handle(self, *args, **options):
+        if not options['skip_imports']:
+            self.report_imports(options['top'])
+        if not options['skip_views']:
+            self.report_views(options['top'], options['user'], set(options['exclude']))
+
+    def report_imports(self, top):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'job.settings')}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', IMPORT_SCRIPT],
+            capture_output=True, text=True, env=env,
+        )
+        if result.returncode:
+            raise CommandError(f"Importing the project failed:\n{result.stderr[-2000:]}")
+
+        modules = []  # (cumulative us, self us, module)
+        packages = defaultdict(int)
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_RE.match(line)
+            if match:
+                self_us, cumulative_us, module = int(match[1]), int(match[2]), match[4]
+                modules.append((cumulative_us, self_us, module))
+                packages[module.split('.')[0]] += self_us
+        total = sum(packages.values())
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Import time: {total / 1000:.0f} ms in {len(modules)} modules"))
+        self.stdout.write(f"{'self ms':>9}  package")
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f"{self_us / 1000:9.1f}  {package}")
+        self.stdout.write(f"\n{'cumul ms':>9} {'self ms':>9}  module")
+        for cumulative_us, self_us, module in sorted(modules, reverse=True)[:top]:
+            self.stdout.write(f"{cumulative_us / 1000:9.1f} {self_us / 1000:9.1f}  {module}")
+
+    def report_views(self, top, email, exclude):
+        client = Client(raise_request_exception=False)
+        if email:
+            try:
+                client.force_login(get_user_model().objects.get(email=email))
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"No user with email {email}")
+
+        rows = []
+        for name in parameterless_url_names():
+            if name in exclude:
+                continue
+            url = reverse(name)
+            timings = []
+            for attempt in range(2):
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append(time.perf_counter() - started)
+            rows.append((timings[0], timings[1], response.status_code, name))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nFirst and second request per view ({len(rows)} views)"))
+        self.stdout.write(f"{'first ms':>9} {'second ms':>9} status  view")
+        for first, second, status, name in sorted(rows, reverse=True)[:top]:
+            self.stdout.write(f"{first * 1000:9.1f} {second * 1000:9.1f} {status:>6}  {name}")
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from myapp.profile_views import PRUNE_CHUNK_SIZE, prune_profile_views
+
+
+class Command(BaseCommand):
+    help = "Delete raw profile view events older than the retention period. Daily rollups are kept."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.PROFILE_VIEW_RETENTION_DAYS)
+        parser.add_argument('--chunk-size', type=int, default=PRUNE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        deleted = prune_profile_views(options['days'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} profile views older than {options['days']} days."))
@@ -0,0 +1,47 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.retention import DEFAULT_CHUNK_SIZE, DEFAULT_SLEEP, get_policies, purge, vacuum_analyze
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Purge rows past their retention period (read notifications, raw profile views, saved expired jobs, raw search log)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policy', action='append', help="Only run the named policy (repeatable).")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--sleep', type=float, default=DEFAULT_SLEEP, help="Seconds to pause between chunks.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the rows that would be purged.")
+        parser.add_argument('--no-vacuum', action='store_true', help="Skip VACUUM/ANALYZE after purging.")
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        policies = get_policies()
+        if options['policy']:
+            known = {policy.name for policy in policies}
+            unknown = set(options['policy']) - known
+            if unknown:
+                raise CommandError(f"Unknown policy: {', '.join(sorted(unknown))}. Choose from {', '.join(sorted(known))}.")
+            policies = [policy for policy in policies if policy.name in options['policy']]
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        for policy in policies:
+            if options['dry_run']:
+                count = policy.queryset().count()
+                self.stdout.write(f"{policy.name}: {count} rows older than {policy.days} days would be purged.")
+                continue
+            deleted = purge(policy, chunk_size=options['chunk_size'], sleep=options['sleep'], progress=self._progress)
+            if deleted and not options['no_vacuum']:
+                vacuum_analyze(policy.model)
+            self.stdout.write(self.style.SUCCESS(f"{policy.name}: purged {deleted} rows older than {policy.days} days."))
+
+    def _progress(self, policy, deleted, elapsed):
+        rate = deleted / elapsed if elapsed else 0
+        message = f"{policy.name}: {deleted} rows deleted ({rate:.0f} rows/s)"
+        logger.info(message)
+        if self.verbosity > 1:
+            self.stdout.write(message)
@@ -0,0 +1,62 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from myapp.models import SearchQueryDaily
+
+
+class Command(BaseCommand):
+    help = "Report the most frequent, zero-result and slow job searches from the search log rollup."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7)
+        parser.add_argument('--top', type=int, default=20, help="Rows to show per table.")
+        parser.add_argument('--slow-ms', type=float, default=None,
+                            help="Average latency above which a search is slow (default: SEARCH_SLOW_MS).")
+
+    def handle(self, *args, **options):
+        since = timezone.localdate() - datetime.timedelta(days=options['days'] - 1)
+        slow_ms = settings.SEARCH_SLOW_MS if options['slow_ms'] is None else options['slow_ms']
+        top = options['top']
+        rows = list(SearchQueryDaily.objects.filter(date__gte=since).values('query', 'category_id', 'job_type').annotate(
+            searches=Sum('count'), zero=Sum('zero_results'), hits=Sum('cached'), total_ms=Sum('total_ms'), max_ms=Max('max_ms'),
+        ))
+        for row in rows:
+            row['avg_ms'] = row['total_ms'] / row['searches']
+        total = sum(row['searches'] for row in rows)
+        hits = sum(row['hits'] for row in rows)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{total} searches, {len(rows)} distinct, in the last {options['days']} days; "
+            f"{hits / total if total else 0:.0%} served from the hot-query cache"
+        ))
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nMost frequent"))
+        self.stdout.write(f"{'searches':>9} {'cached':>7} {'avg ms':>8}  search")
+        for row in sorted(rows, key=lambda row: (-row['searches'], row['query']))[:top]:
+            self.stdout.write(
+                f"{row['searches']:9d} {row['hits'] / row['searches']:7.0%} {row['avg_ms']:8.1f}  {self.describe(row)}"
+            )
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nZero results"))
+        self.stdout.write(f"{'searches':>9}  search")
+        zero = [row for row in rows if row['zero']]
+        for row in sorted(zero, key=lambda row: (-row['zero'], row['query']))[:top]:
+            self.stdout.write(f"{row['zero']:9d}  {self.describe(row)}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nSlow (average above {slow_ms:.0f} ms)"))
+        self.stdout.write(f"{'avg ms':>8} {'max ms':>8} {'searches':>9}  search")
+        slow = [row for row in rows if row['avg_ms'] > slow_ms]
+        for row in sorted(slow, key=lambda row: -row['avg_ms'])[:top]:
+            self.stdout.write(f"{row['avg_ms']:8.1f} {row['max_ms']:8.1f} {row['searches']:9d}  {self.describe(row)}")
+
+    @staticmethod
+    def describe(row):
+        parts = [f'"{row["query"]}"' if row['query'] else '(all jobs)']
+        if row['category_id']:
+            parts.append(f"category={row['category_id']}")
+        if row['job_type']:
+            parts.append(f"type={row['job_type']}")
+        return ' '.join(parts)
@@ -0,0 +1,55 @@
+import importlib.util
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.server import gunicorn_options, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the production server on Linux: pre-forked workers sharing a preloaded app. "
+        "Send SIGHUP to the master to replace all workers gracefully. With preloading (the default) "
+        "new workers run the code loaded at startup; deploy new code with SIGUSR2 followed by SIGTERM "
+        "to the old master, or run with --no-preload to pick it up on SIGHUP."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', default='127.0.0.1:8000')
+        parser.add_argument('--workers', type=int, default=0, help="Worker processes (default: one per CPU).")
+        parser.add_argument('--threads', type=int, default=4,
+                            help="Threads per WSGI worker; with 1, workers are sync and connect to the database "
+                                 "before serving.")
+        parser.add_argument('--max-requests', type=int, default=1000,
+                            help="Recycle a worker after this many requests (0 disables).")
+        parser.add_argument('--max-requests-jitter', type=int, default=100)
+        parser.add_argument('--max-memory', type=int, default=0,
+                            help="Recycle a worker whose resident memory exceeds this many MB (WSGI only).")
+        parser.add_argument('--timeout', type=int, default=30)
+        parser.add_argument('--graceful-timeout', type=int, default=30)
+        parser.add_argument('--asgi', action='store_true', help="Serve job.asgi with uvicorn workers.")
+        parser.add_argument('--no-preload', action='store_true',
+                            help="Import the app in each worker instead of once in the master.")
+
+    def handle(self, *args, **options):
+        if sys.platform == 'win32':
+            raise CommandError("serve needs a Unix system; use run_production.bat (waitress) on Windows.")
+        if importlib.util.find_spec('gunicorn') is None:
+            raise CommandError("serve needs gunicorn: pip install -r requirements.txt")
+        if options['asgi'] and importlib.util.find_spec('uvicorn') is None:
+            raise CommandError("--asgi needs uvicorn: pip install uvicorn")
+        if options['asgi'] and options['max_memory']:
+            self.stderr.write("--max-memory is not supported with --asgi and will be ignored.")
+
+        run(gunicorn_options(
+            bind=options['bind'],
+            workers=options['workers'],
+            threads=options['threads'],
+            max_requests=options['max_requests'],
+            max_requests_jitter=options['max_requests_jitter'],
+            max_memory_mb=options['max_memory'],
+            timeout=options['timeout'],
+            graceful_timeout=options['graceful_timeout'],
+            asgi=options['asgi'],
+            preload=not options['no_preload'],
+        ), asgi=options['asgi'])
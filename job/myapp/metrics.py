@@ -0,0 +1,378 @@
+"""
+Request metrics in the Prometheus text exposition format.
+
+Every thread records into its own shard, so the request path never takes a
+lock; a scrape merges the shards. Shards of exited threads are folded into one
+process total, so servers that start a thread per connection don't grow the
+list. When METRICS_MULTIPROCESS_DIR is set, each
+process also writes its totals there every METRICS_FLUSH_INTERVAL seconds and
+the /metrics view merges the files of all processes. Files of exited workers
+are folded into one metrics-exited.json when the directory is scraped, and
+when a new process inherits a dead worker's pid, so recycled workers neither
+grow the directory nor make counters go backwards.
+"""
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+
+from .admission import metrics as admission_metrics
+from .streaming import call_on_close
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; files of exited workers are then kept and still counted
+    fcntl = None
+
+EXITED_FILE = 'metrics-exited.json'
+LOCK_FILE = '.metrics.lock'
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+HELP = {
+    'http_requests_total': ('counter', "Requests by view, method and status."),
+    'http_request_duration_seconds': ('histogram', "Time until the view returned a response."),
+    'http_requests_in_flight': ('gauge', "Requests being processed."),
+    'db_queries_total': ('counter', "Database queries run while handling requests, by view."),
+    'db_query_duration_seconds_total': ('counter', "Time spent in database queries, by view."),
+    'cache_requests_total': ('counter', "Cache lookups by result (hit or miss)."),
+    'auth_admission_total': ('counter', "Login/signup attempts by admission outcome."),
+}
+
+
+class _Shard:
+    """Metrics recorded by one thread; only that thread writes to it."""
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.counters = defaultdict(float)  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> per-bucket counts followed by the sum
+        self.in_flight = 0
+
+
+class Registry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()  # totals of the shards of exited threads
+        self._lock = threading.Lock()  # only taken when a thread records for the first time
+        self.last_flush = 0.0
+        self.pid_claimed = None
+
+    def shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._prune()
+                self._shards.append(shard)
+        return shard
+
+    def _prune(self):
+        # Called with the lock held. An exited thread no longer writes to its shard, unless a
+        # streamed response it started is still in flight and will be closed from elsewhere
+        shards = []
+        for shard in self._shards:
+            if shard.thread.is_alive() or shard.in_flight:
+                shards.append(shard)
+            else:
+                for key, value in shard.counters.items():
+                    self._retired.counters[key] += value
+                for key, values in shard.histograms.items():
+                    _add_histogram(self._retired.histograms, key, list(values))
+        self._shards = shards
+
+    def inc(self, name, labels=(), value=1):
+        self.shard().counters[(name, labels)] += value
+
+    def observe(self, name, labels, value):
+        histograms = self.shard().histograms
+        key = (name, labels)
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0] * len(DURATION_BUCKETS) + [0.0]
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                values[i] += 1
+                break
+        values[-1] += value
+
+    def snapshot(self):
+        """This process's totals as {'counters', 'histograms', 'in_flight'}."""
+        counters = defaultdict(float)
+        histograms = {}
+        in_flight = 0
+        with self._lock:
+            self._prune()
+            shards = [self._retired, *self._shards]
+        for shard in shards:
+            # dict() copies in one step, so a thread recording meanwhile can't break the loop
+            for key, value in dict(shard.counters).items():
+                counters[key] += value
+            for key, values in dict(shard.histograms).items():
+                _add_histogram(histograms, key, list(values))
+            in_flight += shard.in_flight
+        for outcome, count in admission_metrics.snapshot().items():
+            if outcome == 'admitted' or outcome.startswith('rejected_'):
+                counters[('auth_admission_total', (('outcome', outcome),))] += count
+        return {'counters': dict(counters), 'histograms': histograms, 'in_flight': in_flight}
+
+    def maybe_flush(self):
+        if settings.METRICS_MULTIPROCESS_DIR and time.monotonic() - self.last_flush >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        directory = settings.METRICS_MULTIPROCESS_DIR
+        if not directory:
+            return
+        self.last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        pid = os.getpid()
+        if self.pid_claimed != pid:
+            # A file under our pid was left by an exited worker; keep its counts before replacing it
+            with _directory_lock(directory):
+                name = f'metrics-{pid}.json'
+                data = _read(directory, name)
+                if data is not None:
+                    _fold(directory, {name: data})
+            self.pid_claimed = pid
+        _write(directory, f'metrics-{pid}.json', _encode(self.snapshot()))
+
+
+def _add_histogram(histograms, key, values):
+    total = histograms.get(key)
+    if total is None:
+        histograms[key] = values
+    else:
+        for i, value in enumerate(values):
+            total[i] += value
+
+
+def _encode(snapshot, pid=None):
+    return {
+        'pid': os.getpid() if pid is None else pid,
+        'counters': [[name, list(labels), value] for (name, labels), value in snapshot['counters'].items()],
+        'histograms': [[name, list(labels), values] for (name, labels), values in snapshot['histograms'].items()],
+        'in_flight': snapshot['in_flight'],
+    }
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _write(directory, name, data):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.metrics-')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, os.path.join(directory, name))
+
+
+def _read(directory, name):
+    try:
+        with open(os.path.join(directory, name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def _directory_lock(directory):
+    """Serialises folding with scrapes, so no file is counted twice or missed."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, LOCK_FILE), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _merge(files):
+    counters = defaultdict(float)
+    histograms = {}
+    in_flight = 0
+    for data in files:
+        for metric, labels, value in data['counters']:
+            counters[(metric, tuple(tuple(pair) for pair in labels))] += value
+        for metric, labels, values in data['histograms']:
+            _add_histogram(histograms, (metric, tuple(tuple(pair) for pair in labels)), values)
+        if data['pid'] and _pid_alive(data['pid']):
+            in_flight += data['in_flight']
+    return {'counters': dict(counters), 'histograms': histograms, 'in_flight': in_flight}
+
+
+def _fold(directory, files):
+    """
+    Add the counters of exited workers' ``files`` ({name: data}) to
+    EXITED_FILE and delete them. Call with the directory lock held.
+    """
+    if fcntl is None:
+        return None
+    previous = _read(directory, EXITED_FILE)
+    totals = _encode(_merge(([previous] if previous else []) + list(files.values())), pid=0)
+    totals['in_flight'] = 0
+    _write(directory, EXITED_FILE, totals)
+    for name in files:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+    return totals
+
+
+def merged_snapshot():
+    """Totals of this process, or of every process writing to METRICS_MULTIPROCESS_DIR."""
+    directory = settings.METRICS_MULTIPROCESS_DIR
+    if not directory:
+        return registry.snapshot()
+    registry.flush()
+    with _directory_lock(directory):
+        files = {}
+        for name in os.listdir(directory):
+            if name.startswith('metrics-') and name.endswith('.json'):
+                data = _read(directory, name)
+                if data is not None:
+                    files[name] = data
+        exited = {
+            name: data for name, data in files.items()
+            if name != EXITED_FILE and not _pid_alive(data['pid'])
+        }
+        if exited:
+            totals = _fold(directory, exited)
+            if totals is not None:
+                files = {name: data for name, data in files.items() if name not in exited}
+                files[EXITED_FILE] = totals
+    # Counters of exited workers are kept so totals never go backwards
+    return _merge(files.values())
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render(snapshot):
+    lines = []
+    by_name = defaultdict(list)
+    for (name, labels), value in snapshot['counters'].items():
+        by_name[name].append((labels, value))
+    for (name, labels), values in snapshot['histograms'].items():
+        by_name[name].append((labels, values))
+    by_name['http_requests_in_flight'].append(((), snapshot['in_flight']))
+
+    for name in sorted(by_name):
+        kind, help_text = HELP.get(name, ('untyped', ''))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(by_name[name], key=lambda item: item[0]):
+            if kind != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS, value):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", _format_value(bound))])} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+
+class MetricsMiddleware:
+    """Records latency, status, database and in-flight metrics for every request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        shard = registry.shard()
+        queries = [0, 0.0]
+
+        def record_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries[0] += 1
+                queries[1] += time.perf_counter() - started
+
+        shard.in_flight += 1
+        started = time.perf_counter()
+        stack = ExitStack()
+        try:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record_query))
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            shard.in_flight -= 1
+            raise
+
+        def finish():
+            stack.close()
+            shard.in_flight -= 1
+            elapsed = time.perf_counter() - started
+            match = getattr(request, 'resolver_match', None)
+            view = match.view_name if match else 'unresolved'
+            registry.inc('http_requests_total', (('view', view), ('method', request.method), ('status', str(response.status_code))))
+            registry.observe('http_request_duration_seconds', (('view', view),), elapsed)
+            registry.inc('db_queries_total', (('view', view),), queries[0])
+            registry.inc('db_query_duration_seconds_total', (('view', view),), queries[1])
+            registry.maybe_flush()
+
+        if response.streaming:
+            # A streamed page renders, and queries, while it is sent
+            call_on_close(response, finish)
+        else:
+            finish()
+        return response
+
+
+class CacheMetricsMixin:
+    """Counts hits and misses of a cache backend, e.g. ``class RedisCache(CacheMetricsMixin, RedisCache)``."""
+
+    _missing = object()
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, self._missing, version)
+        if value is self._missing:
+            registry.inc('cache_requests_total', (('result', 'miss'),))
+            return default
+        registry.inc('cache_requests_total', (('result', 'hit'),))
+        return value
+
+
+class InstrumentedLocMemCache(CacheMetricsMixin, LocMemCache):
+    pass
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0007_pendingfiledeletion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profileview',
+            name='viewed_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='ProfileViewDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='myapp.employer')),
+                ('job_seeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='myapp.jobseeker')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='profileviewdaily',
+            constraint=models.UniqueConstraint(fields=('job_seeker', 'employer', 'date'), name='unique_profile_view_daily'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0008_profileviewdaily'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicationnotification',
+            index=models.Index(fields=['employer', 'is_read', 'created_at'], name='notification_employer_read'),
+        ),
+    ]
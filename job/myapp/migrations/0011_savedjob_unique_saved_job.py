@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-19 20:05
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_saved_jobs(apps, schema_editor):
+    SavedJob = apps.get_model('myapp', 'SavedJob')
+    duplicates = (
+        SavedJob.objects.values('job_seeker_id', 'job_id')
+        .annotate(keep=Min('id'), copies=models.Count('id'))
+        .filter(copies__gt=1)
+    )
+    for row in duplicates.iterator():
+        SavedJob.objects.filter(job_seeker_id=row['job_seeker_id'], job_id=row['job_id']).exclude(id=row['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0010_job_live_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_saved_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='savedjob',
+            constraint=models.UniqueConstraint(fields=('job_seeker', 'job'), name='unique_saved_job'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-19 19:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0011_savedjob_unique_saved_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='minhash',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.CreateModel(
+            name='JobLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='myapp.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'job'], name='job_lsh_key_idx')],
+            },
+        ),
+    ]
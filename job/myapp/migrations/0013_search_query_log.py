@@ -0,0 +1,50 @@
+# Generated by Django 5.0.6 on 2026-10-19 19:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0012_job_minhash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(blank=True, max_length=200)),
+                ('category_id', models.PositiveIntegerField(default=0)),
+                ('job_type', models.CharField(blank=True, max_length=20)),
+                ('page', models.PositiveIntegerField(default=1)),
+                ('result_count', models.PositiveIntegerField()),
+                ('latency_ms', models.FloatField()),
+                ('cached', models.BooleanField(default=False)),
+                ('searched_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchQueryDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(blank=True, max_length=200)),
+                ('category_id', models.PositiveIntegerField(default=0)),
+                ('job_type', models.CharField(blank=True, max_length=20)),
+                ('date', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('zero_results', models.PositiveIntegerField(default=0)),
+                ('cached', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='search_daily_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchquerydaily',
+            constraint=models.UniqueConstraint(fields=('query', 'category_id', 'job_type', 'date'), name='unique_search_query_daily'),
+        ),
+    ]
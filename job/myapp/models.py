@@ -105,6 +105,14 @@ class Employer(models.Model):
     def __str__(self):
         return self.company_name
 
+class JobQuerySet(models.QuerySet):
+    def live(self):
+        """Open postings: active and not past their deadline. Served by the partial indexes on Job."""
+        return self.filter(is_active=True, application_deadline__gte=timezone.now().date())
+
+    def archived(self):
+        return self.filter(is_active=False)
+
 class Job(models.Model):
     JOB_TYPE_CHOICES = [
         ('full_time', 'Full Time'),
@@ -127,6 +135,17 @@ class Job(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # MinHash of title, description and requirements, maintained by myapp.dedupe
+    minhash = models.BinaryField(null=True, editable=False)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Partial indexes cover only live postings, so archived rows don't bloat listing lookups
+            models.Index(fields=['-created_at'], name='job_live_created_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['application_deadline'], name='job_live_deadline_idx', condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return self.title
@@ -157,22 +176,104 @@ class SavedJob(models.Model):
     job_seeker = models.ForeignKey(JobSeeker, on_delete=models.CASCADE)
     saved_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # Also serves the "which of these jobs are saved" lookup for a seeker
+            models.UniqueConstraint(fields=['job_seeker', 'job'], name='unique_saved_job'),
+        ]
+
     def __str__(self):
         return f"{self.job_seeker.user.username} saved {self.job.title}"
 
+class JobLSHBucket(models.Model):
+    """One row per band of a job's MinHash; jobs sharing a key are near-duplicate candidates."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='lsh_buckets')
+    key = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['key', 'job'], name='job_lsh_key_idx'),
+        ]
+
 class ProfileView(models.Model):
     job_seeker = models.ForeignKey(JobSeeker, on_delete=models.CASCADE)
     employer = models.ForeignKey(Employer, on_delete=models.CASCADE)
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    viewed_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     def __str__(self):
         return f"{self.employer.user.username} viewed {self.job_seeker.user.username}'s profile"
 
+class ProfileViewDaily(models.Model):
+    """Per-day rollup of ProfileView rows; dashboard counts read this instead of the raw events."""
+    job_seeker = models.ForeignKey(JobSeeker, on_delete=models.CASCADE)
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE)
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job_seeker', 'employer', 'date'], name='unique_profile_view_daily'),
+        ]
+
+    def __str__(self):
+        return f"{self.employer} viewed {self.job_seeker} {self.count} times on {self.date}"
+
 class ApplicationNotification(models.Model):
     employer = models.ForeignKey(Employer, on_delete=models.CASCADE)
     job_application = models.ForeignKey('JobApplication', on_delete=models.CASCADE)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves the dashboard's unread notification list
+            models.Index(fields=['employer', 'is_read', 'created_at'], name='notification_employer_read'),
+        ]
+
     def __str__(self):
         return f"Notification for {self.employer.company_name} about application {self.job_application.id}"
+
+class PendingFileDeletion(models.Model):
+    """Storage name of an uploaded file whose owning row was deleted, removed later in the background."""
+    name = models.CharField(max_length=500)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+class SearchQuery(models.Model):
+    """One job_list search, written in batches by myapp.search."""
+    query = models.CharField(max_length=200, blank=True)  # normalised, may be empty
+    category_id = models.PositiveIntegerField(default=0)  # 0: any category
+    job_type = models.CharField(max_length=20, blank=True)
+    page = models.PositiveIntegerField(default=1)
+    result_count = models.PositiveIntegerField()
+    latency_ms = models.FloatField()
+    cached = models.BooleanField(default=False)
+    searched_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.query!r} ({self.result_count} results, {self.latency_ms:.0f} ms)"
+
+class SearchQueryDaily(models.Model):
+    """Per-day rollup of SearchQuery rows; hot-query selection and search_report read this."""
+    query = models.CharField(max_length=200, blank=True)
+    category_id = models.PositiveIntegerField(default=0)
+    job_type = models.CharField(max_length=20, blank=True)
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    zero_results = models.PositiveIntegerField(default=0)
+    cached = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['query', 'category_id', 'job_type', 'date'], name='unique_search_query_daily'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='search_daily_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.query!r} searched {self.count} times on {self.date}"
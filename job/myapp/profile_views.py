@@ -0,0 +1,114 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import ProfileView, ProfileViewDaily
+from .retention import RetentionPolicy, purge
+
+logger = logging.getLogger(__name__)
+
+PRUNE_CHUNK_SIZE = 1000
+
+
+class ProfileViewBuffer:
+    """
+    Per-process buffer of profile view events. Events are written with one
+    bulk_create (plus one rollup upsert per job seeker/employer/day) once the
+    buffer is full or older than the flush interval.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+        self._first_event_at = None
+
+    def add(self, job_seeker_id, employer_id, viewed_at=None):
+        viewed_at = viewed_at or timezone.now()
+        with self._lock:
+            if not self._events:
+                self._first_event_at = time.monotonic()
+                # Make sure a quiet process still writes its events out
+                timer = threading.Timer(settings.PROFILE_VIEW_FLUSH_INTERVAL, self._flush_from_timer)
+                timer.daemon = True
+                timer.start()
+            self._events.append((job_seeker_id, employer_id, viewed_at))
+            due = (
+                len(self._events) >= settings.PROFILE_VIEW_BUFFER_SIZE
+                or time.monotonic() - self._first_event_at >= settings.PROFILE_VIEW_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return 0
+        try:
+            write_profile_views(events)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(events)} profile views: {e}", exc_info=True)
+            return 0
+        return len(events)
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Timer threads get their own database connection; don't leak it
+            connections.close_all()
+
+    def __len__(self):
+        return len(self._events)
+
+
+def write_profile_views(events):
+    """Persist (job_seeker_id, employer_id, viewed_at) events and add them to the daily rollup."""
+    daily = Counter(
+        (job_seeker_id, employer_id, timezone.localdate(viewed_at))
+        for job_seeker_id, employer_id, viewed_at in events
+    )
+    with transaction.atomic():
+        ProfileView.objects.bulk_create([
+            ProfileView(job_seeker_id=job_seeker_id, employer_id=employer_id, viewed_at=viewed_at)
+            for job_seeker_id, employer_id, viewed_at in events
+        ])
+        for (job_seeker_id, employer_id, date), count in daily.items():
+            _increment_daily(job_seeker_id, employer_id, date, count)
+
+
+def _increment_daily(job_seeker_id, employer_id, date, count):
+    lookup = {'job_seeker_id': job_seeker_id, 'employer_id': employer_id, 'date': date}
+    if ProfileViewDaily.objects.filter(**lookup).update(count=F('count') + count):
+        return
+    try:
+        with transaction.atomic():
+            ProfileViewDaily.objects.create(count=count, **lookup)
+    except IntegrityError:
+        # Another process created the row first
+        ProfileViewDaily.objects.filter(**lookup).update(count=F('count') + count)
+
+
+def profile_view_count(job_seeker):
+    return ProfileViewDaily.objects.filter(job_seeker=job_seeker).aggregate(total=Sum('count'))['total'] or 0
+
+
+def prune_profile_views(days, chunk_size=PRUNE_CHUNK_SIZE):
+    """Delete raw events older than ``days`` days in small chunks; rollups are kept."""
+    policy = RetentionPolicy('profile_views', ProfileView, 'viewed_at', days)
+    return purge(policy, chunk_size=chunk_size, sleep=0)
+
+
+profile_view_buffer = ProfileViewBuffer()
+atexit.register(profile_view_buffer.flush)
+
+
+def record_profile_view(job_seeker_id, employer_id):
+    profile_view_buffer.add(job_seeker_id, employer_id)
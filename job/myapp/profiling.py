@@ -0,0 +1,221 @@
+"""
+Sampling profiler for individual requests.
+
+One background thread wakes every PROFILER_INTERVAL seconds and records the
+current stack of each thread whose request is being profiled. A request is
+profiled when a staff user sends ``X-Profile: 1``, when it is picked at
+PROFILER_SAMPLE_RATE, or, if PROFILER_SLOW_THRESHOLD_MS is set, always; in
+the last case its samples are kept only when the request turns out slow.
+Profiles are written to PROFILER_DIR as collapsed stacks (flamegraph.pl,
+speedscope, etc. read them) or as speedscope JSON.
+"""
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+
+from .streaming import call_on_close
+
+logger = logging.getLogger(__name__)
+
+MAX_STACK_DEPTH = 128
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+FILE_RE = re.compile(r'^(?P<stamp>\d{8}T\d{6}\d{6})_(?P<view>[\w.-]+)_(?P<ms>\d+)ms_(?P<trigger>[a-z]+)\.(?P<ext>collapsed|speedscope\.json)$')
+
+
+class RequestProfile:
+    def __init__(self):
+        self.stacks = Counter()  # tuple of frame labels, root first -> samples
+
+    def add(self, frame):
+        labels = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            labels.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        labels.reverse()
+        self.stacks[tuple(labels)] += 1
+
+
+class Sampler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = {}  # thread id -> RequestProfile
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id):
+        profile = RequestProfile()
+        with self._lock:
+            self._active[thread_id] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+                self._thread.start()
+            self._wakeup.set()
+        return profile
+
+    def stop(self, thread_id):
+        """Stop sampling ``thread_id``; the profile returned is no longer written to."""
+        with self._lock:
+            return self._active.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = dict(self._active)
+                if not active:
+                    # Cleared under the lock, so a concurrent start() can't be missed
+                    self._wakeup.clear()
+            if not active:
+                # Sleep without polling until a request is profiled again
+                self._wakeup.wait()
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                # Samples are added under the lock, so none lands in a profile stop() has handed back
+                # while it is being saved
+                for thread_id, profile in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        profile.add(frame)
+            del frames
+            time.sleep(settings.PROFILER_INTERVAL)
+
+
+sampler = Sampler()
+
+
+def _collapsed(profile):
+    return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in profile.stacks.most_common())
+
+
+def _speedscope(profile, name):
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, count in profile.stacks.items():
+        sample = []
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({'name': label})
+            sample.append(index[label])
+        samples.append(sample)
+        weights.append(count)
+    interval = settings.PROFILER_INTERVAL
+    return json.dumps({
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled', 'name': name, 'unit': 'seconds', 'startValue': 0,
+            'endValue': sum(weights) * interval, 'samples': samples,
+            'weights': [count * interval for count in weights],
+        }],
+    })
+
+
+def save_profile(profile, view_name, elapsed, trigger):
+    """Write ``profile`` to PROFILER_DIR and return the file name."""
+    directory = settings.PROFILER_DIR
+    os.makedirs(directory, exist_ok=True)
+    view = re.sub(r'[^\w.-]', '-', view_name) or 'unresolved'
+    stem = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{view}_{int(elapsed * 1000)}ms_{trigger}"
+    if settings.PROFILER_FORMAT == 'speedscope':
+        name, content = f'{stem}.speedscope.json', _speedscope(profile, f'{view_name} ({int(elapsed * 1000)} ms)')
+    else:
+        name, content = f'{stem}.collapsed', _collapsed(profile)
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        f.write(content)
+    _prune(directory)
+    return name
+
+
+def _prune(directory):
+    names = sorted(name for name in os.listdir(directory) if FILE_RE.match(name))
+    for name in names[:-settings.PROFILER_MAX_FILES]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+def recent_profiles(view=None):
+    """Saved profiles, newest first, as dicts with name, view, ms, trigger and created."""
+    try:
+        names = os.listdir(settings.PROFILER_DIR)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in names:
+        match = FILE_RE.match(name)
+        if not match or (view and match['view'] != view):
+            continue
+        profiles.append({
+            'name': name,
+            'view': match['view'],
+            'ms': int(match['ms']),
+            'trigger': match['trigger'],
+            'format': 'speedscope' if match['ext'] == 'speedscope.json' else 'collapsed',
+            'created': datetime.strptime(match['stamp'], '%Y%m%dT%H%M%S%f'),
+        })
+    profiles.sort(key=lambda p: p['name'], reverse=True)
+    return profiles
+
+
+class ProfilingMiddleware:
+    """Profiles selected requests; must come after AuthenticationMiddleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _trigger(self, request):
+        if request.META.get(PROFILE_HEADER) and getattr(request, 'user', None) and request.user.is_staff:
+            return 'header'
+        if settings.PROFILER_SAMPLE_RATE and random.random() < settings.PROFILER_SAMPLE_RATE:
+            return 'sampled'
+        if settings.PROFILER_SLOW_THRESHOLD_MS:
+            return 'slow'
+        return None
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        thread_id = threading.get_ident()
+        started = time.perf_counter()
+        sampler.start(thread_id)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            sampler.stop(thread_id)
+            raise
+        if response.streaming:
+            # Keep sampling while the page renders; the profile is listed once the response is closed,
+            # too late for the X-Profile-Id header
+            call_on_close(response, lambda: self._finish(request, response, trigger, thread_id, started))
+            return response
+        return self._finish(request, response, trigger, thread_id, started)
+
+    def _finish(self, request, response, trigger, thread_id, started):
+        profile = sampler.stop(thread_id)
+        elapsed = time.perf_counter() - started
+        if trigger == 'slow' and elapsed * 1000 < settings.PROFILER_SLOW_THRESHOLD_MS:
+            return response
+        match = getattr(request, 'resolver_match', None)
+        try:
+            name = save_profile(profile, match.view_name if match else 'unresolved', elapsed, trigger)
+        except Exception as e:
+            # Profiling must never fail the request it observes
+            logger.error(f"Failed to save request profile: {e}", exc_info=True)
+            return response
+        if trigger == 'header' and not response.streaming:
+            response['X-Profile-Id'] = name
+        return response
@@ -0,0 +1,90 @@
+import datetime
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .models import ApplicationNotification, ProfileView, SavedJob, SearchQuery
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_SLEEP = 0.1
+
+
+class RetentionPolicy:
+    """Rows of ``model`` whose ``date_field`` is older than ``days`` (and that match ``filters``) may be purged."""
+
+    def __init__(self, name, model, date_field, days, filters=None, date_only=False):
+        self.name = name
+        self.model = model
+        self.date_field = date_field
+        self.days = days
+        self.filters = filters or {}
+        self.date_only = date_only
+
+    def queryset(self, now=None):
+        cutoff = (now or timezone.now()) - datetime.timedelta(days=self.days)
+        if self.date_only:
+            cutoff = cutoff.date()
+        return self.model.objects.filter(**{f'{self.date_field}__lt': cutoff}, **self.filters)
+
+
+def get_policies():
+    days = settings.RETENTION_DAYS
+    return [
+        RetentionPolicy('read_notifications', ApplicationNotification, 'created_at',
+                        days['read_notifications'], filters={'is_read': True}),
+        RetentionPolicy('profile_views', ProfileView, 'viewed_at', days['profile_views']),
+        RetentionPolicy('expired_saved_jobs', SavedJob, 'job__application_deadline',
+                        days['expired_saved_jobs'], date_only=True),
+        RetentionPolicy('search_queries', SearchQuery, 'searched_at', days['search_queries']),
+    ]
+
+
+def purge(policy, chunk_size=DEFAULT_CHUNK_SIZE, sleep=DEFAULT_SLEEP, progress=None):
+    """
+    Delete the rows selected by ``policy`` in primary key ranges of at most
+    ``chunk_size`` rows, pausing ``sleep`` seconds between ranges so no
+    statement holds locks for long. ``progress`` is called with
+    (policy, deleted_so_far, elapsed_seconds) after each chunk.
+    Returns the number of rows deleted.
+    """
+    queryset = policy.queryset()
+    started = time.monotonic()
+    deleted = 0
+    last_pk = None
+    while True:
+        remaining = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        # Upper bound of the next range: the chunk_size-th matching primary key, or the last one
+        boundary = list(remaining.order_by('pk').values_list('pk', flat=True)[chunk_size - 1:chunk_size])
+        if not boundary:
+            boundary = list(remaining.order_by('-pk').values_list('pk', flat=True)[:1])
+            if not boundary:
+                break
+        deleted += remaining.filter(pk__lte=boundary[0]).delete()[0]
+        last_pk = boundary[0]
+        if progress is not None:
+            progress(policy, deleted, time.monotonic() - started)
+        if sleep:
+            time.sleep(sleep)
+    return deleted
+
+
+def vacuum_analyze(model):
+    """Reclaim space and refresh planner statistics where the database backend supports it."""
+    connection = connections[model.objects.db]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Runs outside a transaction because Django uses autocommit by default
+            cursor.execute(f"VACUUM (ANALYZE) {table}")
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"ANALYZE {table}")
+        elif connection.vendor == 'mysql':
+            cursor.execute(f"ANALYZE TABLE {table}")
+        else:
+            return False
+    return True
@@ -0,0 +1,375 @@
+"""
+Search logging and the hot-query cache behind job_list.
+
+Searches are buffered per process and written in batches as raw SearchQuery
+rows plus a SearchQueryDaily rollup. A background thread periodically takes
+the SEARCH_HOT_QUERIES most frequent searches of the last
+SEARCH_HOT_WINDOW_DAYS days from the rollup and stores their first result
+page in the cache, so job_list answers page one of a popular search without a
+query. Saving or deleting a job drops the cached searches it matches (before
+or after the change); bulk changes drop them all. With several worker
+processes, use a shared cache backend so invalidations reach every worker.
+"""
+import atexit
+import datetime
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from .job_index import IndexedJobList, open_jobs_index, search_text
+from .models import Category, Employer, Job, SearchQuery, SearchQueryDaily
+
+logger = logging.getLogger(__name__)
+
+JOB_LIST_PAGE_SIZE = 30
+JOB_TYPES = dict(Job.JOB_TYPE_CHOICES)
+# Logged in SearchQuery.category_id, a PositiveIntegerField
+MAX_CATEGORY_ID = 2147483647
+HOT_KEY = 'search:hot'
+GENERATION_KEY = 'search:generation'
+CATEGORIES_KEY = 'search:categories'
+
+
+def normalize_query(q):
+    return ' '.join((q or '').split()).lower()[:200]
+
+
+def parse_filters(params):
+    """
+    (category id or None, job type or None) from request parameters. Raises
+    ValueError for values no job has, before they reach a query or the log.
+    """
+    category = params.get('category')
+    category_id = None
+    if category:
+        try:
+            category_id = int(category)
+        except ValueError:
+            raise ValueError("Invalid category.")
+        if not 0 < category_id <= MAX_CATEGORY_ID:
+            raise ValueError("Invalid category.")
+    job_type = params.get('job_type') or None
+    if job_type is not None and job_type not in JOB_TYPES:
+        raise ValueError("Invalid job_type.")
+    return category_id, job_type
+
+
+def query_filter(query):
+    """Matches what the read model matches: the title, company name or location (autocomplete suggests all three)."""
+    return Q(title__icontains=query) | Q(employer__company_name__icontains=query) | Q(location__icontains=query)
+
+
+def search_jobs(query, category_id=None, job_type=None):
+    """Open jobs matching the filters, newest first, as a sequence Paginator accepts."""
+    if settings.JOB_READ_MODEL_ENABLED:
+        open_jobs_index.ensure_fresh()
+        return IndexedJobList(open_jobs_index.search(q=query, category_id=category_id, job_type=job_type))
+    jobs = Job.objects.live().select_related('employer').order_by('-created_at', '-id')
+    if query:
+        jobs = jobs.filter(query_filter(query))
+    if category_id is not None:
+        jobs = jobs.filter(category_id=category_id)
+    if job_type:
+        jobs = jobs.filter(job_type=job_type)
+    return jobs
+
+
+def job_categories():
+    categories = cache.get(CATEGORIES_KEY)
+    if categories is None:
+        categories = list(Category.objects.order_by('name').values('id', 'name'))
+        cache.set(CATEGORIES_KEY, categories, settings.SEARCH_CACHE_TTL)
+    return categories
+
+
+class SearchLogBuffer:
+    """
+    Per-process buffer of searches, written with one bulk_create (plus one
+    rollup upsert per search and day) once full or older than the flush interval.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+        self._first_event_at = None
+
+    def add(self, key, page, result_count, latency_ms, cached, searched_at=None):
+        searched_at = searched_at or timezone.now()
+        with self._lock:
+            if not self._events:
+                self._first_event_at = time.monotonic()
+                # Make sure a quiet process still writes its events out
+                timer = threading.Timer(settings.SEARCH_LOG_FLUSH_INTERVAL, self._flush_from_timer)
+                timer.daemon = True
+                timer.start()
+            self._events.append((key, page, result_count, latency_ms, cached, searched_at))
+            due = (
+                len(self._events) >= settings.SEARCH_LOG_BUFFER_SIZE
+                or time.monotonic() - self._first_event_at >= settings.SEARCH_LOG_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return 0
+        try:
+            write_search_log(events)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(events)} search log entries: {e}", exc_info=True)
+            return 0
+        return len(events)
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Timer threads get their own database connection; don't leak it
+            connections.close_all()
+
+    def __len__(self):
+        return len(self._events)
+
+
+def write_search_log(events):
+    """Persist (key, page, result_count, latency_ms, cached, searched_at) events and roll them up per day."""
+    daily = defaultdict(lambda: {'count': 0, 'zero_results': 0, 'cached': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+    for key, page, result_count, latency_ms, cached, searched_at in events:
+        totals = daily[key + (timezone.localdate(searched_at),)]
+        totals['count'] += 1
+        totals['zero_results'] += not result_count
+        totals['cached'] += cached
+        totals['total_ms'] += latency_ms
+        totals['max_ms'] = max(totals['max_ms'], latency_ms)
+    with transaction.atomic():
+        SearchQuery.objects.bulk_create([
+            SearchQuery(
+                query=query, category_id=category_id, job_type=job_type, page=page, result_count=result_count,
+                latency_ms=latency_ms, cached=cached, searched_at=searched_at,
+            )
+            for (query, category_id, job_type), page, result_count, latency_ms, cached, searched_at in events
+        ])
+        for (query, category_id, job_type, date), totals in daily.items():
+            _increment_daily({'query': query, 'category_id': category_id, 'job_type': job_type, 'date': date}, totals)
+
+
+def _increment_daily(lookup, totals):
+    increments = {
+        'count': F('count') + totals['count'],
+        'zero_results': F('zero_results') + totals['zero_results'],
+        'cached': F('cached') + totals['cached'],
+        'total_ms': F('total_ms') + totals['total_ms'],
+        'max_ms': Greatest(F('max_ms'), totals['max_ms']),
+    }
+    if SearchQueryDaily.objects.filter(**lookup).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            SearchQueryDaily.objects.create(**totals, **lookup)
+    except IntegrityError:
+        # Another process created the row first
+        SearchQueryDaily.objects.filter(**lookup).update(**increments)
+
+
+search_log_buffer = SearchLogBuffer()
+atexit.register(search_log_buffer.flush)
+
+
+def record_search(key, page, result_count, latency_ms, cached=False):
+    """``key`` is (normalised query, category id or 0, job type or '')."""
+    search_log_buffer.add(key, page, result_count, latency_ms, cached)
+
+
+class CachedResults:
+    """The first page of a search and its total, enough for Paginator to build page one."""
+
+    def __init__(self, total, jobs):
+        self.total = total
+        self.jobs = jobs
+
+    def count(self):
+        return self.total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index):
+        return self.jobs[index]
+
+
+def _cache_key(key):
+    return 'search:page:' + hashlib.md5(repr(key).encode()).hexdigest()
+
+
+def cached_first_page(key):
+    return cache.get(_cache_key(key))
+
+
+def hot_queries(limit=None, days=None):
+    limit = settings.SEARCH_HOT_QUERIES if limit is None else limit
+    days = settings.SEARCH_HOT_WINDOW_DAYS if days is None else days
+    since = timezone.localdate() - datetime.timedelta(days=days - 1)
+    rows = SearchQueryDaily.objects.filter(date__gte=since).values(
+        'query', 'category_id', 'job_type'
+    ).annotate(total=Sum('count')).order_by('-total', 'query', 'category_id', 'job_type')[:limit]
+    return [(row['query'], row['category_id'], row['job_type']) for row in rows]
+
+
+def _generation():
+    cache.add(GENERATION_KEY, 0, None)
+    return cache.get(GENERATION_KEY)
+
+
+def _bump_generation():
+    cache.add(GENERATION_KEY, 0, None)
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.add(GENERATION_KEY, 1, None)
+
+
+def refresh_hot_queries():
+    """Recompute and cache the first page of every hot search. Returns the number cached."""
+    generation = _generation()
+    keys = hot_queries()
+    entries = {}
+    for key in keys:
+        query, category_id, job_type = key
+        paginator = Paginator(search_jobs(query, category_id or None, job_type or None), JOB_LIST_PAGE_SIZE)
+        entries[_cache_key(key)] = CachedResults(paginator.count, list(paginator.page(1).object_list))
+    if _generation() != generation:
+        # A job changed while the pages were computed; they may be stale, so wait for the next round
+        return 0
+    previous = cache.get(HOT_KEY) or []
+    cache.delete_many([_cache_key(key) for key in previous if key not in keys])
+    cache.set_many(entries, settings.SEARCH_CACHE_TTL)
+    cache.set(HOT_KEY, keys, settings.SEARCH_CACHE_TTL)
+    return len(entries)
+
+
+def _matches(key, state):
+    query, category_id, job_type = key
+    text, job_category_id, job_job_type = state
+    return (
+        (not query or query in text)
+        and (not category_id or category_id == job_category_id)
+        and (not job_type or job_type == job_job_type)
+    )
+
+
+def invalidate_matching(states):
+    """Drop cached searches that a job with any of the (search text, category_id, job_type) ``states`` appears in."""
+    hot = cache.get(HOT_KEY)
+    if not hot:
+        return 0
+    stale = [key for key in hot if any(_matches(key, state) for state in states)]
+    if stale:
+        _bump_generation()
+        cache.delete_many([_cache_key(key) for key in stale])
+    return len(stale)
+
+
+def invalidate_all():
+    """For changes that bypass model signals (bulk updates, deletes and imports)."""
+    hot = cache.get(HOT_KEY)
+    _bump_generation()
+    if hot:
+        cache.delete_many([_cache_key(key) for key in hot])
+
+
+class HotQueryRefresher:
+    """Daemon thread, started by the first search in each process, that refreshes the hot-query cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = False
+
+    def start(self):
+        if self.started or not settings.SEARCH_HOT_QUERIES:
+            return
+        with self._lock:
+            if self.started:
+                return
+            threading.Thread(target=self._run, name='hot-query-refresher', daemon=True).start()
+            self.started = True
+
+    def _run(self):
+        while True:
+            time.sleep(settings.SEARCH_CACHE_REFRESH_INTERVAL)
+            try:
+                refresh_hot_queries()
+            except Exception as e:
+                logger.error(f"Error refreshing hot search queries: {e}", exc_info=True)
+            finally:
+                connections.close_all()
+
+
+hot_query_refresher = HotQueryRefresher()
+
+
+def _job_state(job):
+    try:
+        company_name = job.employer.company_name
+    except Employer.DoesNotExist:
+        company_name = ''
+    return (search_text(job.title, company_name, job.location), job.category_id, job.job_type)
+
+
+def _job_pre_save(sender, instance, raw=False, **kwargs):
+    # The previous text/category/type decide which cached searches the job left
+    if raw or instance.pk is None or not cache.get(HOT_KEY):
+        return
+    row = Job.objects.filter(pk=instance.pk).values_list(
+        'title', 'employer__company_name', 'location', 'category_id', 'job_type'
+    ).first()
+    if row is not None:
+        instance._search_state = (search_text(*row[:3]), row[3], row[4])
+
+
+def _job_saved(sender, instance, raw=False, **kwargs):
+    if raw or not cache.get(HOT_KEY):
+        return
+    states = [_job_state(instance)]
+    previous = getattr(instance, '_search_state', None)
+    if previous is not None:
+        states.append(previous)
+    invalidate_matching(states)
+
+
+def _job_deleted(sender, instance, **kwargs):
+    if not cache.get(HOT_KEY):
+        return
+    invalidate_matching([_job_state(instance)])
+
+
+def _employer_saved(sender, instance, raw=False, **kwargs):
+    # Cached pages include the company name of every job
+    if not raw:
+        invalidate_all()
+
+
+def _categories_changed(sender, **kwargs):
+    cache.delete(CATEGORIES_KEY)
+
+
+def connect_signals():
+    pre_save.connect(_job_pre_save, sender=Job, dispatch_uid='search_cache_job_pre_save')
+    post_save.connect(_job_saved, sender=Job, dispatch_uid='search_cache_job_save')
+    post_delete.connect(_job_deleted, sender=Job, dispatch_uid='search_cache_job_delete')
+    post_save.connect(_employer_saved, sender=Employer, dispatch_uid='search_cache_employer_save')
+    post_save.connect(_categories_changed, sender=Category, dispatch_uid='search_cache_category_save')
+    post_delete.connect(_categories_changed, sender=Category, dispatch_uid='search_cache_category_delete')
@@ -0,0 +1,97 @@
+"""
+Pre-forking production server for Linux, built on gunicorn (see the serve command).
+
+The master imports the Django application once and forks the workers from it,
+so they share its memory copy-on-write. Workers are recycled after
+max_requests requests (with jitter) or when their resident memory passes
+max_memory_mb. SIGHUP starts a fresh set of workers and retires the old ones
+once their requests finish; the listening socket stays open throughout.
+"""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def rss_bytes():
+    """Current resident set size of this process."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        # Peak rather than current size, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def memory_recycler(max_memory_mb):
+    """post_request hook that retires a worker once it uses more than ``max_memory_mb``."""
+    limit = max_memory_mb * 1024 * 1024
+
+    def post_request(worker, req, environ, resp):
+        rss = rss_bytes()
+        if rss > limit and worker.alive:
+            logger.warning(f"Worker {worker.pid} uses {rss // (1024 * 1024)} MB; restarting it")
+            # The worker finishes its in-flight requests and exits; the master starts a new one
+            worker.alive = False
+    return post_request
+
+
+def gunicorn_options(bind='127.0.0.1:8000', workers=None, threads=4, max_requests=1000, max_requests_jitter=100,
+                     max_memory_mb=0, timeout=30, graceful_timeout=30, asgi=False, preload=True):
+    workers = workers or os.cpu_count() or 1
+    options = {
+        'bind': bind,
+        'workers': workers,
+        'preload_app': preload,
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests_jitter,
+        'timeout': timeout,
+        'graceful_timeout': graceful_timeout,
+        'accesslog': '-',
+        'errorlog': '-',
+    }
+    if asgi:
+        options['worker_class'] = 'uvicorn.workers.UvicornWorker'
+    elif threads > 1:
+        # Like waitress, each worker serves requests from a thread pool
+        options['worker_class'] = 'gthread'
+        options['threads'] = threads
+    else:
+        options['worker_class'] = 'sync'
+    if max_memory_mb and not asgi:
+        options['post_request'] = memory_recycler(max_memory_mb)
+    if options['worker_class'] == 'sync':
+        # Only a sync worker serves requests on the thread that runs post_worker_init
+        options['post_worker_init'] = connect_worker
+    return options
+
+
+def connect_worker(worker):
+    # The master closed its connections before forking; open this worker's own before it accepts requests.
+    # Connections are per thread, so this is only wired up for sync workers (see gunicorn_options).
+    from django.conf import settings
+    if settings.WARM_BOOT_ENABLED:
+        from .warmup import open_connections
+        open_connections()
+
+
+def run(options, asgi=False):
+    from gunicorn.app.base import BaseApplication
+
+    class JobPortalApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            if asgi:
+                from job.asgi import application
+            else:
+                from job.wsgi import application
+            # Connections opened while loading must not be shared by the forked workers
+            from django.db import connections
+            connections.close_all()
+            return application
+
+    JobPortalApplication().run()
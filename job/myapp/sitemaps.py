@@ -0,0 +1,188 @@
+"""
+Sitemap index and schema.org JobPosting feed for crawlers, written to disk.
+
+Open jobs are sharded by id range (SHARD_SIZE ids per shard, so no shard
+exceeds the 50,000 URL sitemap limit). For every shard there is a sitemap and
+a JSON-LD feed. A shard is rewritten only when its fingerprint (number of open
+jobs and newest ``updated_at``) changes, and each file's modification time is
+set to that newest ``updated_at`` so the static file server sends it as
+``Last-Modified``.
+"""
+import json
+import logging
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, F, Max
+from django.db.models.functions import Floor
+from django.urls import reverse
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+SHARD_SIZE = 50000
+ITERATOR_CHUNK_SIZE = 2000
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+
+EMPLOYMENT_TYPES = {
+    'full_time': 'FULL_TIME',
+    'part_time': 'PART_TIME',
+    'contract': 'CONTRACTOR',
+    'internship': 'INTERN',
+    'remote': 'FULL_TIME',
+}
+
+
+def sitemap_name(shard):
+    return f'sitemap-jobs-{shard}.xml'
+
+
+def feed_name(shard):
+    return f'jobs-{shard}.json'
+
+
+def _absolute(path):
+    return settings.SITE_URL.rstrip('/') + path
+
+
+def shard_fingerprints():
+    """{shard: (open job count, newest updated_at)} from one GROUP BY query."""
+    rows = (
+        Job.objects.live()
+        .annotate(shard=Floor(F('id') / SHARD_SIZE))
+        .values('shard')
+        .annotate(count=Count('id'), latest=Max('updated_at'))
+        .order_by('shard')
+    )
+    return {int(row['shard']): (row['count'], row['latest']) for row in rows}
+
+
+def _shard_jobs(shard):
+    return (
+        Job.objects.live()
+        .filter(id__gte=shard * SHARD_SIZE, id__lt=(shard + 1) * SHARD_SIZE)
+        .order_by('id')
+    )
+
+
+def iter_sitemap(shard):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    rows = _shard_jobs(shard).values_list('id', 'updated_at').iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    for job_id, updated_at in rows:
+        url = escape(_absolute(reverse('job_detail', args=[job_id])))
+        yield f'<url><loc>{url}</loc><lastmod>{updated_at.isoformat(timespec="seconds")}</lastmod></url>\n'
+    yield '</urlset>\n'
+
+
+def job_posting(job):
+    """schema.org JobPosting for a row from _shard_jobs().values(...)."""
+    posting = {
+        '@type': 'JobPosting',
+        'identifier': job['id'],
+        'url': _absolute(reverse('job_detail', args=[job['id']])),
+        'title': job['title'],
+        'description': job['description'],
+        'datePosted': job['created_at'].date().isoformat(),
+        'dateModified': job['updated_at'].isoformat(timespec='seconds'),
+        'validThrough': job['application_deadline'].isoformat(),
+        'employmentType': EMPLOYMENT_TYPES.get(job['job_type'], 'OTHER'),
+        'hiringOrganization': {'@type': 'Organization', 'name': job['employer__company_name']},
+        'jobLocation': {'@type': 'Place', 'address': job['location']},
+        'occupationalCategory': job['category__name'],
+    }
+    if job['job_type'] == 'remote':
+        posting['jobLocationType'] = 'TELECOMMUTE'
+    if job['salary']:
+        posting['baseSalary'] = job['salary']
+    return posting
+
+
+def iter_feed(shard):
+    yield '{"@context": "https://schema.org", "@graph": [\n'
+    rows = _shard_jobs(shard).values(
+        'id', 'title', 'description', 'location', 'job_type', 'salary', 'application_deadline',
+        'created_at', 'updated_at', 'employer__company_name', 'category__name',
+    ).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    separator = ''
+    for job in rows:
+        yield separator + json.dumps(job_posting(job), ensure_ascii=False)
+        separator = ',\n'
+    yield '\n]}\n'
+
+
+def iter_index(fingerprints):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for shard, (count, latest) in sorted(fingerprints.items()):
+        url = escape(_absolute(settings.SITEMAP_URL + sitemap_name(shard)))
+        yield f'<sitemap><loc>{url}</loc><lastmod>{latest.isoformat(timespec="seconds")}</lastmod></sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def _write(root, name, chunks, modified=None):
+    """Write ``chunks`` to ``root/name`` atomically, optionally stamping its mtime."""
+    fd, tmp_path = tempfile.mkstemp(dir=root, prefix=f'.{name}.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.chmod(tmp_path, 0o644)
+        if modified is not None:
+            os.utime(tmp_path, (modified.timestamp(), modified.timestamp()))
+        os.replace(tmp_path, os.path.join(root, name))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _remove(root, name):
+    try:
+        os.remove(os.path.join(root, name))
+    except FileNotFoundError:
+        pass
+
+
+def _load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), encoding='utf-8') as f:
+            return {int(shard): tuple(value) for shard, value in json.load(f).items()}
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def generate(full=False):
+    """
+    Bring the files under SITEMAP_ROOT up to date. Returns a dict with the
+    shards that were written, removed and left untouched.
+    """
+    root = settings.SITEMAP_ROOT
+    os.makedirs(root, exist_ok=True)
+    fingerprints = shard_fingerprints()
+    previous = _load_manifest(root)
+    manifest = {shard: [count, latest.isoformat()] for shard, (count, latest) in fingerprints.items()}
+
+    written, unchanged = [], []
+    for shard, (count, latest) in fingerprints.items():
+        current = tuple(manifest[shard]) == previous.get(shard)
+        if not full and current and os.path.exists(os.path.join(root, sitemap_name(shard))):
+            unchanged.append(shard)
+            continue
+        _write(root, sitemap_name(shard), iter_sitemap(shard), latest)
+        _write(root, feed_name(shard), iter_feed(shard), latest)
+        written.append(shard)
+    removed = sorted(set(previous) - set(fingerprints))
+    for shard in removed:
+        _remove(root, sitemap_name(shard))
+        _remove(root, feed_name(shard))
+
+    if full or written or removed or not os.path.exists(os.path.join(root, INDEX_NAME)):
+        newest = max((latest for count, latest in fingerprints.values()), default=None)
+        _write(root, INDEX_NAME, iter_index(fingerprints), newest)
+    _write(root, MANIFEST_NAME, [json.dumps({str(shard): value for shard, value in manifest.items()})])
+    logger.info(f"Sitemaps: {len(written)} shard(s) written, {len(removed)} removed, {len(unchanged)} unchanged")
+    return {'written': written, 'removed': removed, 'unchanged': unchanged}
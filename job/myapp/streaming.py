@@ -0,0 +1,140 @@
+"""
+Streaming template rendering for large pages.
+
+stream_template() renders a template node by node and sends the output in
+chunks, so the browser gets the <head> and navigation (and starts loading CSS)
+while the content block is still rendering. {% extends %} and {% block %} are
+followed the same way Django renders them; any other tag is rendered whole.
+With DEBUG on, pages are rendered before they are sent, so a template error
+still shows the debug page instead of a truncated one.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib import messages
+from django.http import StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.shortcuts import render
+from django.template.context import make_context
+from django.template.loader import get_template
+from django.template.base import TextNode
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, BlockContext, BlockNode, ExtendsNode
+
+logger = logging.getLogger(__name__)
+
+# Send buffered output at the start of a block once at least this much is waiting
+MIN_FLUSH_SIZE = 1024
+MAX_CHUNK_SIZE = 16 * 1024
+_FLUSH = object()
+
+
+def _iter_nodelist(nodelist, context):
+    for node in nodelist:
+        if isinstance(node, ExtendsNode):
+            yield from _iter_extends(node, context)
+        elif isinstance(node, BlockNode):
+            yield _FLUSH
+            yield from _iter_block(node, context)
+        else:
+            yield node.render_annotated(context)
+
+
+def _iter_extends(node, context):
+    # Mirrors ExtendsNode.render
+    compiled_parent = node.get_parent(context)
+    if BLOCK_CONTEXT_KEY not in context.render_context:
+        context.render_context[BLOCK_CONTEXT_KEY] = BlockContext()
+    block_context = context.render_context[BLOCK_CONTEXT_KEY]
+    block_context.add_blocks(node.blocks)
+    for parent_node in compiled_parent.nodelist:
+        if not isinstance(parent_node, TextNode):
+            if not isinstance(parent_node, ExtendsNode):
+                block_context.add_blocks({
+                    block.name: block for block in compiled_parent.nodelist.get_nodes_by_type(BlockNode)
+                })
+            break
+    with context.render_context.push_state(compiled_parent, isolated_context=False):
+        yield from _iter_nodelist(compiled_parent.nodelist, context)
+
+
+def _iter_block(node, context):
+    # Mirrors BlockNode.render
+    block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
+    with context.push():
+        if block_context is None:
+            context['block'] = node
+            yield from _iter_nodelist(node.nodelist, context)
+            return
+        push = block = block_context.pop(node.name)
+        if block is None:
+            block = node
+        block = type(node)(block.name, block.nodelist)
+        block.context = context
+        context['block'] = block
+        yield from _iter_nodelist(block.nodelist, context)
+        if push is not None:
+            block_context.push(node.name, push)
+
+
+def iter_template(template_name, context=None, request=None):
+    """Rendered output of ``template_name`` in chunks of up to MAX_CHUNK_SIZE characters."""
+    template = get_template(template_name).template
+    context = make_context(context, request, autoescape=template.engine.autoescape)
+    buffer, size = [], 0
+    with context.render_context.push_state(template):
+        with context.bind_template(template):
+            context.template_name = template.name
+            for piece in _iter_nodelist(template.nodelist, context):
+                if piece is _FLUSH:
+                    if size < MIN_FLUSH_SIZE:
+                        continue
+                else:
+                    buffer.append(piece)
+                    size += len(piece)
+                    if size < MAX_CHUNK_SIZE:
+                        continue
+                yield ''.join(buffer)
+                buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def call_on_close(response, callback):
+    """
+    Run ``callback`` once, after ``response.close()``. Servers close a response
+    when its body is sent or the client went away, so for a streamed page this
+    is when rendering has finished.
+    """
+    close = response.close
+    called = False
+
+    def closing():
+        nonlocal called
+        try:
+            close()
+        finally:
+            if not called:
+                called = True
+                callback()
+
+    response.close = closing
+
+
+def stream_template(request, template_name, context=None, status=200):
+    """Like render(), but the page is rendered while it is being sent (outside DEBUG)."""
+    if settings.DEBUG:
+        return render(request, template_name, context, status=status)
+    # Middleware finishes before the body renders, so settle what templates would change later:
+    # the CSRF cookie is set only if a token was requested, and messages only count as shown once iterated.
+    get_token(request)
+    list(messages.get_messages(request))
+
+    def chunks():
+        try:
+            yield from iter_template(template_name, context, request)
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated page
+            logger.error(f"Error streaming template {template_name}: {e}", exc_info=True)
+            raise
+
+    return StreamingHttpResponse(chunks(), status=status, content_type='text/html; charset=utf-8')
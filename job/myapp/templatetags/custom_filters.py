@@ -16,21 +16,48 @@ def trim(value):
         return value
     return str(value).strip()
 
+class StyledField:
+    """
+    A bound field rendered with extra widget attributes. The filters below
+    return one instead of writing to the shared widget's attrs, so rendering a
+    field twice, or the same form class in another request, is unaffected.
+    """
+
+    def __init__(self, bound_field, attrs):
+        self.bound_field = bound_field
+        self.attrs = attrs
+
+    def __getattr__(self, name):
+        return getattr(self.bound_field, name)
+
+    def __str__(self):
+        html = self.bound_field.as_widget(attrs=self.attrs)
+        if self.bound_field.field.show_hidden_initial:
+            return html + self.bound_field.as_hidden(only_initial=True)
+        return html
+
+    __html__ = __str__
+
+
+def _styled(field, **attrs):
+    if isinstance(field, StyledField):
+        return StyledField(field.bound_field, {**field.attrs, **attrs})
+    return StyledField(field, attrs)
+
+
 @register.filter
 def add_class(bound_field, css_class):
     """Add CSS class to form field"""
-    if 'class' in bound_field.field.widget.attrs:
-        bound_field.field.widget.attrs['class'] += ' ' + css_class
+    if isinstance(bound_field, StyledField):
+        existing = bound_field.attrs.get('class') or bound_field.field.widget.attrs.get('class')
     else:
-        bound_field.field.widget.attrs['class'] = css_class
-    return bound_field
+        existing = bound_field.field.widget.attrs.get('class')
+    return _styled(bound_field, **{'class': f"{existing} {css_class}" if existing else css_class})
 
 @register.filter
 def attr(bound_field, attr_string):
     """Add arbitrary attribute to form field, e.g., 'aria-describedby: id_help'"""
-    if ':' in attr_string:
-        key, value = attr_string.split(':', 1)
-        key = key.strip()
-        value = value.strip()
-        bound_field.field.widget.attrs[key] = value
-    return bound_field
+    if ':' not in attr_string:
+        return bound_field
+    key, value = attr_string.split(':', 1)
+    return _styled(bound_field, **{key.strip(): value.strip()})
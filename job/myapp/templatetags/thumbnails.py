@@ -0,0 +1,12 @@
+from django import template
+
+from myapp import thumbnails
+
+register = template.Library()
+
+@register.simple_tag
+def thumbnail_url(image, size, fmt='webp'):
+    """URL of the pre-generated variant of an uploaded image closest to ``size`` pixels"""
+    if not image:
+        return ''
+    return thumbnails.thumbnail_url(image.name, int(size), fmt)
@@ -1,9 +1,46 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from .models import Job, Employer, JobSeeker, JobApplication, Category
+from .models import Job, Employer, JobSeeker, JobApplication, Category, ApplicationNotification, SavedJob, PendingFileDeletion, JobLSHBucket
+from .models import SearchQuery, SearchQueryDaily
 from django.utils import timezone
 from datetime import timedelta
+from io import StringIO
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from django.core.management import call_command
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.template import Context, Template
+from PIL import Image
+from . import thumbnails
+from .models import ProfileView, ProfileViewDaily
+from .profile_views import profile_view_buffer, prune_profile_views
+from .bulk_jobs import archive_jobs
+from . import job_index
+from .autocomplete import PrefixIndex, prefix_index
+from . import sitemaps
+from . import admission
+from . import metrics
+from . import profiling
+from . import compression
+from . import server
+from . import warmup
+from . import search
+from django.core.management.base import CommandError
+import gzip
+import sys
+from django.core.cache import cache
+from unittest import mock
+from collections import Counter
+from django.contrib import admin as django_admin
+from .admin import JobAdmin
 
 User = get_user_model()
 
@@ -74,3 +111,1464 @@ class JobPortalTests(TestCase):
             'password': 'newpassword123',
         })
         self.assertEqual(login_response.status_code, 302)  # Redirect after login
+
+class ApplicationHistoryTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(email="seeker@example.com", password="testpassword123", username="seeker")
+        self.client.login(email="seeker@example.com", password="testpassword123")
+
+        employer_user = User.objects.create_user(email="boss@example.com", password="testpassword123", username="boss")
+        self.category = Category.objects.create(name="IT & Software")
+        self.employer = Employer.objects.create(user=employer_user, company_name="History Co")
+        self.job_seeker = JobSeeker.objects.create(user=self.user)
+        deadline = timezone.now().date() + timedelta(days=10)
+        for i in range(25):
+            job = Job.objects.create(
+                title=f"History Job {i}", description="d", requirements="r", location="l",
+                job_type="full_time", category=self.category, employer=self.employer,
+                application_deadline=deadline,
+            )
+            JobApplication.objects.create(job=job, job_seeker=self.job_seeker, cover_letter="c")
+        self.job = job
+
+    def test_apply_page_shows_only_recent_applications(self):
+        response = self.client.get(reverse('apply_job', args=[self.job.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['recent_applications']), 5)
+        self.assertContains(response, reverse('application_history'))
+
+    def test_history_is_paginated(self):
+        response = self.client.get(reverse('application_history'))
+        self.assertEqual(response.status_code, 200)
+        page = response.context['applications']
+        self.assertEqual(len(page.object_list), 20)
+        self.assertEqual(page.paginator.num_pages, 2)
+
+        response = self.client.get(reverse('application_history'), {'page': 2}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(len(response.context['applications'].object_list), 5)
+        self.assertNotContains(response, '<html')
+
+
+class BulkJobImportTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(email="agency@example.com", password="testpassword123", username="agency")
+        self.client.login(email="agency@example.com", password="testpassword123")
+        self.employer = Employer.objects.create(user=self.user, company_name="Agency")
+        self.deadline = (timezone.now().date() + timedelta(days=30)).isoformat()
+
+    def test_bulk_endpoint_reports_row_errors_without_aborting(self):
+        csv_data = (
+            "title,location,job_type,category,deadline,description,requirements,contact_email\n"
+            f"Backend Dev,Remote,remote,it,{self.deadline},Build APIs,Python,jobs@example.com\n"
+            f"Bad Type,Remote,weekly,it,{self.deadline},x,y,\n"
+            f"Designer,Pune,full_time,Design,{self.deadline},Design things,Figma,\n"
+        )
+        response = self.client.post(reverse('bulk_post_jobs'), csv_data, content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['error_count'], 1)
+        self.assertEqual(result['errors'][0]['line'], 3)
+        self.assertEqual(Job.objects.filter(employer=self.employer).count(), 2)
+        self.assertTrue(Category.objects.filter(name='Design').exists())
+        # Imported jobs are in the duplicate index although bulk_create sends no signals
+        self.assertFalse(Job.objects.filter(minhash__isnull=True).exists())
+        self.assertEqual(JobLSHBucket.objects.count(), 2 * 16)
+
+    def test_import_jobs_command_reads_jsonl_in_chunks(self):
+        rows = [
+            {'title': f'Job {i}', 'location': 'Remote', 'job_type': 'contract', 'category': 'sales',
+             'deadline': self.deadline, 'description': 'd', 'requirements': 'r'}
+            for i in range(7)
+        ]
+        rows.append({'title': 'Missing fields'})
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as handle:
+            handle.write('\n'.join(json.dumps(row) for row in rows))
+        self.addCleanup(os.remove, handle.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_jobs', handle.name, employer='agency@example.com', chunk_size=3, stdout=out, stderr=err)
+        self.assertEqual(Job.objects.filter(employer=self.employer).count(), 7)
+        self.assertIn('Imported 7 of 8 rows', out.getvalue())
+        self.assertIn('line 8', err.getvalue())
+
+
+class ApplicantExportTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(email="employer@example.com", password="testpassword123", username="employer")
+        self.client.login(email="employer@example.com", password="testpassword123")
+        self.employer = Employer.objects.create(user=self.user, company_name="Export Co")
+        category = Category.objects.create(name="Sales")
+        deadline = timezone.now().date() + timedelta(days=10)
+        self.jobs = [
+            Job.objects.create(
+                title=f"Export Job {i}", description="d", requirements="r", location="l",
+                job_type="full_time", category=category, employer=self.employer,
+                application_deadline=deadline,
+            )
+            for i in range(2)
+        ]
+        for i in range(3):
+            seeker_user = User.objects.create_user(
+                email=f"applicant{i}@example.com", password="testpassword123", username=f"applicant{i}",
+                first_name=f"First{i}", last_name=f"Last{i}",
+            )
+            seeker = JobSeeker.objects.create(user=seeker_user)
+            JobApplication.objects.create(
+                job=self.jobs[i % 2], job_seeker=seeker, cover_letter="c",
+                status='accepted' if i == 0 else 'pending',
+            )
+
+    def test_csv_export_streams_all_applicants(self):
+        response = self.client.get(reverse('export_applicants'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().strip().splitlines()
+        self.assertEqual(lines[0], 'application_id,job_id,job_title,status,first_name,last_name,email,applied_at')
+        self.assertEqual(len(lines), 4)
+
+    def test_jsonl_export_filters_by_job_and_status(self):
+        response = self.client.get(reverse('export_applicants'), {
+            'format': 'jsonl', 'job': self.jobs[0].id, 'status': 'pending',
+        })
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['email'] for row in rows], ['applicant2@example.com'])
+        self.assertEqual(rows[0]['job_title'], 'Export Job 0')
+
+    def test_invalid_date_is_rejected(self):
+        for params in ({'since': '2024-13-01'}, {'until': 'yesterday'}):
+            response = self.client.get(reverse('export_applicants'), params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class BulkJobActionTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(email="owner@example.com", password="testpassword123", username="owner")
+        self.client.login(email="owner@example.com", password="testpassword123")
+        self.employer = Employer.objects.create(user=self.user, company_name="Owner Co")
+        other_user = User.objects.create_user(email="other@example.com", password="testpassword123", username="other")
+        other_employer = Employer.objects.create(user=other_user, company_name="Other Co")
+        category = Category.objects.create(name="Finance")
+        deadline = timezone.now().date() + timedelta(days=10)
+
+        def make_job(employer, title):
+            return Job.objects.create(
+                title=title, description="d", requirements="r", location="l", job_type="full_time",
+                category=category, employer=employer, application_deadline=deadline,
+            )
+
+        self.jobs = [make_job(self.employer, f"Owned {i}") for i in range(3)]
+        self.foreign_job = make_job(other_employer, "Foreign")
+        seeker = JobSeeker.objects.create(user=User.objects.create_user(
+            email="applicant@example.com", password="testpassword123", username="applicant"))
+        for job in self.jobs + [self.foreign_job]:
+            application = JobApplication.objects.create(
+                job=job, job_seeker=seeker, cover_letter="c", resume=f"applications/{job.id}.pdf")
+            ApplicationNotification.objects.create(employer=job.employer, job_application=application)
+            SavedJob.objects.create(job=job, job_seeker=seeker)
+
+    def test_bulk_delete_removes_dependents_and_queues_files(self):
+        response = self.client.post(reverse('bulk_job_action'), {
+            'action': 'delete',
+            'job_ids': [self.jobs[0].id, self.jobs[1].id, self.foreign_job.id],
+        })
+        self.assertRedirects(response, reverse('dashboard'))
+        self.assertEqual(set(Job.objects.values_list('id', flat=True)), {self.jobs[2].id, self.foreign_job.id})
+        self.assertEqual(JobApplication.objects.count(), 2)
+        self.assertEqual(ApplicationNotification.objects.count(), 2)
+        self.assertEqual(SavedJob.objects.count(), 2)
+        self.assertEqual(
+            set(PendingFileDeletion.objects.values_list('name', flat=True)),
+            {f"applications/{self.jobs[0].id}.pdf", f"applications/{self.jobs[1].id}.pdf"},
+        )
+
+    def test_bulk_delete_updates_in_process_indexes(self):
+        job_index.open_jobs_index.build()
+        self.addCleanup(setattr, job_index.open_jobs_index, 'built', False)
+        prefix_index.build()
+        self.addCleanup(setattr, prefix_index, 'built', False)
+        self.client.post(reverse('bulk_job_action'), {'action': 'delete', 'job_ids': [self.jobs[0].id]})
+        self.assertNotIn(self.jobs[0].id, job_index.open_jobs_index.search())
+        self.assertEqual(
+            [s['text'] for s in prefix_index.suggest("owned", 5)], ["Owned 1", "Owned 2"],
+        )
+
+    def test_bulk_archive_flags_jobs_inactive(self):
+        self.client.post(reverse('bulk_job_action'), {'action': 'archive', 'job_ids': [self.jobs[0].id]})
+        self.assertFalse(Job.objects.get(id=self.jobs[0].id).is_active)
+        self.assertTrue(Job.objects.get(id=self.jobs[1].id).is_active)
+
+
+class MediaGarbageCollectorTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        user = User.objects.create_user(email="media@example.com", password="testpassword123", username="media")
+        JobSeeker.objects.create(user=user, resume="resumes/kept.pdf", profile_picture="profile_pics/kept.jpg")
+        old = time.time() - 3 * 24 * 3600
+        for name in ("resumes/kept.pdf", "profile_pics/kept.jpg", "resumes/orphan.pdf", "applications/orphan.pdf"):
+            self._write(name, mtime=old)
+        self._write("applications/fresh.pdf")
+
+    def _write(self, name, mtime=None):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as handle:
+            handle.write(b"data")
+        if mtime:
+            os.utime(path, (mtime, mtime))
+
+    def _exists(self, name):
+        return os.path.exists(os.path.join(self.media_root, name))
+
+    def test_dry_run_keeps_files(self):
+        out = StringIO()
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command('collect_media_garbage', dry_run=True, stdout=out)
+        self.assertIn("Would remove 2 orphaned files", out.getvalue())
+        self.assertTrue(self._exists("resumes/orphan.pdf"))
+
+    def test_removes_only_old_unreferenced_files(self):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command('collect_media_garbage', stdout=StringIO())
+        self.assertFalse(self._exists("resumes/orphan.pdf"))
+        self.assertFalse(self._exists("applications/orphan.pdf"))
+        self.assertTrue(self._exists("resumes/kept.pdf"))
+        self.assertTrue(self._exists("profile_pics/kept.jpg"))
+        self.assertTrue(self._exists("applications/fresh.pdf"))
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        os.makedirs(os.path.join(self.media_root, 'profile_pics'))
+        Image.new('RGB', (1200, 800), 'red').save(os.path.join(self.media_root, 'profile_pics', 'me.png'))
+        thumbnails._known_variants.clear()
+        thumbnails._pending.clear()
+
+    def test_generate_all_variants(self):
+        written = thumbnails.generate_thumbnails('profile_pics/me.png')
+        self.assertEqual(len(written), 6)
+        with Image.open(os.path.join(self.media_root, 'profile_pics', 'me__thumb_48.webp')) as image:
+            self.assertEqual(image.size, (48, 48))
+
+    def test_template_tag_generates_missing_variants_in_background(self):
+        user = User.objects.create_user(email="pic@example.com", password="testpassword123", username="pic")
+        job_seeker = JobSeeker.objects.create(user=user, profile_picture='profile_pics/me.png')
+        template = Template("{% load thumbnails %}{% thumbnail_url picture 40 'jpeg' %}")
+        context = Context({'picture': job_seeker.profile_picture})
+        with mock.patch.object(thumbnails, 'generate_thumbnails', wraps=thumbnails.generate_thumbnails) as generate:
+            # The render does not wait for the resize
+            self.assertEqual(template.render(context), '/media/profile_pics/me.png')
+            template.render(context)
+            thumbnails._executor.submit(lambda: None).result()
+        generate.assert_called_once_with('profile_pics/me.png')
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'profile_pics', 'me__thumb_128.jpeg')))
+        self.assertEqual(template.render(context), '/media/profile_pics/me__thumb_48.jpeg')
+
+    def test_known_variants_are_bounded(self):
+        thumbnails.generate_thumbnails('profile_pics/me.png')
+        thumbnails._known_variants.clear()
+        with mock.patch.object(thumbnails, 'MAX_KNOWN_VARIANTS', 2):
+            for size in thumbnails.THUMBNAIL_SIZES:
+                thumbnails.thumbnail_url('profile_pics/me.png', size)
+        self.assertEqual(list(thumbnails._known_variants), ['profile_pics/me__thumb_128.webp', 'profile_pics/me__thumb_512.webp'])
+
+
+class ProtectedMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        os.makedirs(os.path.join(self.media_root, 'resumes'))
+        with open(os.path.join(self.media_root, 'resumes', 'cv.pdf'), 'wb') as handle:
+            handle.write(b'0123456789')
+
+        self.seeker_user = User.objects.create_user(email="cv@example.com", password="testpassword123", username="cv")
+        self.job_seeker = JobSeeker.objects.create(user=self.seeker_user, resume='resumes/cv.pdf')
+        employer_user = User.objects.create_user(email="hr@example.com", password="testpassword123", username="hr")
+        employer = Employer.objects.create(user=employer_user, company_name="HR Co")
+        User.objects.create_user(email="stranger@example.com", password="testpassword123", username="stranger")
+        job = Job.objects.create(
+            title="Role", description="d", requirements="r", location="l", job_type="full_time",
+            category=Category.objects.create(name="IT & Software"), employer=employer,
+            application_deadline=timezone.now().date() + timedelta(days=10),
+        )
+        JobApplication.objects.create(job=job, job_seeker=self.job_seeker, cover_letter="c")
+        self.url = '/media/resumes/cv.pdf'
+
+    def test_resume_access_follows_application_permissions(self):
+        for email, expected in (("cv@example.com", 200), ("hr@example.com", 200), ("stranger@example.com", 404)):
+            self.client.login(email=email, password="testpassword123")
+            self.assertEqual(self.client.get(self.url).status_code, expected, email)
+
+    def test_range_and_conditional_requests(self):
+        self.client.login(email="cv@example.com", password="testpassword123")
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=20-').status_code, 416)
+
+    def test_front_server_handoff(self):
+        self.client.login(email="hr@example.com", password="testpassword123")
+        with override_settings(PROTECTED_MEDIA_BACKEND='x-accel-redirect'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/resumes/cv.pdf')
+        self.assertEqual(response.content, b'')
+
+
+class AdminTests(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(email="admin@example.com", password="testpassword123", username="admin")
+        self.client.login(email="admin@example.com", password="testpassword123")
+        employer = Employer.objects.create(user=self.admin_user, company_name="Admin Co")
+        job = Job.objects.create(
+            title="Admin Job", description="d", requirements="r", location="l", job_type="full_time",
+            category=Category.objects.create(name="Design"), employer=employer,
+            application_deadline=timezone.now().date() + timedelta(days=10),
+        )
+        seeker = JobSeeker.objects.create(user=User.objects.create_user(
+            email="a@example.com", password="testpassword123", username="a"))
+        self.applications = [
+            JobApplication.objects.create(job=job, job_seeker=seeker, cover_letter="c") for _ in range(3)
+        ]
+
+    def test_changelists_render(self):
+        for model in ('job', 'jobapplication', 'applicationnotification', 'profileview', 'savedjob', 'jobseeker', 'employer'):
+            response = self.client.get(reverse(f'admin:myapp_{model}_changelist'))
+            self.assertEqual(response.status_code, 200, model)
+
+    def test_bulk_status_action_is_one_update(self):
+        ids = [application.id for application in self.applications[:2]]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('admin:myapp_jobapplication_changelist'), {
+                'action': 'mark_accepted', '_selected_action': ids,
+            })
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "myapp_jobapplication"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(JobApplication.objects.filter(status='accepted').count(), 2)
+
+
+class ProfileViewRecordingTests(TestCase):
+    def setUp(self):
+        employer_user = User.objects.create_user(email="viewer@example.com", password="testpassword123", username="viewer")
+        self.employer = Employer.objects.create(user=employer_user, company_name="Viewer Co")
+        self.job_seeker = JobSeeker.objects.create(user=User.objects.create_user(
+            email="viewed@example.com", password="testpassword123", username="viewed"))
+        profile_view_buffer.flush()
+
+    def test_views_are_buffered_then_rolled_up(self):
+        for _ in range(3):
+            profile_view_buffer.add(self.job_seeker.id, self.employer.id)
+        self.assertEqual(ProfileView.objects.count(), 0)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(profile_view_buffer.flush(), 3)
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "myapp_profileview"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(ProfileView.objects.count(), 3)
+        daily = ProfileViewDaily.objects.get(job_seeker=self.job_seeker, employer=self.employer)
+        self.assertEqual(daily.count, 3)
+
+        profile_view_buffer.add(self.job_seeker.id, self.employer.id)
+        profile_view_buffer.flush()
+        daily.refresh_from_db()
+        self.assertEqual(daily.count, 4)
+
+    def test_prune_keeps_rollups(self):
+        old = timezone.now() - timedelta(days=120)
+        profile_view_buffer.add(self.job_seeker.id, self.employer.id, viewed_at=old)
+        profile_view_buffer.add(self.job_seeker.id, self.employer.id)
+        profile_view_buffer.flush()
+        self.assertEqual(prune_profile_views(90), 1)
+        self.assertEqual(ProfileView.objects.count(), 1)
+        self.assertEqual(sum(ProfileViewDaily.objects.values_list('count', flat=True)), 2)
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        employer_user = User.objects.create_user(email="ret@example.com", password="testpassword123", username="ret")
+        self.employer = Employer.objects.create(user=employer_user, company_name="Retention Co")
+        seeker = JobSeeker.objects.create(user=User.objects.create_user(
+            email="keep@example.com", password="testpassword123", username="keep"))
+        category = Category.objects.create(name="Sales")
+        today = timezone.now().date()
+
+        def make_job(deadline):
+            return Job.objects.create(
+                title="Retention Job", description="d", requirements="r", location="l", job_type="full_time",
+                category=category, employer=self.employer, application_deadline=deadline,
+            )
+
+        open_job = make_job(today + timedelta(days=10))
+        expired_job = make_job(today - timedelta(days=60))
+        SavedJob.objects.create(job=open_job, job_seeker=seeker)
+        SavedJob.objects.create(job=expired_job, job_seeker=seeker)
+
+        application = JobApplication.objects.create(job=open_job, job_seeker=seeker, cover_letter="c")
+        old = timezone.now() - timedelta(days=120)
+        for is_read in (True, True, True, False):
+            notification = ApplicationNotification.objects.create(
+                employer=self.employer, job_application=application, is_read=is_read)
+            ApplicationNotification.objects.filter(pk=notification.pk).update(created_at=old)
+        ApplicationNotification.objects.create(employer=self.employer, job_application=application, is_read=True)
+
+    def test_purge_deletes_in_chunks_and_respects_filters(self):
+        out = StringIO()
+        call_command('purge_retention', chunk_size=2, sleep=0, stdout=out)
+        self.assertIn('read_notifications: purged 3 rows', out.getvalue())
+        self.assertEqual(ApplicationNotification.objects.count(), 2)
+        self.assertFalse(ApplicationNotification.objects.filter(is_read=True, created_at__lt=timezone.now() - timedelta(days=90)).exists())
+        self.assertEqual(SavedJob.objects.count(), 1)
+
+    def test_dry_run_only_counts(self):
+        out = StringIO()
+        call_command('purge_retention', policy=['read_notifications'], dry_run=True, stdout=out)
+        self.assertIn('read_notifications: 3 rows', out.getvalue())
+        self.assertEqual(ApplicationNotification.objects.count(), 5)
+
+
+class JobArchivalTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        user = User.objects.create_user(email="arch@example.com", password="testpassword123", username="arch")
+        self.client.login(email="arch@example.com", password="testpassword123")
+        self.employer = Employer.objects.create(user=user, company_name="Archive Co")
+        category = Category.objects.create(name="Design")
+        today = timezone.now().date()
+
+        def make_job(title, deadline):
+            return Job.objects.create(
+                title=title, description="d", requirements="r", location="l", job_type="full_time",
+                category=category, employer=self.employer, application_deadline=deadline,
+            )
+
+        self.open_job = make_job("Open Posting", today + timedelta(days=5))
+        self.expired_job = make_job("Expired Posting", today - timedelta(days=5))
+
+    def test_archive_command_flags_expired_jobs(self):
+        call_command('archive_expired_jobs', stdout=StringIO())
+        self.assertFalse(Job.objects.get(pk=self.expired_job.pk).is_active)
+        self.assertEqual(list(Job.objects.live()), [self.open_job])
+
+    def test_archived_jobs_leave_listings_but_stay_visible_to_employer(self):
+        call_command('archive_expired_jobs', stdout=StringIO())
+        response = self.client.get(reverse('job_list'))
+        self.assertNotContains(response, "Expired Posting")
+        response = self.client.get(reverse('archived_jobs'))
+        self.assertContains(response, "Expired Posting")
+        self.assertNotContains(response, "Open Posting")
+
+
+class OpenJobsIndexTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="idx@example.com", password="testpassword123", username="idx")
+        self.client.login(email="idx@example.com", password="testpassword123")
+        self.employer = Employer.objects.create(user=user, company_name="Index Co")
+        self.it = Category.objects.create(name="IT & Software")
+        self.sales = Category.objects.create(name="Sales")
+        today = timezone.now().date()
+        self.jobs = [
+            self._job("Python Developer", self.it, "full_time", today + timedelta(days=5)),
+            self._job("Sales Lead", self.sales, "remote", today + timedelta(days=5)),
+            self._job("Senior Python Engineer", self.it, "remote", today + timedelta(days=5)),
+            self._job("Expired Python Role", self.it, "remote", today - timedelta(days=1)),
+        ]
+        self.index = job_index.OpenJobsIndex()
+        self.index.build()
+        self.addCleanup(setattr, job_index.open_jobs_index, 'built', False)
+
+    def _job(self, title, category, job_type, deadline):
+        return Job.objects.create(
+            title=title, description="d", requirements="r", location="l", job_type=job_type,
+            category=category, employer=self.employer, application_deadline=deadline,
+        )
+
+    def _search_both_paths(self, **filters):
+        results = self.index.search(**filters)
+        numpy_module = job_index.np
+        job_index.np = None
+        try:
+            self.assertEqual(self.index.search(**filters), results)
+        finally:
+            job_index.np = numpy_module
+        return results
+
+    def test_filters_and_sorts_newest_first(self):
+        python_dev, sales, senior, expired = [job.id for job in self.jobs]
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self._search_both_paths(), [senior, sales, python_dev])
+        self.assertEqual(self._search_both_paths(q="python"), [senior, python_dev])
+        self.assertEqual(self._search_both_paths(category_id=self.it.id, job_type="remote"), [senior])
+
+    def test_incremental_updates_and_version_check(self):
+        self.jobs[1].is_active = False
+        self.index.upsert(self.jobs[1])
+        self.assertNotIn(self.jobs[1].id, self.index.search())
+        self.index.remove(self.jobs[0].id)
+        self.assertEqual(self.index.search(), [self.jobs[2].id])
+
+        # A bulk change from "another process" is picked up by the version check
+        Job.objects.filter(pk=self.jobs[2].pk).update(title="Renamed", updated_at=timezone.now())
+        self.index.checked_at = 0
+        with override_settings(JOB_READ_MODEL_CHECK_INTERVAL=0):
+            self.index.ensure_fresh()
+        self.assertEqual(self.index.search(q="renamed"), [self.jobs[2].id])
+
+    def test_query_matches_company_and_location(self):
+        python_dev, sales, senior, expired = self.jobs
+        sales.location = "Berlin"
+        sales.save()
+        self.index.upsert(sales)
+        self.assertEqual(self._search_both_paths(q="berlin"), [sales.id])
+        self.assertEqual(self._search_both_paths(q="index co"), [senior.id, sales.id, python_dev.id])
+        # Suggestions of every type lead to results on the database path too
+        self.assertEqual([job.id for job in search.search_jobs("berlin")], [sales.id])
+        self.assertEqual([job.id for job in search.search_jobs("index co")], [senior.id, sales.id, python_dev.id])
+
+    def test_bulk_deactivation_changes_version(self):
+        version = job_index.current_version()
+        Job.objects.filter(pk=self.jobs[0].pk).update(is_active=False)
+        self.assertNotEqual(job_index.current_version(), version)
+
+    def test_admin_actions_touch_jobs_and_invalidate_search_cache(self):
+        job_admin = JobAdmin(Job, django_admin.site)
+        before = Job.objects.get(pk=self.jobs[0].pk).updated_at
+        with mock.patch('myapp.admin.invalidate_search_cache') as invalidate, \
+                mock.patch.object(job_admin, 'message_user'):
+            job_admin.deactivate_jobs(None, Job.objects.filter(pk=self.jobs[0].pk))
+        invalidate.assert_called_once_with()
+        job = Job.objects.get(pk=self.jobs[0].pk)
+        self.assertFalse(job.is_active)
+        self.assertGreater(job.updated_at, before)
+
+    def test_job_list_served_from_read_model(self):
+        with override_settings(JOB_READ_MODEL_ENABLED=True):
+            response = self.client.get(reverse('job_list'), {'q': 'python', 'category': self.it.id})
+        self.assertEqual([job.id for job in response.context['jobs']], [self.jobs[2].id, self.jobs[0].id])
+        self.assertContains(response, "2 Jobs Found")
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="ac@example.com", password="testpassword123", username="ac")
+        self.employer = Employer.objects.create(user=user, company_name="Acme Analytics")
+        self.category = Category.objects.create(name="IT & Software")
+        deadline = timezone.now().date() + timedelta(days=5)
+        self.jobs = [
+            Job.objects.create(
+                title=title, description="d", requirements="r", location=location, job_type="full_time",
+                category=self.category, employer=self.employer, application_deadline=deadline,
+            )
+            for title, location in [
+                ("Python Developer", "Pune"), ("Python Developer", "Paris"), ("Senior Python Engineer", "Pune"),
+            ]
+        ]
+        self.addCleanup(setattr, prefix_index, 'built', False)
+
+    def test_suggestions_ranked_by_open_jobs(self):
+        index = PrefixIndex()
+        index.build()
+        # Ties are broken alphabetically
+        self.assertEqual(index.suggest("p", 3), [
+            {'text': "Pune", 'type': 'location', 'jobs': 2},
+            {'text': "Python Developer", 'type': 'title', 'jobs': 2},
+            {'text': "Paris", 'type': 'location', 'jobs': 1},
+        ])
+        # Later words of a value match too
+        self.assertEqual([s['text'] for s in index.suggest("analy")], ["Acme Analytics"])
+        self.assertEqual(index.suggest("zzz"), [])
+
+    def test_incremental_updates(self):
+        index = PrefixIndex()
+        index.build()
+        index.upsert(self.jobs[2].id, ())
+        self.assertEqual([s['text'] for s in index.suggest("senior")], [])
+        index.upsert(self.jobs[2].id, (('title', "Staff Engineer"),))
+        self.assertEqual([s['text'] for s in index.suggest("eng")], ["Staff Engineer"])
+        self.assertEqual(index.suggest("pu")[0]['jobs'], 1)
+
+    def test_precomputed_top_lists_match_a_full_scan(self):
+        index = PrefixIndex()
+        index.build()
+        rng = random.Random(7)
+        words = ["data", "dev", "devops", "design", "director", "driver", "sales", "senior"]
+        jobs = {}
+        for job_id in range(1000, 1600):
+            jobs[job_id] = (('title', f"{rng.choice(words)} {rng.choice(words)} {rng.randrange(40)}"),)
+            index.upsert(job_id, jobs[job_id])
+        for job_id in rng.sample(sorted(jobs), 300):
+            if rng.random() < 0.5:
+                del jobs[job_id]
+                index.remove(job_id)
+            else:
+                jobs[job_id] = (('title', f"{rng.choice(words)} {rng.randrange(40)}"),)
+                index.upsert(job_id, jobs[job_id])
+        self.assertIn("d", index.top)
+
+        counts = {}
+        for terms in list(jobs.values()) + [
+            (('title', t), ('company', "Acme Analytics"), ('location', l)) for t, l in
+            [("Python Developer", "Pune"), ("Python Developer", "Paris"), ("Senior Python Engineer", "Pune")]
+        ]:
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+        for prefix in ("d", "de", "dev", "s", "senior", "data d", "p"):
+            # Any word of a term, and everything after it, can match
+            matching = [
+                (kind, text) for kind, text in counts
+                if any(text.lower()[i:].startswith(prefix) for i in range(len(text)) if i == 0 or text[i - 1] == ' ')
+            ]
+            expected = sorted(matching, key=lambda term: (-counts[term], term[1]))[:20]
+            self.assertEqual(
+                [(s['type'], s['text'], s['jobs']) for s in index.suggest(prefix, 20)],
+                [(kind, text, counts[(kind, text)]) for kind, text in expected],
+                prefix,
+            )
+
+    def test_endpoint_follows_job_saves(self):
+        response = self.client.get(reverse('autocomplete'), {'q': 'pyth'})
+        self.assertEqual(response.json()['suggestions'][0], {'text': "Python Developer", 'type': 'title', 'jobs': 2})
+        self.jobs[0].is_active = False
+        self.jobs[0].save()
+        response = self.client.get(reverse('autocomplete'), {'q': 'pyth', 'limit': 1})
+        self.assertEqual(response.json()['suggestions'], [{'text': "Python Developer", 'type': 'title', 'jobs': 1}])
+        self.assertEqual(self.client.get(reverse('autocomplete')).json(), {'suggestions': []})
+
+
+class SavedJobTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="saver@example.com", password="testpassword123", username="saver")
+        self.client.login(email="saver@example.com", password="testpassword123")
+        self.job_seeker = JobSeeker.objects.create(user=user)
+        employer = Employer.objects.create(user=user, company_name="Save Co")
+        category = Category.objects.create(name="IT & Software")
+        deadline = timezone.now().date() + timedelta(days=5)
+        self.jobs = [
+            Job.objects.create(
+                title=f"Job {i}", description="d", requirements="r", location="l", job_type="full_time",
+                category=category, employer=employer, application_deadline=deadline,
+            )
+            for i in range(4)
+        ]
+
+    def test_save_and_unsave_are_idempotent(self):
+        url = reverse('save_job', args=[self.jobs[0].id])
+        self.client.post(url)
+        response = self.client.post(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.json(), {'job_id': self.jobs[0].id, 'saved': True})
+        self.assertEqual(SavedJob.objects.filter(job_seeker=self.job_seeker).count(), 1)
+
+        unsave_url = reverse('unsave_job', args=[self.jobs[0].id])
+        response = self.client.post(unsave_url, {'next': 'https://evil.example.com/'})
+        self.assertRedirects(response, reverse('job_list'), fetch_redirect_response=False)
+        self.client.post(unsave_url)
+        self.assertFalse(SavedJob.objects.exists())
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+    def test_job_list_resolves_saved_flags_in_one_query(self):
+        SavedJob.objects.create(job=self.jobs[1], job_seeker=self.job_seeker)
+        SavedJob.objects.create(job=self.jobs[3], job_seeker=self.job_seeker)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('job_list'))
+        self.assertEqual(response.context['saved_job_ids'], {self.jobs[1].id, self.jobs[3].id})
+        saved_queries = [q for q in queries.captured_queries if 'myapp_savedjob' in q['sql']]
+        self.assertEqual(len(saved_queries), 1)
+        self.assertContains(response, f'action="{reverse("unsave_job", args=[self.jobs[1].id])}"')
+        self.assertNotContains(response, f'action="{reverse("unsave_job", args=[self.jobs[0].id])}"')
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        settings_override = override_settings(SITEMAP_ROOT=self.root, SITE_URL="https://jobs.example.com")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        user = User.objects.create_user(email="map@example.com", password="testpassword123", username="map")
+        employer = Employer.objects.create(user=user, company_name="Map & Co")
+        category = Category.objects.create(name="IT & Software")
+        deadline = timezone.now().date() + timedelta(days=5)
+        self.jobs = [
+            Job.objects.create(
+                title=f"Job {i}", description="d", requirements="r", location="Pune", job_type="remote",
+                category=category, employer=employer, application_deadline=deadline,
+            )
+            for i in range(5)
+        ]
+        # Two ids per shard puts the five consecutive ids into three shards
+        patcher = mock.patch.object(sitemaps, 'SHARD_SIZE', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.shard = lambda job: job.id // 2
+
+    def _read(self, name):
+        with open(os.path.join(self.root, name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_writes_index_shards_and_feed(self):
+        result = sitemaps.generate()
+        self.assertEqual(len(result['written']), 3)
+        index = self._read('sitemap.xml')
+        self.assertEqual(index.count('<sitemap>'), 3)
+        self.assertIn("https://jobs.example.com/sitemaps/sitemap-jobs-", index)
+
+        shard = self.shard(self.jobs[0])
+        urlset = self._read(sitemaps.sitemap_name(shard))
+        self.assertIn(f"<loc>https://jobs.example.com{reverse('job_detail', args=[self.jobs[0].id])}</loc>", urlset)
+        feed = json.loads(self._read(sitemaps.feed_name(shard)))
+        posting = next(p for p in feed['@graph'] if p['identifier'] == self.jobs[0].id)
+        self.assertEqual(posting['hiringOrganization']['name'], "Map & Co")
+        self.assertEqual(posting['jobLocationType'], 'TELECOMMUTE')
+
+        # Last-Modified comes from the newest updated_at in the shard
+        mtime = os.path.getmtime(os.path.join(self.root, sitemaps.sitemap_name(shard)))
+        newest = max(job.updated_at for job in self.jobs if self.shard(job) == shard)
+        self.assertAlmostEqual(mtime, newest.timestamp(), places=3)
+
+    def test_only_changed_shards_are_rewritten(self):
+        sitemaps.generate()
+        changed = self.jobs[-1]
+        changed.title = "Renamed"
+        changed.save()
+        result = sitemaps.generate()
+        self.assertEqual(result['written'], [self.shard(changed)])
+        self.assertEqual(len(result['unchanged']), 2)
+
+        # A shard whose jobs are all archived is removed
+        last_shard = self.shard(changed)
+        Job.objects.filter(pk__in=[job.pk for job in self.jobs if self.shard(job) == last_shard]).update(is_active=False)
+        result = sitemaps.generate()
+        self.assertEqual(result['removed'], [last_shard])
+        self.assertFalse(os.path.exists(os.path.join(self.root, sitemaps.sitemap_name(last_shard))))
+        self.assertEqual(self._read('sitemap.xml').count('<sitemap>'), 2)
+
+    def test_served_with_conditional_get(self):
+        call_command('generate_sitemaps', stdout=StringIO())
+        response = self.client.get(reverse('sitemap'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        response = self.client.get(reverse('sitemap'), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get(reverse('sitemap_file', args=['manifest.json'])).status_code, 404)
+
+
+class LoginAdmissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        User.objects.create_user(email="gate@example.com", password="testpassword123", username="gate")
+
+    def _login(self, email="gate@example.com", password="wrong", ip="10.0.0.1"):
+        return self.client.post(reverse('login'), {'username': email, 'password': password}, REMOTE_ADDR=ip)
+
+    @override_settings(AUTH_ACCOUNT_BURST=2, AUTH_IP_BURST=100)
+    def test_account_bucket_rejects_with_429(self):
+        self.assertEqual(self._login(ip="10.0.0.1").status_code, 200)
+        self.assertEqual(self._login(ip="10.0.0.2").status_code, 200)
+        # The account is throttled whichever address the attempts come from
+        response = self._login(ip="10.0.0.3")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self._login(email="other@example.com", ip="10.0.0.3").status_code, 200)
+        self.assertGreaterEqual(admission.metrics.snapshot()['rejected_account'], 1)
+
+    @override_settings(AUTH_IP_BURST=1)
+    def test_ip_bucket_and_successful_login(self):
+        response = self._login(password="testpassword123")
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+        self.assertEqual(self._login(email="other@example.com").status_code, 429)
+        # Page views are never throttled
+        self.assertEqual(self.client.get(reverse('login'), REMOTE_ADDR="10.0.0.1").status_code, 200)
+
+    def test_rejects_when_hashing_slots_are_busy(self):
+        slots = admission.hashing_slots()
+        held = 0
+        while slots.acquire(blocking=False):
+            held += 1
+        try:
+            with override_settings(AUTH_HASH_WAIT=0):
+                self.assertEqual(self._login().status_code, 429)
+        finally:
+            for _ in range(held):
+                slots.release()
+        self.assertEqual(self._login().status_code, 200)
+
+    def test_token_bucket_refills(self):
+        bucket = admission.TokenBucket('test', burst=1, per_minute=60)
+        self.assertEqual(bucket.take('k', now=1000.0), 0)
+        self.assertAlmostEqual(bucket.take('k', now=1000.5), 0.5)
+        self.assertEqual(bucket.take('k', now=1001.0), 0)
+
+
+class MetricsTests(TestCase):
+    def test_records_request_latency_queries_and_status(self):
+        # Streamed responses count as in flight until closed, which the test client skips for unread bodies
+        in_flight = metrics.registry.snapshot()['in_flight']
+        self.client.get(reverse('about'))
+        self.client.get('/no-such-page/')
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="about",le="+Inf"}', body)
+        self.assertRegex(body, r'http_requests_total\{view="about",method="GET",status="200"\} [1-9]')
+        self.assertIn('http_requests_total{view="unresolved",method="GET",status="404"}', body)
+        self.assertIn('db_queries_total{view="about"}', body)
+        self.assertIn(f'http_requests_in_flight {in_flight + 1}', body)
+
+    def test_cache_hits_and_misses(self):
+        before = metrics.registry.snapshot()['counters']
+        cache.set('metrics-test', 1)
+        cache.get('metrics-test')
+        cache.get('metrics-test-missing')
+        after = metrics.registry.snapshot()['counters']
+        for result in ('hit', 'miss'):
+            key = ('cache_requests_total', (('result', result),))
+            self.assertEqual(after[key] - before.get(key, 0), 1)
+
+    def test_only_allowed_addresses(self):
+        with override_settings(METRICS_ALLOWED_IPS=[]):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+
+    def test_merges_worker_files(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        # An exited worker: its counters still count, its in-flight gauge does not
+        with open(os.path.join(directory, 'metrics-999999999.json'), 'w') as f:
+            json.dump({
+                'pid': 999999999,
+                'counters': [['http_requests_total', [['view', 'job_list'], ['method', 'GET'], ['status', '200']], 40]],
+                'histograms': [['http_request_duration_seconds', [['view', 'job_list']], [40] + [0] * 11 + [0.4]]],
+                'in_flight': 3,
+            }, f)
+        with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+            snapshot = metrics.merged_snapshot()
+        self.assertTrue(os.path.exists(os.path.join(directory, f'metrics-{os.getpid()}.json')))
+        key = ('http_requests_total', (('view', 'job_list'), ('method', 'GET'), ('status', '200')))
+        self.assertGreaterEqual(snapshot['counters'][key], 40)
+        self.assertLess(snapshot['in_flight'], 3)
+        self.assertIn('http_request_duration_seconds_count{view="job_list"}', metrics.render(snapshot))
+        # The exited worker's file was folded into the aggregate, which later scrapes still count
+        self.assertEqual(sorted(n for n in os.listdir(directory) if n.endswith('.json')),
+                         sorted([f'metrics-{os.getpid()}.json', metrics.EXITED_FILE]))
+        with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+            self.assertEqual(metrics.merged_snapshot()['counters'][key], snapshot['counters'][key])
+
+    def test_reused_pid_keeps_previous_workers_counts(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        key = ['http_requests_total', [['view', 'about'], ['method', 'GET'], ['status', '200']]]
+        with open(os.path.join(directory, f'metrics-{os.getpid()}.json'), 'w') as f:
+            json.dump({'pid': os.getpid(), 'counters': [key + [1000]], 'histograms': [], 'in_flight': 0}, f)
+        registry = metrics.Registry()
+        with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+            registry.flush()
+        with open(os.path.join(directory, metrics.EXITED_FILE)) as f:
+            self.assertEqual(json.load(f)['counters'], [key + [1000]])
+
+    def test_shards_of_exited_threads_are_folded(self):
+        registry = metrics.Registry()
+
+        def handle_request():
+            registry.inc('http_requests_total', (('view', 'about'),))
+            registry.observe('http_request_duration_seconds', (('view', 'about'),), 0.02)
+
+        for _ in range(50):
+            thread = threading.Thread(target=handle_request)
+            thread.start()
+            thread.join()
+        snapshot = registry.snapshot()
+        self.assertEqual(registry._shards, [])
+        self.assertEqual(snapshot['counters'][('http_requests_total', (('view', 'about'),))], 50)
+        self.assertEqual(snapshot['histograms'][('http_request_duration_seconds', (('view', 'about'),))][2], 50)
+
+
+class RequestProfilerTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        settings_override = override_settings(PROFILER_DIR=self.directory, PROFILER_INTERVAL=0.001)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.staff = User.objects.create_user(email="ops@example.com", password="testpassword123", username="ops", is_staff=True)
+        self.client.login(email="ops@example.com", password="testpassword123")
+
+    def test_staff_header_profiles_request(self):
+        response = self.client.get(reverse('about'), HTTP_X_PROFILE='1')
+        name = response['X-Profile-Id']
+        self.assertRegex(name, r'_about_\d+ms_header\.collapsed$')
+        listing = self.client.get(reverse('request_profiles'), {'view': 'about'})
+        self.assertEqual([p['name'] for p in listing.context['profiles']], [name])
+        download = self.client.get(reverse('download_profile', args=[name]))
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(self.client.get(reverse('download_profile', args=['settings.py'])).status_code, 404)
+
+    def test_header_ignored_for_other_users_and_slow_threshold(self):
+        User.objects.create_user(email="plain@example.com", password="testpassword123", username="plain")
+        self.client.login(email="plain@example.com", password="testpassword123")
+        self.assertNotIn('X-Profile-Id', self.client.get(reverse('about'), HTTP_X_PROFILE='1'))
+        with override_settings(PROFILER_SLOW_THRESHOLD_MS=60000):
+            self.client.get(reverse('about'))
+        self.assertEqual(profiling.recent_profiles(), [])
+        with override_settings(PROFILER_SAMPLE_RATE=1.0, PROFILER_FORMAT='speedscope'):
+            self.client.get(reverse('about'))
+        [profile] = profiling.recent_profiles()
+        self.assertEqual((profile['trigger'], profile['format']), ('sampled', 'speedscope'))
+        self.assertEqual(self.client.get(reverse('request_profiles')).status_code, 302)
+
+    def test_failed_save_does_not_fail_the_request(self):
+        with mock.patch.object(profiling, 'save_profile', side_effect=RuntimeError("boom")), \
+                self.assertLogs('myapp.profiling', 'ERROR') as logs:
+            response = self.client.get(reverse('about'), HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertIn("Failed to save request profile: boom", logs.output[0])
+
+    def test_stopped_profile_is_not_sampled(self):
+        sampler = profiling.Sampler()
+        profile = sampler.start(threading.get_ident())
+        self.addCleanup(sampler.stop, threading.get_ident())
+        with override_settings(PROFILER_INTERVAL=0.001):
+            deadline = time.monotonic() + 5
+            while not profile.stacks and time.monotonic() < deadline:
+                time.sleep(0.001)
+            self.assertIs(sampler.stop(threading.get_ident()), profile)
+            frozen = Counter(profile.stacks)
+            time.sleep(0.02)
+        self.assertEqual(profile.stacks, frozen)
+
+    def test_collapsed_stacks(self):
+        profile = profiling.RequestProfile()
+        profile.add(sys._getframe())
+        profile.add(sys._getframe())
+        line = profiling._collapsed(profile).strip()
+        self.assertTrue(line.endswith(' 2'))
+        self.assertIn(';test_collapsed_stacks (tests.py:', line)
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(email="zip@example.com", password="testpassword123", username="zip")
+        self.client.login(email="zip@example.com", password="testpassword123")
+
+    def test_gzips_html_and_sets_vary(self):
+        plain = self.client.get(reverse('about'))
+        response = self.client.get(reverse('about'), HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertNotIn('Content-Encoding', plain)
+
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 6)
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(reverse('about'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_choose_encoding(self):
+        self.assertEqual(compression.choose_encoding('gzip;q=0, identity'), None)
+        self.assertEqual(compression.choose_encoding('deflate, gzip;q=0.5'), 'gzip')
+        with mock.patch.object(compression, 'brotli', object()):
+            self.assertEqual(compression.choose_encoding('gzip, br'), 'br')
+        with mock.patch.object(compression, 'brotli', None):
+            self.assertEqual(compression.choose_encoding('br'), None)
+
+    def test_streamed_dashboard_matches_buffered_render_and_compresses(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        # The head goes out before the content block has rendered
+        self.assertGreater(len(chunks), 1)
+        self.assertIn(b'</head>', chunks[0])
+        self.assertIn(b'</html>', chunks[-1])
+        self.assertIn('csrftoken', response.cookies)
+
+        response = self.client.get(reverse('dashboard'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response)
+        self.assertIn(b'</html>', gzip.decompress(b''.join(response.streaming_content)))
+
+    def test_debug_renders_before_sending(self):
+        streamed = b''.join(self.client.get(reverse('dashboard')).streaming_content)
+        with override_settings(DEBUG=True):
+            response = self.client.get(reverse('dashboard'))
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content.count(b'</html>'), streamed.count(b'</html>'))
+
+        # A template error reaches the debug page instead of truncating a page already under way
+        with override_settings(DEBUG=True), mock.patch('myapp.streaming.iter_template', side_effect=AssertionError), \
+                mock.patch('myapp.streaming.render', side_effect=ValueError("bad template")):
+            with self.assertLogs('django.request', 'ERROR') as logs:
+                with self.assertRaisesMessage(ValueError, "bad template"):
+                    self.client.get(reverse('dashboard'))
+        self.assertIn("ValueError: bad template", logs.output[0])
+
+    def test_streamed_render_is_measured(self):
+        key = ('db_queries_total', (('view', 'dashboard'),))
+        requests_key = ('http_requests_total', (('view', 'dashboard'), ('method', 'GET'), ('status', '200')))
+        before = metrics.registry.snapshot()['counters']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'))
+            # Nothing is recorded until the body has been sent
+            self.assertEqual(metrics.registry.snapshot()['counters'].get(requests_key, 0), before.get(requests_key, 0))
+            b''.join(response.streaming_content)
+        after = metrics.registry.snapshot()['counters']
+        self.assertEqual(after[requests_key] - before.get(requests_key, 0), 1)
+        self.assertEqual(after[key] - before.get(key, 0), len(queries.captured_queries))
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with override_settings(PROFILER_DIR=directory, PROFILER_SAMPLE_RATE=1.0):
+            response = self.client.get(reverse('dashboard'))
+            self.assertEqual(profiling.recent_profiles(), [])
+            b''.join(response.streaming_content)
+            self.assertEqual([p['view'] for p in profiling.recent_profiles()], ['dashboard'])
+
+    def test_iter_template_follows_extends_and_blocks(self):
+        from django.template.loader import render_to_string
+        from .streaming import iter_template
+        context = {'jobs': [], 'categories': [], 'saved_job_ids': set()}
+        self.assertEqual(''.join(iter_template('job_list.html', context)), render_to_string('job_list.html', context))
+
+
+class ServeCommandTests(TestCase):
+    def test_gunicorn_options(self):
+        options = server.gunicorn_options(workers=3, threads=8, max_memory_mb=512)
+        self.assertEqual(options['workers'], 3)
+        self.assertTrue(options['preload_app'])
+        self.assertEqual((options['worker_class'], options['threads']), ('gthread', 8))
+        self.assertIn('post_request', options)
+        # Connections opened by post_worker_init would belong to the main thread, which serves no gthread requests
+        self.assertNotIn('post_worker_init', options)
+        self.assertIs(server.gunicorn_options(threads=1)['post_worker_init'], server.connect_worker)
+        asgi = server.gunicorn_options(asgi=True, max_memory_mb=512)
+        self.assertEqual(asgi['worker_class'], 'uvicorn.workers.UvicornWorker')
+        self.assertNotIn('post_request', asgi)
+        self.assertNotIn('post_worker_init', asgi)
+        self.assertGreaterEqual(asgi['workers'], 1)
+
+    def test_memory_recycler_retires_worker(self):
+        worker = mock.Mock(alive=True, pid=123)
+        server.memory_recycler(max_memory_mb=10 ** 6)(worker, None, {}, None)
+        self.assertTrue(worker.alive)
+        with self.assertLogs('myapp.server', 'WARNING') as logs:
+            server.memory_recycler(max_memory_mb=1)(worker, None, {}, None)
+        self.assertFalse(worker.alive)
+        self.assertRegex(logs.output[0], r'Worker 123 uses \d+ MB; restarting it')
+        self.assertGreater(server.rss_bytes(), 0)
+
+    def test_requires_gunicorn(self):
+        with mock.patch('importlib.util.find_spec', return_value=None):
+            with self.assertRaisesMessage(CommandError, "gunicorn"):
+                call_command('serve')
+
+
+class WarmBootTests(TestCase):
+    def test_warm_boot_preloads_templates_urls_and_connections(self):
+        self.assertNotIn('connections', warmup.warm_boot())
+        timings = warmup.warm_boot(connect=True)
+        self.assertEqual(timings['templates'][0], len(warmup.project_templates()))
+        self.assertIn('partials/application_history.html', warmup.project_templates())
+        self.assertGreater(timings['urls'][0], 10)
+        self.assertIsNotNone(connection.connection)
+
+    def test_profile_startup_reports_imports_and_views(self):
+        out = StringIO()
+        call_command('profile_startup', '--top', '3', stdout=out)
+        report = out.getvalue()
+        self.assertRegex(report, r'Import time: \d+ ms in \d+ modules')
+        self.assertIn('django', report)
+        self.assertIn('First and second request per view', report)
+
+
+class TemplateRenderTests(TestCase):
+    def test_signup_fields_are_styled_once_per_class(self):
+        from django.contrib.auth.forms import UserCreationForm
+        from .forms import CustomUserCreationForm
+        html = str(CustomUserCreationForm()['password1'])
+        self.assertIn('class="form-control"', html)
+        self.assertIn('aria-describedby="id_password1_help"', html)
+        self.assertIn('placeholder="Password"', html)
+        # The parent form's declared fields are not touched
+        self.assertNotIn('class', UserCreationForm.base_fields['password1'].widget.attrs)
+
+    def test_filters_do_not_mutate_widget_attrs(self):
+        from .forms import CombinedProfileForm
+        form = CombinedProfileForm()
+        template = Template(
+            '{% load custom_filters %}{{ form.phone|add_class:"is-invalid"|attr:"aria-describedby:phone_help" }}'
+        )
+        for i in range(2):
+            html = template.render(Context({'form': form}))
+            self.assertIn('class="form-control profile-input is-invalid"', html)
+            self.assertIn('aria-describedby="phone_help"', html)
+        self.assertEqual(form.fields['phone'].widget.attrs['class'], 'form-control profile-input')
+
+    def test_benchmark_reports_templates_tags_and_filters(self):
+        user = User.objects.create_user(email="bench@example.com", password="testpassword123", username="bench")
+        employer = Employer.objects.create(user=user, company_name="Bench Co")
+        Job.objects.create(
+            employer=employer, category=Category.objects.create(name="Ops"),
+            title="Profiler", description="d", requirements="r", location="Remote",
+            job_type="full_time", salary="1000", application_deadline=timezone.now().date() + timedelta(days=10),
+        )
+        out = StringIO()
+        call_command('benchmark_templates', '--user', 'bench@example.com', '--iterations', '2', stdout=out)
+        report = out.getvalue()
+        self.assertIn('dashboard.html', report)
+        self.assertIn('dasbord_professional_final.html', report)
+        self.assertIn('{% for %}', report)
+        self.assertIn('|default', report)
+        # The site's own compiled templates are left uninstrumented
+        self.assertNotIn('wrapper', repr(Template('{{ x|date }}').nodelist[0].filter_expression.filters))
+
+
+class DuplicateJobTests(TestCase):
+    DESCRIPTION = (
+        "We are hiring a backend engineer to build and operate our payments platform. "
+        "You will design APIs, review code, mentor junior developers and keep services reliable."
+    )
+    REQUIREMENTS = "Five years of Python and Django, PostgreSQL, Redis and experience with cloud deployments."
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="agency@example.com", password="testpassword123", username="agency")
+        self.client.force_login(self.user)
+        self.employer = Employer.objects.create(user=self.user, company_name="Agency")
+        self.category = Category.objects.create(name="IT & Software")
+
+    def create_job(self, title, description=DESCRIPTION, employer=None):
+        return Job.objects.create(
+            title=title, description=description, requirements=self.REQUIREMENTS, location="Remote",
+            job_type="full_time", category=self.category, employer=employer or self.employer,
+            application_deadline=timezone.now().date() + timedelta(days=10),
+        )
+
+    def post_data(self, **extra):
+        return {
+            'title': "Backend Engineer", 'company': "Agency", 'location': "Remote", 'job_type': "full_time", 'salary': "",
+            'category': "it", 'deadline': (timezone.now().date() + timedelta(days=5)).isoformat(),
+            'description': self.DESCRIPTION + " Apply today!", 'requirements': self.REQUIREMENTS, **extra,
+        }
+
+    def test_signature_is_the_same_without_numpy(self):
+        from . import dedupe
+        text = self.DESCRIPTION + self.REQUIREMENTS
+        with_numpy = dedupe.signature(text)
+        with mock.patch.object(dedupe, 'np', None):
+            self.assertEqual(dedupe.signature(text), with_numpy)
+        self.assertEqual(len(dedupe.band_keys(with_numpy)), dedupe.BANDS)
+        self.assertGreater(dedupe.similarity(with_numpy, dedupe.signature(text + " Apply today!")), 0.8)
+        self.assertLess(dedupe.similarity(with_numpy, dedupe.signature("Nurse for night shifts in a clinic")), 0.2)
+
+    def test_post_job_asks_before_posting_a_near_duplicate(self):
+        original = self.create_job("Backend Engineer")
+        self.assertEqual(original.lsh_buckets.count(), 16)
+
+        response = self.client.post(reverse('post_job'), self.post_data())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['duplicate'], original)
+        self.assertContains(response, 'name="confirm_duplicate"')
+        self.assertContains(response, 'value="Backend Engineer"')
+        self.assertEqual(Job.objects.count(), 1)
+
+        response = self.client.post(reverse('post_job'), self.post_data(confirm_duplicate='1'))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_dedupe_command_archives_newer_copies(self):
+        original = self.create_job("Backend Engineer")
+        copy = self.create_job("Backend Engineer", description=self.DESCRIPTION + " Apply today!")
+        other = self.create_job("Nurse", description="Night shifts in a busy clinic, caring for patients.")
+        other_user = User.objects.create_user(email="rival@example.com", password="testpassword123", username="rival")
+        rival_copy = self.create_job("Backend Engineer", employer=Employer.objects.create(user=other_user, company_name="Rival"))
+        # Jobs inserted without signals are indexed by the command
+        Job.objects.filter(pk=copy.pk).update(minhash=None)
+
+        out = StringIO()
+        call_command('dedupe_jobs', stdout=out)
+        self.assertIn("Indexed 1 jobs", out.getvalue())
+        self.assertEqual(
+            list(Job.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)),
+            [original.pk, other.pk, rival_copy.pk],
+        )
+
+        call_command('dedupe_jobs', '--across-employers', '--delete', stdout=StringIO())
+        self.assertFalse(Job.objects.filter(pk=rival_copy.pk).exists())
+        self.assertTrue(Job.objects.filter(pk=original.pk, is_active=True).exists())
+
+    def test_chained_postings_are_only_removed_when_similar_to_the_kept_one(self):
+        from . import dedupe
+        words = [f"skill{i}" for i in range(320)]
+        first, middle, last = [
+            self.create_job("Engineer", description=' '.join(words[shift:shift + 300])) for shift in (0, 10, 20)
+        ]
+        sig = {job.pk: bytes(Job.objects.get(pk=job.pk).minhash) for job in (first, middle, last)}
+        linked = min(dedupe.similarity(sig[first.pk], sig[middle.pk]), dedupe.similarity(sig[middle.pk], sig[last.pk]))
+        apart = dedupe.similarity(sig[first.pk], sig[last.pk])
+        self.assertLess(apart, linked)
+        threshold = (apart + linked) / 2
+        self.assertEqual(dedupe.duplicate_groups(threshold=threshold), [(first.pk, [middle.pk])])
+
+    def test_expired_postings_are_not_duplicates(self):
+        from . import dedupe
+        original = self.create_job("Backend Engineer")
+        Job.objects.filter(pk=original.pk).update(application_deadline=timezone.now().date() - timedelta(days=1))
+        copy = self.create_job("Backend Engineer", description=self.DESCRIPTION + " Apply today!")
+        self.assertEqual(dedupe.find_duplicates(copy), [])
+        self.assertEqual(dedupe.duplicate_groups(), [])
+
+
+class SearchLogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.buffer = search.SearchLogBuffer()
+        patcher = mock.patch.object(search, 'search_log_buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = User.objects.create_user(email="hot@example.com", password="testpassword123", username="hot")
+        self.client.force_login(user)
+        self.employer = Employer.objects.create(user=user, company_name="Hot Co")
+        self.it = Category.objects.create(name="IT & Software")
+        self.python_job = self.create_job("Python Developer")
+        self.create_job("Sales Lead")
+
+    def create_job(self, title):
+        return Job.objects.create(
+            title=title, description="d", requirements="r", location="Remote", job_type="full_time",
+            category=self.it, employer=self.employer, application_deadline=timezone.now().date() + timedelta(days=5),
+        )
+
+    def search(self, **params):
+        return self.client.get(reverse('job_list'), params)
+
+    def test_searches_are_logged_in_batches_and_rolled_up(self):
+        self.search(q="  Python ")
+        self.search(q="python")
+        self.search(q="cobol", job_type="contract")
+        self.assertFalse(SearchQuery.objects.exists())
+        self.assertEqual(self.buffer.flush(), 3)
+
+        self.assertEqual(SearchQuery.objects.filter(query="python", result_count=1).count(), 2)
+        python = SearchQueryDaily.objects.get(query="python")
+        self.assertEqual((python.count, python.zero_results, python.category_id, python.job_type), (2, 0, 0, ''))
+        self.assertGreater(python.max_ms, 0)
+        cobol = SearchQueryDaily.objects.get(query="cobol")
+        self.assertEqual((cobol.count, cobol.zero_results, cobol.job_type), (1, 1, 'contract'))
+
+    def test_hot_query_first_page_is_served_from_cache(self):
+        for i in range(3):
+            self.search(q="python")
+        self.search(q="sales")
+        self.buffer.flush()
+        self.assertEqual(search.hot_queries(limit=1), [("python", 0, '')])
+        self.assertEqual(search.refresh_hot_queries(), 2)
+
+        self.search()  # caches the category list
+        with CaptureQueriesContext(connection) as queries:
+            response = self.search(q="Python")
+        # Only the session and user lookups remain
+        self.assertFalse([q for q in queries.captured_queries if '"myapp_job"' in q['sql'] or 'myapp_category' in q['sql']])
+        self.assertEqual([job.id for job in response.context['jobs']], [self.python_job.id])
+        self.assertContains(response, "Python Developer")
+        # Later pages are not cached
+        with CaptureQueriesContext(connection) as queries:
+            self.search(q="python", page=2)
+        self.assertTrue([q for q in queries.captured_queries if '"myapp_job"' in q['sql']])
+        self.buffer.flush()
+        self.assertEqual(SearchQueryDaily.objects.get(query="python").cached, 1)
+
+    def test_invalid_filters_are_rejected_before_logging(self):
+        for params in ({'job_type': 'x' * 30}, {'category': str(2 ** 40)}, {'category': '\u00b2'}, {'category': '-3'}):
+            self.assertEqual(self.search(**params).status_code, 400, params)
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_pagination_keeps_job_type(self):
+        for i in range(search.JOB_LIST_PAGE_SIZE):
+            self.create_job(f"Engineer {i}")
+        response = self.search(job_type="full_time")
+        self.assertContains(response, "?page=2&job_type=full_time")
+
+    def test_job_changes_invalidate_matching_searches(self):
+        for query in ("python", "sales"):
+            self.search(q=query)
+        self.buffer.flush()
+        search.refresh_hot_queries()
+
+        self.create_job("Java Developer")
+        self.assertIsNotNone(search.cached_first_page(("python", 0, '')))
+        self.python_job.title = "Senior Java Developer"
+        self.python_job.save()
+        # The job no longer matches "python", but it was on the cached page
+        self.assertIsNone(search.cached_first_page(("python", 0, '')))
+        self.assertIsNotNone(search.cached_first_page(("sales", 0, '')))
+
+        search.refresh_hot_queries()
+        self.assertEqual(search.cached_first_page(("python", 0, '')).count(), 0)
+        archive_jobs([self.python_job.id])
+        self.assertIsNone(search.cached_first_page(("sales", 0, '')))
+
+    def test_report_lists_frequent_zero_result_and_slow_searches(self):
+        today = timezone.localdate()
+        SearchQueryDaily.objects.create(query="python", date=today, count=10, cached=5, total_ms=100, max_ms=30)
+        SearchQueryDaily.objects.create(query="cobol", date=today, count=4, zero_results=4, total_ms=40, max_ms=12)
+        SearchQueryDaily.objects.create(query="", category_id=self.it.id, date=today, count=2, total_ms=900, max_ms=600)
+        out = StringIO()
+        call_command('search_report', '--slow-ms', '100', stdout=out)
+        report = out.getvalue()
+        self.assertIn("16 searches, 3 distinct", report)
+        frequent, zero, slow = report.split("Zero results")[0], *report.split("Zero results")[1].split("Slow")
+        self.assertRegex(frequent, r'10\s+50%\s+10\.0\s+"python"')
+        self.assertIn('"cobol"', zero)
+        self.assertNotIn('"python"', zero)
+        self.assertIn(f"450.0    600.0         2  (all jobs) category={self.it.id}", slow)
+
+
+class JobApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="api@example.com", password="testpassword123", username="api")
+        self.employer = Employer.objects.create(user=self.user, company_name="Api Co")
+        self.it = Category.objects.create(name="IT & Software")
+        self.jobs = [self.create_job(f"Engineer {i}") for i in range(5)]
+        # Equal timestamps make the id the tie-breaker of the cursor
+        Job.objects.filter(id__in=[job.id for job in self.jobs[1:4]]).update(created_at=self.jobs[1].created_at)
+        self.client.force_login(self.user)
+        # Rate-limit buckets live in the cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def create_job(self, title):
+        return Job.objects.create(
+            title=title, description="A long description", requirements="r", location="Remote", job_type="full_time",
+            category=self.it, employer=self.employer, application_deadline=timezone.now().date() + timedelta(days=5),
+        )
+
+    def get(self, url_name, **params):
+        response = self.client.get(reverse(url_name), params)
+        return response, json.loads(response.content)
+
+    def job_queries(self, queries):
+        # Leaves out the session and user lookups of the logged-in client
+        return [query['sql'] for query in queries.captured_queries if '"myapp_job"' in query['sql']]
+
+    def test_cursor_pages_through_every_job_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 2, 'fields': 'title'}
+            if cursor:
+                params['cursor'] = cursor
+            with CaptureQueriesContext(connection) as queries:
+                response, body = self.get('api_jobs', **params)
+            self.assertEqual(len(self.job_queries(queries)), 1)
+            self.assertEqual(response['Content-Type'], 'application/json')
+            seen += [job['id'] for job in body['data']]
+            cursor = body['next_cursor']
+            if cursor is None:
+                break
+        expected = list(Job.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(body['data'][0], {'id': seen[-1], 'title': Job.objects.get(id=seen[-1]).title})
+
+    def test_sparse_fields_select_only_their_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response, body = self.get('api_jobs', fields='title,location')
+        sql, = self.job_queries(queries)
+        self.assertNotIn('description', sql)
+        self.assertNotIn('myapp_employer', sql)
+        self.assertEqual(set(body['data'][0]), {'id', 'title', 'location'})
+
+        response, body = self.get('api_jobs', fields='company,category,job_type_display,url', limit=1)
+        self.assertEqual(body['data'][0], {
+            'id': self.jobs[4].id, 'company': "Api Co", 'category': {'id': self.it.id, 'name': "IT & Software"},
+            'job_type_display': "Full Time", 'url': reverse('job_detail', args=[self.jobs[4].id]),
+        })
+
+    def test_batch_fetch_keeps_requested_order(self):
+        archive_jobs([self.jobs[2].id])
+        Job.objects.filter(id=self.jobs[1].id).update(application_deadline=timezone.now().date() - timedelta(days=1))
+        ids = [self.jobs[3].id, 999999, self.jobs[0].id, self.jobs[2].id, self.jobs[1].id]
+        with CaptureQueriesContext(connection) as queries:
+            response, body = self.get('api_jobs', ids=','.join(map(str, ids)), fields='title')
+        self.assertEqual(len(self.job_queries(queries)), 1)
+        self.assertEqual([job['id'] for job in body['data']], [self.jobs[3].id, self.jobs[0].id])
+        # Expired jobs are no more fetchable by id than they are listed
+        self.assertEqual(body['missing'], [999999, self.jobs[2].id, self.jobs[1].id])
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'fields': 'title,salary_max'}, {'cursor': 'not-a-cursor'}, {'limit': 500}, {'ids': '1,x'}):
+            response, body = self.get('api_jobs', **params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', body)
+
+    def test_anonymous_callers_are_refused(self):
+        self.client.logout()
+        for url_name in ('api_jobs', 'api_applications'):
+            response, body = self.get(url_name, fields='contact_email')
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(body, {'error': 'Authentication required.'})
+
+    @override_settings(API_BURST=2, API_RATE=1)
+    def test_callers_are_rate_limited(self):
+        for _ in range(2):
+            self.assertEqual(self.get('api_jobs')[0].status_code, 200)
+        response, body = self.get('api_applications')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        self.assertEqual(body, {'error': admission.API_REJECTION_MESSAGE})
+
+        # Each user, and each anonymous IP, has a bucket of its own
+        other_user = User.objects.create_user(email="other@example.com", password="testpassword123", username="other")
+        self.client.force_login(other_user)
+        self.assertEqual(self.get('api_jobs')[0].status_code, 200)
+        self.client.logout()
+        for status in (401, 401, 429):
+            self.assertEqual(self.get('api_jobs')[0].status_code, status)
+
+    def test_applications_are_limited_to_the_users_own(self):
+        self.client.logout()
+        response, body = self.get('api_applications')
+        self.assertEqual(response.status_code, 401)
+
+        seeker_user = User.objects.create_user(email="seeker@example.com", password="testpassword123", username="seeker")
+        seeker = JobSeeker.objects.create(user=seeker_user)
+        mine = JobApplication.objects.create(job=self.jobs[0], job_seeker=seeker, cover_letter="c")
+        other_user = User.objects.create_user(email="other@example.com", password="testpassword123", username="other")
+        other_employer = Employer.objects.create(user=other_user, company_name="Other Co")
+        other_job = Job.objects.create(
+            title="Other", description="d", requirements="r", location="Remote", job_type="full_time",
+            category=self.it, employer=other_employer, application_deadline=timezone.now().date() + timedelta(days=5),
+        )
+        JobApplication.objects.create(job=other_job, job_seeker=seeker, cover_letter="c")
+
+        self.client.force_login(self.user)
+        response, body = self.get('api_applications', fields='applicant,status_display')
+        self.assertEqual(body, {'data': [{
+            'id': mine.id,
+            'applicant': {'first_name': '', 'last_name': '', 'email': "seeker@example.com"},
+            'status_display': "Pending",
+        }], 'next_cursor': None})
+
+        self.client.force_login(seeker_user)
+        response, body = self.get('api_applications', limit=1)
+        self.assertEqual(len(body['data']), 1)
+        response, body = self.get('api_applications', limit=1, cursor=body['next_cursor'])
+        self.assertEqual(body['data'][0]['id'], mine.id)
+        self.assertIsNone(body['next_cursor'])
+
+
+def tearDownModule():
+    # Views buffered events during the run; write them while the test database still exists
+    profile_view_buffer.flush()
+    search.search_log_buffer.flush()
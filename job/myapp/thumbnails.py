@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZES = (48, 128, 512)
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+THUMBNAIL_MARKER = '__thumb_'
+
+# Thumbnails are rendered off the request path on a single background worker
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='thumbnails')
+# Variant names known to exist, so templates do not stat the storage on every render;
+# the least recently used are forgotten beyond MAX_KNOWN_VARIANTS
+MAX_KNOWN_VARIANTS = 10000
+_known_variants = OrderedDict()
+# Originals queued by thumbnail_url, so a page listing one picture many times queues it once
+_pending = set()
+_lock = threading.Lock()
+
+
+def thumbnail_name(name, size, fmt):
+    """Storage name of a variant, stored next to the original: photo.png -> photo__thumb_128.webp"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}{THUMBNAIL_MARKER}{size}.{fmt}"
+
+
+def thumbnail_names(name):
+    return [thumbnail_name(name, size, fmt) for size in THUMBNAIL_SIZES for fmt in THUMBNAIL_FORMATS]
+
+
+def pick_size(size):
+    """Smallest pre-generated size that covers the requested pixel size."""
+    for candidate in THUMBNAIL_SIZES:
+        if candidate >= size:
+            return candidate
+    return THUMBNAIL_SIZES[-1]
+
+
+def _remember(target):
+    with _lock:
+        _known_variants[target] = True
+        _known_variants.move_to_end(target)
+        while len(_known_variants) > MAX_KNOWN_VARIANTS:
+            _known_variants.popitem(last=False)
+
+
+def _exists(target):
+    """Whether a variant exists; only variants found are cached, so a missing one is noticed once written."""
+    with _lock:
+        if target in _known_variants:
+            _known_variants.move_to_end(target)
+            return True
+    if default_storage.exists(target):
+        _remember(target)
+        return True
+    return False
+
+
+def _render(image, size, fmt):
+    pil_format, save_options = THUMBNAIL_FORMATS[fmt]
+    # Avatars are square, so crop to the centre instead of letterboxing
+    variant = ImageOps.fit(image, (size, size), Image.LANCZOS)
+    buffer = BytesIO()
+    variant.save(buffer, pil_format, **save_options)
+    return buffer.getvalue()
+
+
+def _open(name):
+    with default_storage.open(name, 'rb') as handle:
+        image = Image.open(handle)
+        image = ImageOps.exif_transpose(image)
+        return image.convert('RGB')
+
+
+def generate_thumbnails(name, sizes=THUMBNAIL_SIZES, formats=tuple(THUMBNAIL_FORMATS), overwrite=False):
+    """Create the requested variants of an uploaded image. Returns the names written."""
+    written = []
+    image = None
+    for size in sizes:
+        for fmt in formats:
+            target = thumbnail_name(name, size, fmt)
+            if not overwrite and _exists(target):
+                continue
+            if image is None:
+                image = _open(name)
+            if overwrite and default_storage.exists(target):
+                default_storage.delete(target)
+            default_storage.save(target, ContentFile(_render(image, size, fmt)))
+            _remember(target)
+            written.append(target)
+    return written
+
+
+def _generate_quietly(name):
+    try:
+        generate_thumbnails(name)
+    except (OSError, UnidentifiedImageError) as e:
+        logger.error(f"Failed to generate thumbnails for {name}: {e}")
+    finally:
+        with _lock:
+            _pending.discard(name)
+
+
+def schedule_thumbnails(name):
+    """Queue generation of every variant for a freshly uploaded image."""
+    if name:
+        _executor.submit(_generate_quietly, name)
+
+
+def thumbnail_url(name, size, fmt='webp'):
+    """
+    URL of the variant closest to ``size``. While a variant is missing the
+    original URL is returned and its variants are generated in the background,
+    on the same worker as uploads, so rendering never resizes images.
+    """
+    target = thumbnail_name(name, pick_size(size), fmt)
+    if _exists(target):
+        return default_storage.url(target)
+    with _lock:
+        queued = name in _pending
+        _pending.add(name)
+    if not queued:
+        _executor.submit(_generate_quietly, name)
+    return default_storage.url(name)
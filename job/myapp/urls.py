@@ -6,17 +6,32 @@ urlpatterns = [
     path('about/', views.about, name='about'),
     path('jobs/', views.job_list, name='job_list'),
     path('post-job/', views.post_job, name='post_job'),
+    path('api/jobs/bulk/', views.bulk_post_jobs, name='bulk_post_jobs'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('login/', views.login_view, name='login'),
     path('signup/', views.signup_view, name='signup'),
     path('logout/', views.logout_view, name='logout'),
     path('delete-job/<int:job_id>/', views.delete_job, name='delete_job'),
+    path('jobs/bulk-action/', views.bulk_job_action, name='bulk_job_action'),
+    path('jobs/archived/', views.archived_jobs, name='archived_jobs'),
     path('update-resume/', views.update_resume, name='update_resume'),
     path('profile-settings/', views.profile_settings, name='profile_settings'),
     path('view-profile/<str:user_id>/', views.view_profile, name='view_profile'),
     path('apply-job/<int:job_id>/', views.apply_job, name='apply_job'),
+    path('applications/history/', views.application_history, name='application_history'),
     path('job/<int:job_id>/', views.job_detail, name='job_detail'),
+    path('job/<int:job_id>/save/', views.save_job, name='save_job'),
+    path('job/<int:job_id>/unsave/', views.unsave_job, name='unsave_job'),
     path('view_applicant/<int:application_id>/', views.view_applicant, name='view_applicant'),
+    path('applications/export/', views.export_applicants, name='export_applicants'),
     path('api/categories/', views.categories_api, name='categories_api'),
+    path('api/autocomplete/', views.autocomplete, name='autocomplete'),
+    path('api/v1/jobs/', views.api_jobs, name='api_jobs'),
+    path('api/v1/applications/', views.api_applications, name='api_applications'),
+    path('metrics', views.metrics, name='metrics'),
+    path('staff/profiles/', views.request_profiles, name='request_profiles'),
+    path('staff/profiles/<str:name>', views.download_profile, name='download_profile'),
+    path('sitemap.xml', views.sitemap_file, name='sitemap'),
+    path('sitemaps/<str:name>', views.sitemap_file, name='sitemap_file'),
 ]
 
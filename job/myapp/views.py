@@ -1,36 +1,68 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import authenticate, login, logout, get_user_model
+from django.contrib.auth import login, logout, get_user_model
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from .forms import CustomUserCreationForm, CustomAuthenticationForm, ProfileSettingsForm, CombinedProfileForm
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse, HttpResponseServerError, HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseServerError, HttpResponseRedirect, StreamingHttpResponse
 from .models import Job, JobApplication, JobSeeker, Employer, ProfileView, SavedJob, ApplicationNotification, Category
 from django.utils import timezone
 
+from django.db import transaction
 from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 
+import csv
 import logging
+import os
+import posixpath
+import re
+import time
+from functools import wraps
 from django.core.mail import send_mail
 from django.conf import settings
 from django.contrib import messages
 from django.urls import reverse
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.static import serve as serve_static
 from django import forms
 from django.views.decorators.csrf import csrf_protect
+from django.core.paginator import Paginator
+from django.views.decorators.http import require_GET, require_POST
+from .autocomplete import MAX_SUGGESTIONS, prefix_index
+from .admission import admission_controlled, api_rate_limited
+from . import metrics as request_metrics
+from .streaming import stream_template
+from .profiling import FILE_RE as PROFILE_FILE_RE, recent_profiles
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse
+from .bulk_jobs import archive_jobs, delete_jobs
+from .thumbnails import schedule_thumbnails
+from .profile_views import profile_view_count, record_profile_view
+from .protected_media import serve_protected_file
+from .exports import applicant_export_queryset, iter_csv, iter_jsonl, parse_date
+from .dedupe import find_duplicates
+from . import api
+from .search import (
+    JOB_LIST_PAGE_SIZE, cached_first_page, hot_query_refresher, job_categories, normalize_query, parse_filters,
+    record_search, search_jobs,
+)
+from .job_import import CATEGORY_MAPPING, DEFAULT_CHUNK_SIZE, decode_lines, detect_format, import_jobs
 
 logger = logging.getLogger(__name__)
 
+RECENT_APPLICATIONS_LIMIT = 5
+APPLICATION_HISTORY_PAGE_SIZE = 20
+ARCHIVED_JOBS_PAGE_SIZE = 20
+
 def home(request):
     try:
         # Query categories dynamically with count of active jobs
         categories = Category.objects.annotate(
-            job_count=Count('job')  # Removed is_active filter temporarily
+            job_count=Count('job', filter=Q(job__is_active=True, job__application_deadline__gte=timezone.now().date()))
         ).values('id', 'name', 'job_count')
 
-        # Query latest jobs with deadline not passed (removed is_active filter temporarily)
-        latest_jobs_qs = Job.objects.filter(
-            application_deadline__gte=timezone.now().date()
-        ).order_by('-created_at')[:5]
+        # Query latest live jobs
+        latest_jobs_qs = Job.objects.live().select_related('employer').order_by('-created_at')[:5]
 
         # Prepare jobs list with get_job_type_display and created_at_iso for template
         job_type_display = dict(Job.JOB_TYPE_CHOICES)
@@ -63,9 +95,92 @@ def categories_api(request):
     ).values('id', 'name', 'job_count')
     return JsonResponse(list(categories), safe=False)
 
+def _api_response(data, status=200):
+    return HttpResponse(api.dumps(data), status=status, content_type='application/json')
+
+def _api_login_required(view):
+    # The JSON counterpart of @login_required: the API answers 401 rather than redirecting
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return _api_response({'error': 'Authentication required.'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapped
+
+@require_GET
+@api_rate_limited
+@_api_login_required
+def api_jobs(request):
+    try:
+        return _api_response(api.list_jobs(request.GET))
+    except api.ApiError as e:
+        return _api_response({'error': str(e)}, status=e.status)
+
+@require_GET
+@api_rate_limited
+@_api_login_required
+def api_applications(request):
+    try:
+        return _api_response(api.list_applications(request.user, request.GET))
+    except api.ApiError as e:
+        return _api_response({'error': str(e)}, status=e.status)
+
+SITEMAP_FILE_RE = re.compile(r'^(sitemap\.xml|sitemap-jobs-\d+\.xml|jobs-\d+\.json)$')
+
+def sitemap_file(request, name='sitemap.xml'):
+    # Normally sent by the web server; this covers setups without a location for SITEMAP_ROOT
+    if not SITEMAP_FILE_RE.match(name):
+        raise Http404("Not found")
+    return serve_static(request, name, document_root=settings.SITEMAP_ROOT)
+
+def metrics(request):
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS and not request.user.is_staff:
+        raise Http404("Not found")
+    body = request_metrics.render(request_metrics.merged_snapshot())
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+PROFILE_LIST_LIMIT = 100
+
+@staff_member_required
+def request_profiles(request):
+    view = request.GET.get('view') or None
+    profiles = recent_profiles()
+    views = sorted({profile['view'] for profile in profiles})
+    if view:
+        profiles = [profile for profile in profiles if profile['view'] == view]
+    return render(request, 'request_profiles.html', {
+        'profiles': profiles[:PROFILE_LIST_LIMIT], 'views': views, 'selected_view': view,
+    })
+
+@staff_member_required
+def download_profile(request, name):
+    if not PROFILE_FILE_RE.match(name):
+        raise Http404("Profile not found")
+    try:
+        return FileResponse(open(os.path.join(settings.PROFILER_DIR, name), 'rb'), as_attachment=True, filename=name)
+    except FileNotFoundError:
+        raise Http404("Profile not found")
+
+AUTOCOMPLETE_LIMIT = 8
+AUTOCOMPLETE_MAX_LIMIT = MAX_SUGGESTIONS
+
+def autocomplete(request):
+    q = request.GET.get('q', '')[:100]
+    try:
+        limit = min(int(request.GET.get('limit', AUTOCOMPLETE_LIMIT)), AUTOCOMPLETE_MAX_LIMIT)
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+    if not q.strip() or limit < 1:
+        return JsonResponse({'suggestions': []})
+    prefix_index.ensure_fresh()
+    response = JsonResponse({'suggestions': prefix_index.suggest(q, limit)})
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
+
 def about(request):
     return render(request, 'about.html')
 
+@admission_controlled('email')
 def signup_view(request):
     if request.method == 'POST':
         form = CustomUserCreationForm(request.POST)
@@ -77,20 +192,14 @@ def signup_view(request):
         form = CustomUserCreationForm()
     return render(request, 'signup.html', {'form': form})
 
+@admission_controlled('username')
 def login_view(request):
     if request.method == 'POST':
         form = CustomAuthenticationForm(request, data=request.POST)
+        # The form authenticates in clean(), so the password is hashed only once
         if form.is_valid():
-            email = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
-            # Normalize email to lowercase for authentication
-            email = email.lower() if email else email
-            user = authenticate(request, email=email, password=password)
-            if user is not None:
-                login(request, user)
-                return redirect('home')
-            else:
-                form.add_error(None, "Invalid email or password.")
+            login(request, form.get_user())
+            return redirect('home')
     else:
         form = CustomAuthenticationForm()
     return render(request, 'login.html', {'form': form})
@@ -102,14 +211,63 @@ def logout_view(request):
 @login_required
 def job_list(request):
     try:
-        jobs = Job.objects.filter(application_deadline__gte=timezone.now().date())  # Removed is_active filter temporarily
-        query = request.GET.get('q')
-        if query:
-            jobs = jobs.filter(title__icontains=query)
-        return render(request, 'job_list.html', {'jobs': jobs})
+        category_id, job_type = parse_filters(request.GET)
+    except ValueError as e:
+        return HttpResponse(str(e), status=400)
+    categories = []
+    try:
+        categories = job_categories()
+        query = normalize_query(request.GET.get('q'))
+        key = (query, category_id or 0, job_type or '')
+        page_number = request.GET.get('page') or '1'
+        started = time.perf_counter()
+        # Page one of a popular search is kept in the cache by the hot-query refresher
+        jobs = cached_first_page(key) if page_number == '1' else None
+        cached = jobs is not None
+        if jobs is None:
+            jobs = search_jobs(query, category_id, job_type)
+        page = Paginator(jobs, JOB_LIST_PAGE_SIZE).get_page(page_number)
+        page.object_list = list(page.object_list)
+        record_search(key, page.number, page.paginator.count, (time.perf_counter() - started) * 1000, cached)
+        hot_query_refresher.start()
+        saved_job_ids = _saved_job_ids(request.user, [job.id for job in page.object_list])
+        return render(request, 'job_list.html', {
+            'jobs': page, 'categories': categories, 'selected_category': category_id, 'selected_job_type': job_type,
+            'saved_job_ids': saved_job_ids,
+        })
     except Exception as e:
         logger.error(f"Error fetching jobs: {e}", exc_info=True)
-        return render(request, 'job_list.html', {'error': 'Error fetching jobs. Please try again later.', 'jobs': []})
+        return render(request, 'job_list.html', {'error': 'Error fetching jobs. Please try again later.', 'jobs': [], 'categories': categories})
+
+def _saved_job_ids(user, job_ids):
+    # One IN query for the whole page instead of an exists() per job card
+    if not job_ids:
+        return set()
+    return set(SavedJob.objects.filter(job_seeker__user=user, job_id__in=job_ids).values_list('job_id', flat=True))
+
+def _saved_job_response(request, job, saved):
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JsonResponse({'job_id': job.id, 'saved': saved})
+    next_url = request.POST.get('next')
+    if not next_url or not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = reverse('job_list')
+    return HttpResponseRedirect(next_url)
+
+@login_required
+@require_POST
+def save_job(request, job_id):
+    job = get_object_or_404(Job, id=job_id, is_active=True)
+    job_seeker, created = JobSeeker.objects.get_or_create(user=request.user)
+    # The unique constraint makes repeated or concurrent saves a no-op
+    SavedJob.objects.get_or_create(job=job, job_seeker=job_seeker)
+    return _saved_job_response(request, job, True)
+
+@login_required
+@require_POST
+def unsave_job(request, job_id):
+    job = get_object_or_404(Job, id=job_id)
+    SavedJob.objects.filter(job=job, job_seeker__user=request.user).delete()
+    return _saved_job_response(request, job, False)
 
 @login_required
 def post_job(request):
@@ -128,22 +286,12 @@ def post_job(request):
 
         # Validate required fields
         if not all([title, company, location, job_type, category_value, deadline, description, requirements]):
-            return render(request, 'post_job.html', {'error': 'All required fields must be filled.'})
+            return render(request, 'post_job.html', {'error': 'All required fields must be filled.', 'form_data': request.POST})
 
         # Map category form value to category name
-        category_mapping = {
-            'it': 'IT & Software',
-            'marketing': 'Marketing',
-            'design': 'Design',
-            'finance': 'Finance',
-            'healthcare': 'Healthcare',
-            'education': 'Education',
-            'engineering': 'Engineering',
-            'sales': 'Sales'
-        }
-        category_name = category_mapping.get(category_value)
+        category_name = CATEGORY_MAPPING.get(category_value)
         if not category_name:
-            return render(request, 'post_job.html', {'error': 'Invalid category selected.'})
+            return render(request, 'post_job.html', {'error': 'Invalid category selected.', 'form_data': request.POST})
 
         # Get or create Category
         category, created = Category.objects.get_or_create(name=category_name)
@@ -171,6 +319,11 @@ def post_job(request):
             application_deadline=deadline,
             contact_email=contact_email
         )
+        # Agencies often re-post the same listing with small edits; ask before adding another copy
+        if not request.POST.get('confirm_duplicate'):
+            duplicates = find_duplicates(job, employer_id=employer.id)
+            if duplicates:
+                return render(request, 'post_job.html', {'duplicate': duplicates[0][1], 'form_data': request.POST})
         job.save()
 
         # Redirect to dashboard or job list
@@ -178,6 +331,35 @@ def post_job(request):
 
     return render(request, 'post_job.html')
 
+@login_required
+@require_POST
+def bulk_post_jobs(request):
+    # Accepts a CSV/JSONL upload in the "file" field, or the same content as the raw request body
+    upload = request.FILES.get('file')
+    if upload is not None:
+        source, name = upload, upload.name
+    else:
+        source, name = request, ''
+    fmt = request.GET.get('format') or detect_format(name, request.content_type or '')
+    if fmt not in ('csv', 'jsonl'):
+        return JsonResponse({'error': "format must be 'csv' or 'jsonl'."}, status=400)
+
+    # Resolve the employer once per batch instead of once per job
+    employer = Employer.objects.filter(user=request.user).first()
+    if employer is None:
+        company = request.GET.get('company', '').strip()
+        if not company:
+            return JsonResponse({'error': 'A company name is required to create your employer profile.'}, status=400)
+        employer = Employer.objects.create(user=request.user, company_name=company)
+
+    try:
+        result = import_jobs(decode_lines(source), employer, fmt=fmt, chunk_size=DEFAULT_CHUNK_SIZE)
+    except (UnicodeDecodeError, csv.Error) as e:
+        logger.error(f"Error importing jobs: {e}", exc_info=True)
+        return JsonResponse({'error': f'Could not read the uploaded data: {e}'}, status=400)
+    status = 400 if result.error_count and not result.created else 200
+    return JsonResponse(result.as_dict(), status=status)
+
 @login_required
 def dashboard(request):
     try:
@@ -192,7 +374,7 @@ def dashboard(request):
             job_seeker = user.jobseeker
             context['job_seeker'] = job_seeker
             context['jobs_applied_count'] = JobApplication.objects.filter(job_seeker=job_seeker).count()
-            context['profile_views_count'] = ProfileView.objects.filter(job_seeker=job_seeker).count()
+            context['profile_views_count'] = profile_view_count(job_seeker)
             context['saved_jobs_count'] = SavedJob.objects.filter(job_seeker=job_seeker).count()
 
             # Enhanced dashboard data
@@ -228,7 +410,7 @@ def dashboard(request):
 
             # Trending jobs in user's category
             user_category = job_seeker.skills.split(',')[0] if job_seeker.skills else 'Technology'
-            context['trending_jobs'] = Job.objects.filter(
+            context['trending_jobs'] = Job.objects.live().filter(
                 category__name__icontains=user_category
             ).order_by('-created_at')[:3]
 
@@ -260,7 +442,8 @@ def dashboard(request):
         # Data for Employers
         if context['is_employer']:
             employer = user.employer
-            user_jobs = list(Job.objects.filter(employer=employer))
+            # Archived postings are listed separately on the archived jobs page
+            user_jobs = list(Job.objects.filter(employer=employer, is_active=True))
             job_ids = [job.id for job in user_jobs]
             
             all_applicants = list(JobApplication.objects.filter(job_id__in=job_ids).select_related('job_seeker__user'))
@@ -289,23 +472,66 @@ def dashboard(request):
                 })
             context['applications_summary'] = applications_summary
 
-            # Workaround for djongo bug: filter in Python instead of in the database
             try:
-                all_notifications = ApplicationNotification.objects.filter(
-                    employer=employer
+                context['unread_notifications'] = list(ApplicationNotification.objects.filter(
+                    employer=employer, is_read=False
                 ).select_related(
-                    'job_application__job_seeker__user'
-                ).order_by('-created_at')
-                context['unread_notifications'] = [n for n in all_notifications if not n.is_read]
+                    'job_application__job', 'job_application__job_seeker__user'
+                ).order_by('-created_at'))
             except Exception:
                 context['unread_notifications'] = [] # Gracefully fail
-
-        return render(request, 'dashboard.html', context)
     except Exception as e:
         logger.error(f"Error in dashboard view: {e}", exc_info=True)
         # Re-raise the exception to get a full debug page
         raise
 
+    # The employer section lists every job and applicant, so send the page while it renders;
+    # stream_template logs errors raised while rendering
+    return stream_template(request, 'dashboard.html', context)
+
+@login_required
+def export_applicants(request):
+    employer = Employer.objects.filter(user=request.user).first()
+    if employer is None:
+        messages.error(request, "Only employers can export applicants.")
+        return HttpResponseRedirect(reverse('dashboard'))
+
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in ('csv', 'jsonl'):
+        return HttpResponse("format must be 'csv' or 'jsonl'.", status=400)
+    status = request.GET.get('status')
+    if status and status not in dict(JobApplication.STATUS_CHOICES):
+        return HttpResponse("Invalid status.", status=400)
+    job_id = request.GET.get('job')
+    if job_id and not (job_id.isascii() and job_id.isdigit()):
+        return HttpResponse("Invalid job.", status=400)
+    try:
+        since = parse_date(request.GET.get('since'))
+        until = parse_date(request.GET.get('until'))
+    except ValueError:
+        return HttpResponse("Invalid date; use YYYY-MM-DD.", status=400)
+
+    applications = applicant_export_queryset(employer, job_id=job_id, status=status, since=since, until=until)
+    if fmt == 'jsonl':
+        response = StreamingHttpResponse(iter_jsonl(applications), content_type='application/x-ndjson')
+    else:
+        response = StreamingHttpResponse(iter_csv(applications), content_type='text/csv')
+    filename = f"applicants-{timezone.now():%Y%m%d}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@login_required
+def archived_jobs(request):
+    employer = Employer.objects.filter(user=request.user).first()
+    if employer is None:
+        messages.error(request, "Only employers have archived job posts.")
+        return HttpResponseRedirect(reverse('dashboard'))
+    jobs = Job.objects.archived().filter(employer=employer).annotate(
+        applicant_count=Count('jobapplication')
+    ).order_by('-updated_at', '-id')
+    paginator = Paginator(jobs, ARCHIVED_JOBS_PAGE_SIZE)
+    return render(request, 'archived_jobs.html', {'jobs': paginator.get_page(request.GET.get('page'))})
+
 @login_required
 def job_detail(request, job_id):
     job = get_object_or_404(Job, id=job_id)
@@ -317,7 +543,7 @@ def delete_job(request, job_id):
         user = request.user
         employer = Employer.objects.get(user=user)
         job = get_object_or_404(Job, id=job_id, employer=employer)
-        job.delete()
+        delete_jobs([job.id])
         messages.success(request, "Job post deleted successfully.")
     except Employer.DoesNotExist:
         messages.error(request, "You do not have permission to delete this job.")
@@ -325,6 +551,32 @@ def delete_job(request, job_id):
         messages.error(request, f"Error deleting job post: {e}")
     return HttpResponseRedirect(reverse('dashboard'))
 
+@login_required
+@require_POST
+def bulk_job_action(request):
+    action = request.POST.get('action')
+    try:
+        employer = Employer.objects.get(user=request.user)
+        # Only act on jobs owned by this employer, whatever ids were submitted
+        requested_ids = [int(job_id) for job_id in request.POST.getlist('job_ids') if job_id.isdigit()]
+        job_ids = list(Job.objects.filter(employer=employer, id__in=requested_ids).values_list('id', flat=True))
+        if not job_ids:
+            messages.warning(request, "Select at least one job.")
+        elif action == 'archive':
+            count = archive_jobs(job_ids)
+            messages.success(request, f"{count} job post(s) archived.")
+        elif action == 'delete':
+            count = delete_jobs(job_ids)
+            messages.success(request, f"{count} job post(s) deleted.")
+        else:
+            messages.error(request, "Unknown action.")
+    except Employer.DoesNotExist:
+        messages.error(request, "You do not have permission to modify these jobs.")
+    except Exception as e:
+        logger.error(f"Error in bulk job action: {e}", exc_info=True)
+        messages.error(request, f"Error updating job posts: {e}")
+    return HttpResponseRedirect(reverse('dashboard'))
+
 class ResumeForm(forms.ModelForm):
     class Meta:
         model = JobSeeker
@@ -346,9 +598,6 @@ def apply_job(request, job_id):
     user = request.user
     job_seeker, created = JobSeeker.objects.get_or_create(user=user)
 
-    # Get application history for the user
-    application_history = JobApplication.objects.filter(job_seeker=job_seeker).select_related('job__employer').order_by('-applied_at')
-
     if request.method == 'POST':
         form = JobApplicationForm(request.POST, request.FILES)
         if form.is_valid():
@@ -411,7 +660,32 @@ def apply_job(request, job_id):
     else:
         form = JobApplicationForm()
 
-    return render(request, 'apply_job.html', {'form': form, 'job': job, 'application_history': application_history})
+    # Only a short summary of past applications is shown inline; the full history is paginated separately
+    recent_applications = _application_history_queryset(job_seeker)[:RECENT_APPLICATIONS_LIMIT]
+    return render(request, 'apply_job.html', {'form': form, 'job': job, 'recent_applications': recent_applications})
+
+def _application_history_queryset(job_seeker):
+    # Project only the columns the history templates display
+    return JobApplication.objects.filter(job_seeker=job_seeker).select_related('job__employer').only(
+        'id', 'status', 'applied_at', 'job_id',
+        'job__id', 'job__title', 'job__employer_id',
+        'job__employer__id', 'job__employer__company_name',
+    ).order_by('-applied_at', '-id')
+
+@login_required
+def application_history(request):
+    job_seeker = JobSeeker.objects.filter(user=request.user).only('id').first()
+    if job_seeker is None:
+        applications = JobApplication.objects.none()
+    else:
+        applications = _application_history_queryset(job_seeker)
+    paginator = Paginator(applications, APPLICATION_HISTORY_PAGE_SIZE)
+    page = paginator.get_page(request.GET.get('page'))
+    context = {'applications': page}
+    # AJAX callers only need the list fragment
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return render(request, 'partials/application_history.html', context)
+    return render(request, 'application_history.html', context)
 
 @login_required
 def update_resume(request):
@@ -421,6 +695,9 @@ def update_resume(request):
         form = CombinedProfileForm(request.POST, request.FILES, instance=job_seeker)
         if form.is_valid():
             form.save()
+            if 'profile_picture' in form.changed_data and job_seeker.profile_picture:
+                picture_name = job_seeker.profile_picture.name
+                transaction.on_commit(lambda: schedule_thumbnails(picture_name))
 
             # Handle LinkedIn and GitHub URLs separately since they're not in the form
             linkedin_url = request.POST.get('linkedin_url', '').strip()
@@ -459,6 +736,33 @@ def view_applicant(request, application_id):
         return redirect('dashboard')
     return render(request, 'view_applicant.html', {'application': application})
 
+def _can_access_media(user, name):
+    # Mirrors the permission checks of view_applicant and view_profile
+    directory = name.split('/', 1)[0]
+    if directory == 'applications':
+        application = JobApplication.objects.filter(resume=name).select_related(
+            'job__employer', 'job_seeker'
+        ).only('job__employer__user_id', 'job_seeker__user_id').first()
+        return application is not None and user.pk in (
+            application.job.employer.user_id, application.job_seeker.user_id
+        )
+    if directory == 'resumes':
+        job_seeker = JobSeeker.objects.filter(resume=name).only('id', 'user_id').first()
+        if job_seeker is None:
+            return False
+        return job_seeker.user_id == user.pk or JobApplication.objects.filter(
+            job_seeker=job_seeker, job__employer__user=user
+        ).exists()
+    # Profile pictures (and their thumbnails) appear across the site for signed-in users
+    return directory == 'profile_pics'
+
+@login_required
+def protected_media(request, name):
+    name = posixpath.normpath(name)
+    if name.startswith(('..', '/')) or not _can_access_media(request.user, name):
+        raise Http404("File not found.")
+    return serve_protected_file(request, name)
+
 @login_required
 def view_profile(request, user_id):
     try:
@@ -481,6 +785,8 @@ def view_profile(request, user_id):
             messages.error(request, "Only employers can view applicant profiles.")
             return HttpResponseRedirect(reverse('dashboard'))
 
+        record_profile_view(job_seeker.id, employer.id)
+
         # Render the profile using the update_resume template
         return render(request, 'update_resume.html', {'job_seeker': job_seeker, 'view_only': True})
     except Exception as e:
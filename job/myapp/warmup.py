@@ -0,0 +1,89 @@
+"""
+Warm boot: do the work Django otherwise leaves for the first requests of a
+new worker. Every project template is compiled into the cached template
+loader, the URL resolver is populated and, optionally, database connections
+are opened.
+
+Django's database connections belong to the thread that opens them, so
+opening them ahead of time only helps where that thread goes on to serve
+requests: gunicorn's sync workers (see server.connect_worker). Threaded
+servers (gthread, waitress, runserver) and ASGI servers handle requests on
+other threads, which connect on their first request regardless.
+"""
+import logging
+import os
+import time
+
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def project_templates():
+    """Names of the templates under the Django engine's DIRS, e.g. 'partials/application_history.html'."""
+    names = []
+    for directory in engines['django'].engine.dirs:
+        for root, dirs, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    names.append(os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def preload_templates():
+    engine = engines['django']
+    loaded = 0
+    for name in project_templates():
+        try:
+            engine.get_template(name)
+            loaded += 1
+        except TemplateSyntaxError as e:
+            logger.error(f"Could not preload template {name}: {e}")
+    return loaded
+
+
+def populate_urls():
+    resolver = get_resolver()
+    # Builds the reverse and namespace dictionaries, importing every view module on the way
+    resolver.reverse_dict
+    resolver.namespace_dict
+    return len(resolver.reverse_dict)
+
+
+def parameterless_url_names():
+    """Names of the root URLconf's patterns that can be reversed without arguments."""
+    resolver = get_resolver()
+    names = []
+    for key in resolver.reverse_dict:
+        if not isinstance(key, str):
+            continue
+        possibilities = resolver.reverse_dict.getlist(key)[0][0]
+        if any(not params for pattern, params in possibilities):
+            names.append(key)
+    return sorted(names)
+
+
+def open_connections():
+    """Connect this thread's database connections."""
+    for connection in connections.all():
+        connection.ensure_connection()
+    return len(connections.all())
+
+
+def warm_boot(connect=False):
+    """Returns {step: (count, seconds)} for the steps performed."""
+    steps = [('templates', preload_templates), ('urls', populate_urls)]
+    if connect:
+        steps.append(('connections', open_connections))
+    timings = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        timings[name] = (step(), time.perf_counter() - started)
+    logger.info("Warm boot: " + ", ".join(
+        f"{count} {name} in {seconds * 1000:.0f} ms" for name, (count, seconds) in timings.items()
+    ))
+    return timings